@@ -1,4 +1,10 @@
+import asyncio
 import os
+import threading
+import time as clock
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, time, timedelta
 from typing import Optional
 from zoneinfo import ZoneInfo
@@ -8,8 +14,10 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from .database import get_db
+from .cache import TTLCache
+from .database import get_read_db
 from .models import User
 
 SECRET_KEY = "change-this-secret"
@@ -17,11 +25,35 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 480
 SESSION_TIMEZONE = ZoneInfo(os.getenv("CASHUP_SESSION_TIMEZONE", "America/Sao_Paulo"))
 APP_BOOTED_AT = datetime.now(SESSION_TIMEZONE)
+USER_CACHE_TTL = float(os.getenv("CASHUP_USER_CACHE_TTL", "60"))
+TOKEN_CACHE_TTL = float(os.getenv("CASHUP_TOKEN_CACHE_TTL", "300"))
+PASSWORD_WORKERS = int(os.getenv("CASHUP_PASSWORD_WORKERS", "2"))
+# Hashing requests allowed to wait for a worker; beyond that the API answers 503.
+PASSWORD_QUEUE_LIMIT = int(os.getenv("CASHUP_PASSWORD_QUEUE_LIMIT", "32"))
+LOGIN_ATTEMPTS_PER_MINUTE = int(os.getenv("CASHUP_LOGIN_ATTEMPTS_PER_MINUTE", "10"))
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Users are dropped as soon as a write to the users table commits (new user,
+# password or role change); the TTL only bounds staleness across processes.
+user_cache = TTLCache(USER_CACHE_TTL, 512)
+# Verified token claims, so the signature is not re-checked on every request.
+token_cache = TTLCache(TOKEN_CACHE_TTL, 2048)
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Snapshot of the authenticated user, safe to share between requests."""
+
+    id: int
+    name: str
+    email: str
+    role: str
+    is_active: bool
+    created_at: Optional[datetime]
+
 
 def _get_session_reset_at(reference: Optional[datetime] = None) -> datetime:
     current = reference.astimezone(SESSION_TIMEZONE) if reference else datetime.now(SESSION_TIMEZONE)
@@ -37,9 +69,100 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.password_hash):
+class PasswordPool:
+    """Runs bcrypt on its own small thread pool, so a burst of logins cannot
+    take over the threads that serve the rest of the API."""
+
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cashup-password")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.rejected = 0
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self.in_flight >= self.workers + self.queue_limit:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication is busy, try again shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            return await asyncio.wrap_future(self._executor.submit(func, *args))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "in_flight": self.in_flight,
+                "queue_depth": max(0, self.in_flight - self.workers),
+                "peak": self.peak,
+                "rejected": self.rejected,
+            }
+
+
+class LoginRateLimiter:
+    """Sliding one-minute window of login attempts per email."""
+
+    def __init__(self, attempts_per_minute: int, max_tracked: int = 10000):
+        self.attempts_per_minute = attempts_per_minute
+        self.max_tracked = max_tracked
+        self._attempts: dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self.limited = 0
+
+    def check(self, email: str) -> None:
+        now = clock.monotonic()
+        key = email.strip().lower()
+        with self._lock:
+            attempts = self._attempts.get(key)
+            if attempts is None:
+                if len(self._attempts) >= self.max_tracked:
+                    self._prune(now)
+                attempts = self._attempts[key] = deque()
+            while attempts and now - attempts[0] >= 60:
+                attempts.popleft()
+            if len(attempts) >= self.attempts_per_minute:
+                self.limited += 1
+                retry_after = max(1, int(60 - (now - attempts[0])) + 1)
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many login attempts, try again later",
+                    headers={"Retry-After": str(retry_after)},
+                )
+            attempts.append(now)
+
+    def _prune(self, now: float) -> None:
+        for key in [key for key, attempts in self._attempts.items() if not attempts or now - attempts[-1] >= 60]:
+            del self._attempts[key]
+
+
+password_pool = PasswordPool(PASSWORD_WORKERS, PASSWORD_QUEUE_LIMIT)
+login_rate_limiter = LoginRateLimiter(LOGIN_ATTEMPTS_PER_MINUTE)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_pool.run(get_password_hash, password)
+
+
+async def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+    login_rate_limiter.check(email)
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.email == email).first())
+    if not user or not await verify_password_async(password, user.password_hash):
         return None
     return user
 
@@ -62,38 +185,60 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        token_boot = payload.get("boot")
-        token_session_reset_at = payload.get("session_reset_at")
-        if email is None or token_boot is None or token_session_reset_at is None:
-            raise credentials_exception
-        if token_boot != APP_BOOTED_AT.isoformat():
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Session revoked after application restart",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        if datetime.now(SESSION_TIMEZONE) >= datetime.fromisoformat(token_session_reset_at):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Session expired after daily reset",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-    except HTTPException:
-        raise
     except JWTError as exc:
-        raise credentials_exception from exc
+        raise _credentials_exception() from exc
+    if payload.get("sub") is None or payload.get("boot") is None or payload.get("session_reset_at") is None:
+        raise _credentials_exception()
+    if payload["boot"] != APP_BOOTED_AT.isoformat():
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session revoked after application restart",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+
+def _load_user(db: Session, email: str) -> Optional[CurrentUser]:
     user = db.query(User).filter(User.email == email).first()
     if user is None:
-        raise credentials_exception
+        return None
+    return CurrentUser(
+        id=user.id,
+        name=user.name,
+        email=user.email,
+        role=user.role,
+        is_active=user.is_active,
+        created_at=user.created_at,
+    )
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_read_db)) -> CurrentUser:
+    payload = token_cache.get_or_set(token, (), lambda: _decode_token(token))
+    # Cached claims outlive a single request, so the time-based checks run every time.
+    now = datetime.now(SESSION_TIMEZONE)
+    if now.timestamp() >= payload["exp"]:
+        raise _credentials_exception()
+    if now >= datetime.fromisoformat(payload["session_reset_at"]):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session expired after daily reset",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    email = payload["sub"]
+    user = user_cache.get_or_set(email, ("users",), lambda: _load_user(db, email))
+    if user is None:
+        raise _credentials_exception()
     return user
 
 
@@ -105,7 +250,7 @@ ROLE_LEVELS = {
 
 
 def require_role(role: str):
-    def dependency(user: User = Depends(get_current_user)) -> User:
+    def dependency(user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
         required_level = ROLE_LEVELS.get(role)
         user_level = ROLE_LEVELS.get(user.role, 0)
         if required_level is None or user_level < required_level:
@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+
+REPORT_CACHE_TTL = float(os.getenv("CASHUP_REPORT_CACHE_TTL", "300"))
+REPORT_CACHE_MAX_ENTRIES = int(os.getenv("CASHUP_REPORT_CACHE_MAX_ENTRIES", "256"))
+
+WRITTEN_TABLES_KEY = "cashup_written_tables"
+# Every TTLCache (reports, authenticated users...) is invalidated by committed writes.
+_table_caches: "weakref.WeakSet[TTLCache]" = weakref.WeakSet()
+
+
+class TTLCache:
+    """Thread-safe in-process cache whose entries expire after a TTL or when a table they read is written."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, frozenset[str], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation, so a value computed while a write was
+        # being committed is never stored as fresh.
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        _table_caches.add(self)
+
+    def _fresh_entry(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        return None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """The cached value if it is still fresh, without computing anything on a miss."""
+        with self._lock:
+            entry = self._fresh_entry(key)
+        return default if entry is None else entry[2]
+
+    def get_or_set(self, key: Hashable, tables: Iterable[str], compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._fresh_entry(key)
+            if entry is not None:
+                return entry[2]
+            self.misses += 1
+            generation = self._generation
+        value = compute()
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, frozenset(tables), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, tables: Iterable[str]) -> None:
+        tables = set(tables)
+        with self._lock:
+            self._generation += 1
+            stale = [key for key, (_, depends_on, _) in self._entries.items() if depends_on & tables]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / requests if requests else 0.0,
+                "invalidations": self.invalidations,
+                "ttl_seconds": self.ttl,
+            }
+
+
+report_cache = TTLCache(REPORT_CACHE_TTL, REPORT_CACHE_MAX_ENTRIES)
+
+
+# Every write session records the tables it touched and invalidates the
+# dependent entries of every cache once the commit succeeds, so new write
+# paths are covered without having to remember the caches.
+#
+# The caches live in this process and only see sessions built by SessionLocal
+# here. These writes stay invisible until the TTL expires:
+# - a Session not built by SessionLocal, and Core statements on a raw
+#   connection such as engine.begin();
+# - other processes: other uvicorn workers, the PDF import workers, and
+#   maintenance scripts such as scripts/rebuild_ledger.py and
+#   deploy/clear_transactions.py (which uses sqlite3 directly).
+# In-process paths must call invalidate() or clear() themselves, as the import
+# job callback does. After the scripts, restart the API or wait for the TTL.
+def _written_tables(session: Session) -> set[str]:
+    return session.info.setdefault(WRITTEN_TABLES_KEY, set())
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _track_flushed_tables(session: Session, flush_context) -> None:
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        _written_tables(session).add(instance.__table__.name)
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _track_bulk_statements(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _written_tables(orm_execute_state.session).add(orm_execute_state.statement.table.name)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _invalidate_written_tables(session: Session) -> None:
+    tables = session.info.pop(WRITTEN_TABLES_KEY, None)
+    if tables:
+        for cache in list(_table_caches):
+            cache.invalidate(tables)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_written_tables(session: Session) -> None:
+    session.info.pop(WRITTEN_TABLES_KEY, None)
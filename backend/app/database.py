@@ -1,16 +1,169 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import importlib.util
+import os
+from typing import Union
 
-DATABASE_URL = "sqlite:///./cashup.db"
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.concurrency import run_in_threadpool
+
+DATABASE_URL = os.getenv("CASHUP_DATABASE_URL", "sqlite:///./cashup.db")
+
+# Applied to every new SQLite connection. Each value can be overridden with
+# CASHUP_SQLITE_<NAME>, e.g. CASHUP_SQLITE_SYNCHRONOUS=FULL.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("CASHUP_SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("CASHUP_SQLITE_SYNCHRONOUS", "NORMAL"),
+    "cache_size": os.getenv("CASHUP_SQLITE_CACHE_SIZE", "-64000"),
+    "mmap_size": os.getenv("CASHUP_SQLITE_MMAP_SIZE", "268435456"),
+    "busy_timeout": os.getenv("CASHUP_SQLITE_BUSY_TIMEOUT", "5000"),
+    "temp_store": os.getenv("CASHUP_SQLITE_TEMP_STORE", "MEMORY"),
+}
+READ_POOL_SIZE = int(os.getenv("CASHUP_READ_POOL_SIZE", "8"))
+# Serve the async read routes from an async engine (aiosqlite/asyncpg) instead of the threadpool.
+ASYNC_DB = os.getenv("CASHUP_ASYNC_DB", "").lower() in ("1", "true", "yes", "on")
+ASYNC_DRIVERS = {"sqlite": ("sqlite+aiosqlite", "aiosqlite"), "postgresql": ("postgresql+asyncpg", "asyncpg")}
+
+_url = make_url(DATABASE_URL)
+IS_SQLITE = _url.get_backend_name() == "sqlite"
+IS_MEMORY_DB = IS_SQLITE and _url.database in (None, "", ":memory:")
+
+
+def _set_sqlite_pragmas(dbapi_connection, pragmas: dict[str, str]) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _connection_pragmas(read_only: bool) -> dict[str, str]:
+    # The journal mode is a property of the database file; only the writer sets it.
+    pragmas = {name: value for name, value in SQLITE_PRAGMAS.items() if not (read_only and name == "journal_mode")}
+    if read_only:
+        pragmas["query_only"] = "ON"
+    return pragmas
+
+
+def _create_engine(read_only: bool = False):
+    if not IS_SQLITE:
+        return create_engine(DATABASE_URL, pool_pre_ping=True)
+    options = {"connect_args": {"check_same_thread": False}}
+    if read_only:
+        options.update(pool_size=READ_POOL_SIZE, max_overflow=READ_POOL_SIZE)
+    new_engine = create_engine(DATABASE_URL, **options)
+    if IS_MEMORY_DB:
+        return new_engine
+    pragmas = _connection_pragmas(read_only)
+
+    @event.listens_for(new_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        _set_sqlite_pragmas(dbapi_connection, pragmas)
+
+    return new_engine
+
+
+def _create_async_read_engine():
+    backend = _url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"CASHUP_ASYNC_DB is not supported for {backend} databases")
+    drivername, module = ASYNC_DRIVERS[backend]
+    if importlib.util.find_spec(module) is None:
+        raise RuntimeError(f"CASHUP_ASYNC_DB requires the {module} package")
+    url = _url.set(drivername=drivername)
+    if not IS_SQLITE:
+        return create_async_engine(url, pool_pre_ping=True)
+    # aiosqlite defaults to NullPool, which would reopen the file and rerun the pragmas on every request.
+    new_engine = create_async_engine(
+        url, poolclass=AsyncAdaptedQueuePool, pool_size=READ_POOL_SIZE, max_overflow=READ_POOL_SIZE
+    )
+    pragmas = _connection_pragmas(read_only=True)
+
+    @event.listens_for(new_engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        _set_sqlite_pragmas(dbapi_connection, pragmas)
+
+    return new_engine
+
+
+engine = _create_engine()
+# GET routes read through their own pool so they never queue behind the
+# writer; with WAL they also keep reading while an import is being written.
+# An in-memory database only exists inside one engine, so it is shared.
+read_engine = engine if IS_MEMORY_DB else _create_engine(read_only=True)
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+# An in-memory database cannot be opened by a second driver, so it keeps the threadpool.
+async_read_engine = _create_async_read_engine() if ASYNC_DB and not IS_MEMORY_DB else None
+AsyncReadSessionLocal = (
+    async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False) if async_read_engine else None
+)
 Base = declarative_base()
 
 
+def _add_missing_columns() -> None:
+    # Only nullable columns can be added in place; anything else needs a rebuild.
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+
+
+def ensure_schema() -> None:
+    Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    # create_all skips tables that already exist, so indexes added to existing
+    # models have to be created on their own.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+class ThreadedSession:
+    """A sync read session behind the ``run_sync`` API of ``AsyncSession``, run on the threadpool."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.session.close)
+
+
+AsyncReadSession = Union[AsyncSession, ThreadedSession]
+
+
+async def get_async_read_db():
+    """Read session for async routes; ``await db.run_sync(fn)`` calls ``fn(session)`` in either mode."""
+    db = AsyncReadSessionLocal() if AsyncReadSessionLocal else ThreadedSession(ReadSessionLocal())
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+from collections.abc import Callable, Iterator
+from datetime import date, datetime
+from typing import Literal
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query, Session
+
+from .database import ReadSessionLocal
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_BATCH_SIZE = 1000
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _serialize(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _iter_export(
+    build_query: Callable[[Session], Query], columns: list[str], export_format: ExportFormat
+) -> Iterator[str]:
+    # The request-scoped session is closed before the body is streamed, so the
+    # export owns its session for as long as the client keeps reading.
+    db = ReadSessionLocal()
+    try:
+        rows = build_query(db).execution_options(stream_results=True).yield_per(EXPORT_BATCH_SIZE)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if export_format == "csv" else None
+        if writer:
+            writer.writerow(columns)
+        pending = 0
+        for row in rows:
+            values = [_serialize(value) for value in row]
+            if writer:
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(columns, values)), ensure_ascii=False))
+                buffer.write("\n")
+            pending += 1
+            if pending >= EXPORT_BATCH_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
+
+
+def stream_export(
+    build_query: Callable[[Session], Query],
+    columns: list[str],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    return StreamingResponse(
+        _iter_export(build_query, columns, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
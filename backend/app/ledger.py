@@ -0,0 +1,329 @@
+import hashlib
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, case, delete, func, insert, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from .models import Account, AccountBalance, AccountDailyBalance, ActionLog, ReconciliationItem, Transaction
+from .rollups import mark_dirty_months
+
+BALANCE_TOLERANCE = 0.005
+STATEMENT_PAYMENT_METHOD = "Extrato bancário PDF"
+STATEMENT_ITEM_STATUS = "Importado"
+
+
+def _field(entry, name: str):
+    if isinstance(entry, Mapping):
+        return entry[name]
+    return getattr(entry, name)
+
+
+def _upsert(db: Session, model, rows: list[dict], keys: list[str]) -> None:
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(model).values(rows)
+    updates = {
+        "total_in": model.total_in + stmt.excluded.total_in,
+        "total_out": model.total_out + stmt.excluded.total_out,
+        "transaction_count": model.transaction_count + stmt.excluded.transaction_count,
+    }
+    if model is AccountBalance:
+        updates["updated_at"] = stmt.excluded.updated_at
+    db.execute(stmt.on_conflict_do_update(index_elements=keys, set_=updates))
+
+
+def apply_transactions(db: Session, transactions: Iterable) -> None:
+    """Add the given transactions to the materialized balances.
+
+    Runs inside the caller's unit of work, so the balances are committed (or
+    rolled back) together with the transactions themselves. The months touched
+    are flagged so their rollups get recomputed.
+    """
+    per_account: dict[int, list] = defaultdict(lambda: [0.0, 0.0, 0])
+    per_day: dict[tuple, list] = defaultdict(lambda: [0.0, 0.0, 0])
+    days = set()
+    for transaction in transactions:
+        account_id = _field(transaction, "account_id")
+        value = _field(transaction, "value")
+        slot = 0 if _field(transaction, "transaction_type") == "Entrada" else 1
+        day = _field(transaction, "date")
+        days.add(day)
+        for totals in (per_account[account_id], per_day[(account_id, day)]):
+            totals[slot] += value
+            totals[2] += 1
+
+    now = datetime.utcnow()
+    _upsert(
+        db,
+        AccountBalance,
+        [
+            {
+                "account_id": account_id,
+                "total_in": total_in,
+                "total_out": total_out,
+                "transaction_count": count,
+                "updated_at": now,
+            }
+            for account_id, (total_in, total_out, count) in per_account.items()
+        ],
+        ["account_id"],
+    )
+    _upsert(
+        db,
+        AccountDailyBalance,
+        [
+            {
+                "account_id": account_id,
+                "date": day,
+                "total_in": total_in,
+                "total_out": total_out,
+                "transaction_count": count,
+            }
+            for (account_id, day), (total_in, total_out, count) in per_day.items()
+        ],
+        ["account_id", "date"],
+    )
+    mark_dirty_months(db, days)
+
+
+def insert_transactions(db: Session, rows: list[dict], user_id: int, action: str = "Criou") -> list[int]:
+    """Bulk-insert transactions with their audit logs and balance updates.
+
+    Everything goes through executemany-style statements in the caller's unit
+    of work; the caller commits once. Returns the new ids in input order.
+    """
+    if not rows:
+        return []
+    transaction_ids = db.scalars(
+        insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+        rows,
+    ).all()
+    db.execute(
+        insert(ActionLog),
+        [
+            {"user_id": user_id, "action": action, "entity": "Transaction", "entity_id": transaction_id}
+            for transaction_id in transaction_ids
+        ],
+    )
+    apply_transactions(db, rows)
+    return list(transaction_ids)
+
+
+def statement_fingerprint(
+    account_id: int, day: date, description: str, detail: Optional[str], signed_value: float
+) -> str:
+    """Content hash of an imported statement line.
+
+    Built only from what the line says, never from the file it came in, so
+    the same line in an overlapping or renamed statement hashes the same.
+    """
+    parts = (
+        str(account_id),
+        day.isoformat(),
+        " ".join(description.lower().split()),
+        " ".join((detail or "").lower().split()),
+        f"{signed_value:.2f}",
+    )
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def backfill_statement_fingerprints(db: Session) -> int:
+    """Fingerprint statement transactions imported before fingerprints existed.
+
+    When older imports already duplicated a line, only its first copy gets the
+    fingerprint; the others stay as they are for the user to review. Returns
+    how many transactions were fingerprinted.
+    """
+    rows = db.execute(
+        select(
+            Transaction.id,
+            Transaction.account_id,
+            Transaction.date,
+            Transaction.description,
+            Transaction.client_supplier,
+            Transaction.value,
+            Transaction.transaction_type,
+        )
+        .where(Transaction.payment_method == STATEMENT_PAYMENT_METHOD, Transaction.fingerprint.is_(None))
+        .order_by(Transaction.id)
+    ).all()
+    taken = set(db.scalars(select(Transaction.fingerprint).where(Transaction.fingerprint.is_not(None))))
+    updates = []
+    for row in rows:
+        signed_value = row.value if row.transaction_type == "Entrada" else -row.value
+        fingerprint = statement_fingerprint(
+            row.account_id, row.date, row.description, row.client_supplier, signed_value
+        )
+        if fingerprint in taken:
+            continue
+        taken.add(fingerprint)
+        updates.append({"id": row.id, "fingerprint": fingerprint})
+    if not updates:
+        return 0
+    db.execute(update(Transaction), updates)
+    db.execute(
+        update(ReconciliationItem)
+        .where(
+            ReconciliationItem.status == STATEMENT_ITEM_STATUS,
+            ReconciliationItem.fingerprint.is_(None),
+            ReconciliationItem.matched_transaction_id.is_not(None),
+        )
+        .values(
+            fingerprint=select(Transaction.fingerprint)
+            .where(Transaction.id == ReconciliationItem.matched_transaction_id)
+            .scalar_subquery()
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return len(updates)
+
+
+def _aggregated_columns():
+    is_income = Transaction.transaction_type == "Entrada"
+    return (
+        func.coalesce(func.sum(case((is_income, Transaction.value), else_=0)), 0).label("total_in"),
+        func.coalesce(func.sum(case((is_income, 0), else_=Transaction.value)), 0).label("total_out"),
+        func.count(Transaction.id).label("transaction_count"),
+    )
+
+
+def rebuild_balances(db: Session) -> None:
+    """Recompute every materialized balance from the raw transactions."""
+    db.execute(delete(AccountDailyBalance))
+    db.execute(delete(AccountBalance))
+    db.execute(
+        insert(AccountBalance).from_select(
+            ["account_id", "total_in", "total_out", "transaction_count", "updated_at"],
+            select(
+                Transaction.account_id,
+                *_aggregated_columns(),
+                literal(datetime.utcnow(), DateTime),
+            ).group_by(Transaction.account_id),
+        )
+    )
+    db.execute(
+        insert(AccountDailyBalance).from_select(
+            ["account_id", "date", "total_in", "total_out", "transaction_count"],
+            select(Transaction.account_id, Transaction.date, *_aggregated_columns()).group_by(
+                Transaction.account_id, Transaction.date
+            ),
+        )
+    )
+
+
+def seed_balances() -> None:
+    """Build the materialized balances when they were never built, e.g. right after an upgrade."""
+    db = SessionLocal()
+    try:
+        if db.query(AccountBalance).first() or not db.query(Transaction.id).first():
+            return
+        rebuild_balances(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _totals(row) -> tuple:
+    if row is None:
+        return (0.0, 0.0, 0)
+    return (row.total_in, row.total_out, row.transaction_count)
+
+
+def _diverges(expected: tuple, stored: tuple) -> bool:
+    return (
+        abs(expected[0] - stored[0]) > BALANCE_TOLERANCE
+        or abs(expected[1] - stored[1]) > BALANCE_TOLERANCE
+        or expected[2] != stored[2]
+    )
+
+
+def verify_balances(db: Session) -> list[dict]:
+    """Compare the materialized balances with the raw transactions.
+
+    Returns one entry per account (and per account/day) whose stored totals diverge.
+    """
+    mismatches = []
+    checks = (
+        (
+            select(Transaction.account_id, *_aggregated_columns()).group_by(Transaction.account_id),
+            db.query(AccountBalance).all(),
+            lambda row: (row.account_id,),
+        ),
+        (
+            select(Transaction.account_id, Transaction.date, *_aggregated_columns()).group_by(
+                Transaction.account_id, Transaction.date
+            ),
+            db.query(AccountDailyBalance).all(),
+            lambda row: (row.account_id, row.date),
+        ),
+    )
+    for expected_query, stored_rows, key in checks:
+        expected = {key(row): row for row in db.execute(expected_query)}
+        stored = {key(row): row for row in stored_rows}
+        for entry_key in sorted(set(expected) | set(stored)):
+            expected_totals = _totals(expected.get(entry_key))
+            stored_totals = _totals(stored.get(entry_key))
+            if _diverges(expected_totals, stored_totals):
+                mismatches.append(
+                    {
+                        "account_id": entry_key[0],
+                        "date": entry_key[1] if len(entry_key) > 1 else None,
+                        "expected": expected_totals,
+                        "stored": stored_totals,
+                    }
+                )
+    return mismatches
+
+
+def get_account_balance(db: Session, account_id: int) -> float:
+    initial_balance = db.query(Account.initial_balance).filter(Account.id == account_id).scalar() or 0
+    totals = db.get(AccountBalance, account_id)
+    if totals is None:
+        return initial_balance
+    return initial_balance + totals.total_in - totals.total_out
+
+
+def cashflow_totals(db: Session) -> tuple[float, float, float]:
+    initial_balance = db.query(func.coalesce(func.sum(Account.initial_balance), 0)).scalar()
+    total_in, total_out = db.query(
+        func.coalesce(func.sum(AccountBalance.total_in), 0),
+        func.coalesce(func.sum(AccountBalance.total_out), 0),
+    ).one()
+    return initial_balance + total_in - total_out, total_in, total_out
+
+
+def daily_balances(db: Session, account_id: int, date_from=None, date_to=None) -> list[dict]:
+    """Running end-of-day balance for an account, one point per day with movement."""
+    initial_balance = db.query(Account.initial_balance).filter(Account.id == account_id).scalar() or 0
+    net = AccountDailyBalance.total_in - AccountDailyBalance.total_out
+    running = (
+        select(
+            AccountDailyBalance.date,
+            AccountDailyBalance.total_in,
+            AccountDailyBalance.total_out,
+            func.sum(net).over(order_by=AccountDailyBalance.date).label("running_net"),
+        )
+        .where(AccountDailyBalance.account_id == account_id)
+        .subquery()
+    )
+    query = select(running)
+    if date_from:
+        query = query.where(running.c.date >= date_from)
+    if date_to:
+        query = query.where(running.c.date <= date_to)
+    return [
+        {
+            "date": row.date,
+            "total_in": row.total_in,
+            "total_out": row.total_out,
+            "balance": initial_balance + row.running_net,
+        }
+        for row in db.execute(query.order_by(running.c.date))
+    ]
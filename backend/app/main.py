@@ -8,7 +8,9 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from fastapi.encoders import jsonable_encoder
 
-from .database import Base, engine
+from .database import ensure_schema
+from .ledger import seed_balances
+from .rollups import seed_rollups
 from .routers import accounts, cashflow, categories, reconciliation, reports, titles, transactions, users
 
 logging.basicConfig(level=logging.INFO)
@@ -22,9 +24,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-Base.metadata.create_all(bind=engine)
+ensure_schema()
+seed_balances()
+seed_rollups()
+reconciliation.fail_interrupted_import_jobs()
 
 
 def _sanitize_errors(value):
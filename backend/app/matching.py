@@ -0,0 +1,157 @@
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import timedelta
+from difflib import SequenceMatcher
+from typing import NamedTuple, Optional
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from .models import ReconciliationItem, Transaction
+
+PENDING_STATUS = "Pendente"
+MATCHED_STATUS = "Conciliado"
+MATCH_WINDOW_DAYS = 3
+# The best candidate must beat the runner-up by this much to be applied.
+MATCH_MIN_MARGIN = 0.15
+# Score lost per day of distance, relative to the window.
+DATE_PENALTY = 0.1
+
+
+class MatchResult(NamedTuple):
+    pending: int
+    matched: int
+    ambiguous: int
+    unmatched: int
+
+
+class _Candidate(NamedTuple):
+    day: int
+    transaction_id: int
+    description: str
+
+
+def _cents(value: float) -> int:
+    return round(abs(value) * 100)
+
+
+def _normalize(text: Optional[str]) -> str:
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return " ".join("".join(char for char in decomposed if not unicodedata.combining(char)).lower().split())
+
+
+class TransactionIndex:
+    """Unmatched transactions bucketed by (account, cents, direction), each bucket sorted by date.
+
+    Every transaction is also filed under account None, which is where items
+    imported without an account look for candidates.
+    """
+
+    def __init__(self, rows):
+        buckets = defaultdict(list)
+        for transaction_id, account_id, day, value, transaction_type, description in rows:
+            key = (_cents(value), transaction_type == "Entrada")
+            candidate = _Candidate(day.toordinal(), transaction_id, _normalize(description))
+            buckets[(account_id, *key)].append(candidate)
+            buckets[(None, *key)].append(candidate)
+        self._buckets = {}
+        for key, candidates in buckets.items():
+            candidates.sort()
+            self._buckets[key] = ([candidate.day for candidate in candidates], candidates)
+
+    def candidates(self, account_id: Optional[int], value: float, day: int, window: int) -> list[_Candidate]:
+        bucket = self._buckets.get((account_id, _cents(value), value > 0))
+        if not bucket:
+            return []
+        days, candidates = bucket
+        return candidates[bisect_left(days, day - window) : bisect_right(days, day + window)]
+
+
+def _score(description: str, candidate: _Candidate, day: int, window: int) -> float:
+    similarity = SequenceMatcher(None, description, candidate.description).ratio()
+    return similarity - DATE_PENALTY * abs(candidate.day - day) / max(window, 1)
+
+
+def match_pending(
+    db: Session,
+    account_id: Optional[int] = None,
+    window_days: int = MATCH_WINDOW_DAYS,
+    limit: Optional[int] = None,
+) -> MatchResult:
+    """Link pending reconciliation items to transactions with the same value near the same date.
+
+    Candidates come from one in-memory index built per run. An item is only
+    matched when it has a single candidate or a clear best one; ties are left
+    pending for manual review. The caller commits.
+    """
+    query = (
+        select(
+            ReconciliationItem.id,
+            ReconciliationItem.account_id,
+            ReconciliationItem.date,
+            ReconciliationItem.value,
+            ReconciliationItem.description,
+        )
+        .where(ReconciliationItem.status == PENDING_STATUS, ReconciliationItem.matched_transaction_id.is_(None))
+        .order_by(ReconciliationItem.date, ReconciliationItem.id)
+    )
+    if account_id is not None:
+        query = query.where(or_(ReconciliationItem.account_id == account_id, ReconciliationItem.account_id.is_(None)))
+    if limit is not None:
+        query = query.limit(limit)
+    items = [item for item in db.execute(query) if item.value]
+    if not items:
+        return MatchResult(0, 0, 0, 0)
+
+    wanted_cents = {_cents(item.value) for item in items}
+    claimed = set(
+        db.scalars(
+            select(ReconciliationItem.matched_transaction_id).where(
+                ReconciliationItem.matched_transaction_id.is_not(None)
+            )
+        )
+    )
+    transactions = select(
+        Transaction.id,
+        Transaction.account_id,
+        Transaction.date,
+        Transaction.value,
+        Transaction.transaction_type,
+        Transaction.description,
+    ).where(
+        # Items are sorted by date, so the window spans from the first to the last one.
+        Transaction.date >= items[0].date - timedelta(days=window_days),
+        Transaction.date <= items[-1].date + timedelta(days=window_days),
+    )
+    if account_id is not None:
+        transactions = transactions.where(Transaction.account_id == account_id)
+    index = TransactionIndex(
+        row for row in db.execute(transactions) if row.id not in claimed and _cents(row.value) in wanted_cents
+    )
+
+    updates = []
+    ambiguous = 0
+    for item in items:
+        day = item.date.toordinal()
+        description = _normalize(item.description)
+        scored = sorted(
+            (
+                (_score(description, candidate, day, window_days), candidate.transaction_id)
+                for candidate in index.candidates(item.account_id or account_id, item.value, day, window_days)
+                if candidate.transaction_id not in claimed
+            ),
+            reverse=True,
+        )
+        if not scored:
+            continue
+        if len(scored) > 1 and scored[0][0] - scored[1][0] < MATCH_MIN_MARGIN:
+            ambiguous += 1
+            continue
+        transaction_id = scored[0][1]
+        claimed.add(transaction_id)
+        updates.append({"id": item.id, "matched_transaction_id": transaction_id, "status": MATCHED_STATUS})
+
+    if updates:
+        db.execute(update(ReconciliationItem), updates)
+    return MatchResult(len(items), len(updates), ambiguous, len(items) - len(updates) - ambiguous)
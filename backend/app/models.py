@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Boolean, Column, Date, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, Date, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from .database import Base
@@ -77,9 +77,58 @@ class Transaction(Base):
     document_path = Column(String(255))
     tax_id = Column(String(30))
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Content hash of the statement line a transaction was imported from; see ledger.statement_fingerprint.
+    fingerprint = Column(String(64), index=True, unique=True)
 
     account = relationship("Account", back_populates="transactions")
 
+    __table_args__ = (
+        Index("ix_transactions_date_id", "date", "id"),
+        Index("ix_transactions_account_date_id", "account_id", "date", "id"),
+        Index("ix_transactions_category_date_id", "category_id", "date", "id"),
+        Index("ix_transactions_type_date_id", "transaction_type", "date", "id"),
+        # Covering indexes for the date-ranged reports: the aggregation never touches the table.
+        Index("ix_transactions_date_category_type_value", "date", "category_id", "transaction_type", "value"),
+        Index("ix_transactions_date_account_type_value", "date", "account_id", "transaction_type", "value"),
+    )
+
+
+class AccountBalance(Base):
+    __tablename__ = "account_balances"
+
+    account_id = Column(Integer, ForeignKey("accounts.id"), primary_key=True)
+    total_in = Column(Float, nullable=False, default=0)
+    total_out = Column(Float, nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class AccountDailyBalance(Base):
+    __tablename__ = "account_daily_balances"
+
+    account_id = Column(Integer, ForeignKey("accounts.id"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    total_in = Column(Float, nullable=False, default=0)
+    total_out = Column(Float, nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+
+
+class MonthlyRollup(Base):
+    __tablename__ = "monthly_rollups"
+
+    month = Column(Date, primary_key=True)
+    account_id = Column(Integer, ForeignKey("accounts.id"), primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+    transaction_type = Column(String(20), primary_key=True)
+    total = Column(Float, nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+
+
+class RollupDirtyMonth(Base):
+    __tablename__ = "rollup_dirty_months"
+
+    month = Column(Date, primary_key=True)
+
 
 class PayableReceivable(Base):
     __tablename__ = "titles"
@@ -98,14 +147,47 @@ class PayableReceivable(Base):
 
 class ReconciliationItem(Base):
     __tablename__ = "reconciliation_items"
+    __table_args__ = (Index("ix_reconciliation_items_account_external_id", "account_id", "external_id"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    external_id = Column(String(80))
+    external_id = Column(String(80), index=True)
     date = Column(Date, nullable=False)
     description = Column(String(255), nullable=False)
     value = Column(Float, nullable=False)
     status = Column(String(20), default="Pendente")
     matched_transaction_id = Column(Integer, ForeignKey("transactions.id"), nullable=True)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=True)
+    fingerprint = Column(String(64), index=True, unique=True)
+
+
+class StatementImport(Base):
+    __tablename__ = "statement_imports"
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), unique=True, index=True, nullable=False)
+    filename = Column(String(255), nullable=False)
+    entry_count = Column(Integer, nullable=False, default=0)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String(255), nullable=False)
+    status = Column(String(20), nullable=False, default="Na fila")
+    progress = Column(Integer, nullable=False, default=0)
+    parsed_count = Column(Integer, nullable=False, default=0)
+    created_count = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
+    income_category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    expense_category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
 
 
 class ActionLog(Base):
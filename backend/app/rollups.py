@@ -0,0 +1,116 @@
+import logging
+import threading
+from collections.abc import Iterable
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import Date, delete, func, insert, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from .database import IS_SQLITE, SQLITE_PRAGMAS, SessionLocal, engine
+from .models import MonthlyRollup, RollupDirtyMonth, Transaction
+
+logger = logging.getLogger("cashup.rollups")
+_refresh_lock = threading.Lock()
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def mark_dirty_months(db: Session, days: Iterable[date]) -> None:
+    """Flag the months of the given dates for recomputation, in the caller's unit of work."""
+    months = {month_start(day) for day in days}
+    if not months:
+        return
+    dialect = db.get_bind().dialect.name
+    insert_for_dialect = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert_for_dialect(RollupDirtyMonth).values([{"month": month} for month in sorted(months)])
+    db.execute(stmt.on_conflict_do_nothing(index_elements=["month"]))
+
+
+def _rebuild_month(db: Session, month: date) -> None:
+    db.execute(delete(MonthlyRollup).where(MonthlyRollup.month == month))
+    db.execute(
+        insert(MonthlyRollup).from_select(
+            ["month", "account_id", "category_id", "transaction_type", "total", "transaction_count"],
+            select(
+                literal(month, Date),
+                Transaction.account_id,
+                Transaction.category_id,
+                Transaction.transaction_type,
+                func.sum(Transaction.value),
+                func.count(),
+            )
+            .where(Transaction.date >= month, Transaction.date < next_month(month))
+            .group_by(Transaction.account_id, Transaction.category_id, Transaction.transaction_type),
+        )
+    )
+
+
+def refresh_rollups() -> Optional[int]:
+    """Recompute the dirty months on a writer connection and return how many were rebuilt.
+
+    Reports call this on a cache miss, before opening their read snapshot. It
+    never waits: while another refresh runs or another writer holds the write
+    lock, this returns None and the reports read the months still flagged dirty
+    from the raw rows.
+    """
+    if not _refresh_lock.acquire(blocking=False):
+        return None
+    try:
+        return _refresh_dirty_months()
+    finally:
+        _refresh_lock.release()
+
+
+def _refresh_dirty_months() -> Optional[int]:
+    with engine.connect() as connection:
+        if IS_SQLITE:
+            connection.exec_driver_sql("PRAGMA busy_timeout = 0")
+        db = SessionLocal(bind=connection)
+        try:
+            months = db.scalars(select(RollupDirtyMonth.month)).all()
+            for month in months:
+                _rebuild_month(db, month)
+            if months:
+                db.execute(delete(RollupDirtyMonth).where(RollupDirtyMonth.month.in_(months)))
+                db.commit()
+            return len(months)
+        except OperationalError as error:
+            db.rollback()
+            if not IS_SQLITE or "locked" not in str(error.orig):
+                raise
+            logger.info("Rollup refresh skipped, the database is busy: %s", error.orig)
+            return None
+        finally:
+            db.close()
+            if IS_SQLITE:
+                connection.exec_driver_sql(f"PRAGMA busy_timeout = {SQLITE_PRAGMAS['busy_timeout']}")
+
+
+def seed_rollups() -> None:
+    """Flag every month as dirty when the rollups were never built, e.g. right after an upgrade."""
+    db = SessionLocal()
+    try:
+        if db.query(MonthlyRollup).first() or db.query(RollupDirtyMonth).first():
+            return
+        mark_dirty_months(db, db.scalars(select(Transaction.date).distinct()))
+        db.commit()
+    finally:
+        db.close()
+
+
+def rebuild_rollups(db: Session) -> None:
+    """Recompute every month from the raw transactions."""
+    db.execute(delete(MonthlyRollup))
+    db.execute(delete(RollupDirtyMonth))
+    days = db.scalars(select(Transaction.date).distinct()).all()
+    for month in sorted({month_start(day) for day in days}):
+        _rebuild_month(db, month)
@@ -1,10 +1,14 @@
+from datetime import date
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from ..auth import require_role
-from ..database import get_db
+from ..database import get_db, get_read_db
+from ..ledger import daily_balances, get_account_balance
 from ..models import Account, Bank, PayableReceivable, Transaction
-from ..schemas import AccountCreate, AccountOut, AccountUpdate, BankCreate, BankOut
+from ..schemas import AccountCreate, AccountDailyBalanceOut, AccountOut, AccountUpdate, BankCreate, BankOut
 
 router = APIRouter(prefix="/api/accounts", tags=["Contas"])
 
@@ -19,7 +23,7 @@ def create_bank(payload: BankCreate, db: Session = Depends(get_db), user=Depends
 
 
 @router.get("/banks", response_model=list[BankOut])
-def list_banks(db: Session = Depends(get_db), user=Depends(require_role("viewer"))):
+def list_banks(db: Session = Depends(get_read_db), user=Depends(require_role("viewer"))):
     return db.query(Bank).all()
 
 
@@ -33,7 +37,7 @@ def create_account(payload: AccountCreate, db: Session = Depends(get_db), user=D
 
 
 @router.get("", response_model=list[AccountOut])
-def list_accounts(db: Session = Depends(get_db), user=Depends(require_role("viewer"))):
+def list_accounts(db: Session = Depends(get_read_db), user=Depends(require_role("viewer"))):
     return db.query(Account).all()
 
 
@@ -83,13 +87,16 @@ def delete_account(
 
 
 @router.get("/{account_id}/balance")
-def account_balance(account_id: int, db: Session = Depends(get_db), user=Depends(require_role("viewer"))):
-    account = db.query(Account).filter(Account.id == account_id).first()
-    transactions = db.query(Transaction).filter(Transaction.account_id == account_id).all()
-    total = account.initial_balance if account else 0
-    for transaction in transactions:
-        if transaction.transaction_type == "Entrada":
-            total += transaction.value
-        else:
-            total -= transaction.value
-    return {"account_id": account_id, "balance": total}
+def account_balance(account_id: int, db: Session = Depends(get_read_db), user=Depends(require_role("viewer"))):
+    return {"account_id": account_id, "balance": get_account_balance(db, account_id)}
+
+
+@router.get("/{account_id}/balance/daily", response_model=list[AccountDailyBalanceOut])
+def account_daily_balance(
+    account_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    user=Depends(require_role("viewer")),
+):
+    return daily_balances(db, account_id, date_from, date_to)
@@ -1,44 +1,120 @@
-from datetime import date
-from fastapi import APIRouter, Depends
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
 from ..auth import require_role
-from ..database import get_db
-from ..models import Account, PayableReceivable, Transaction
-from ..schemas import CashflowSummary
+from ..database import AsyncReadSession, get_async_read_db
+from ..ledger import cashflow_totals, get_account_balance
+from ..models import Account, PayableReceivable
+from ..schemas import CashflowProjection, CashflowProjectionPoint, CashflowSummary
 
 router = APIRouter(prefix="/api/cashflow", tags=["Fluxo de Caixa"])
 
+Granularity = Literal["day", "week", "month"]
+SETTLED_STATUSES = ("Pago", "Recebido")
 
-@router.get("/summary", response_model=CashflowSummary)
-def cashflow_summary(db: Session = Depends(get_db), user=Depends(require_role("viewer"))):
-    accounts = db.query(Account).all()
-    transactions = db.query(Transaction).all()
-    total_balance = sum(account.initial_balance for account in accounts)
-    total_in = 0
-    total_out = 0
-    for transaction in transactions:
-        if transaction.transaction_type == "Entrada":
-            total_in += transaction.value
-            total_balance += transaction.value
+
+def _period_start(day: date, granularity: Granularity) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _period_starts(start: date, end: date, granularity: Granularity) -> list[date]:
+    periods = []
+    current = _period_start(start, granularity)
+    while current <= end:
+        periods.append(current)
+        if granularity == "day":
+            current += timedelta(days=1)
+        elif granularity == "week":
+            current += timedelta(days=7)
         else:
-            total_out += transaction.value
-            total_balance -= transaction.value
+            current = (current + timedelta(days=32)).replace(day=1)
+    return periods
+
+
+def _pending_titles_by_day(db: Session, until: date, account_id: Optional[int]):
+    """Pending receivables and payables summed per due date, in SQL."""
+    receivable = PayableReceivable.title_type == "Receber"
+    query = (
+        select(
+            PayableReceivable.due_date,
+            func.sum(case((receivable, PayableReceivable.value), else_=0)),
+            func.sum(case((receivable, 0), else_=PayableReceivable.value)),
+            func.count(),
+        )
+        .where(PayableReceivable.status.not_in(SETTLED_STATUSES), PayableReceivable.due_date <= until)
+        .group_by(PayableReceivable.due_date)
+    )
+    if account_id is not None:
+        query = query.where(PayableReceivable.account_id == account_id)
+    return db.execute(query)
+
+
+@router.get("/summary", response_model=CashflowSummary)
+async def cashflow_summary(db: AsyncReadSession = Depends(get_async_read_db), user=Depends(require_role("viewer"))):
+    total_balance, total_in, total_out = await db.run_sync(cashflow_totals)
     return CashflowSummary(total_balance=total_balance, total_in=total_in, total_out=total_out)
 
 
-@router.get("/projection")
-def cashflow_projection(db: Session = Depends(get_db), user=Depends(require_role("viewer"))):
-    titles = db.query(PayableReceivable).all()
-    projection = []
-    for title in titles:
-        projection.append(
-            {
-                "title_id": title.id,
-                "due_date": title.due_date,
-                "value": title.value,
-                "type": title.title_type,
-                "status": title.status,
-            }
+def _projection(
+    db: Session, horizon_days: int, granularity: Granularity, account_id: Optional[int]
+) -> CashflowProjection:
+    today = date.today()
+    until = today + timedelta(days=horizon_days)
+    if account_id is None:
+        opening_balance = cashflow_totals(db)[0]
+    elif db.get(Account, account_id):
+        opening_balance = get_account_balance(db, account_id)
+    else:
+        raise HTTPException(status_code=404, detail="Conta não encontrada.")
+
+    periods = _period_starts(today, until, granularity)
+    slots = {period: index for index, period in enumerate(periods)}
+    inflow = [0.0] * len(periods)
+    outflow = [0.0] * len(periods)
+    counts = [0] * len(periods)
+    for due_date, total_in, total_out, count in _pending_titles_by_day(db, until, account_id):
+        # Overdue titles are still expected, so they land in the first period.
+        slot = slots[_period_start(max(due_date, today), granularity)]
+        inflow[slot] += total_in
+        outflow[slot] += total_out
+        counts[slot] += count
+
+    net = [received - paid for received, paid in zip(inflow, outflow)]
+    balances = [opening_balance + running for running in accumulate(net)]
+    points = [
+        CashflowProjectionPoint(
+            period_start=period,
+            inflow=inflow[slot],
+            outflow=outflow[slot],
+            title_count=counts[slot],
+            balance=balance,
         )
-    return {"as_of": date.today(), "projection": projection}
+        for slot, (period, balance) in enumerate(zip(periods, balances))
+    ]
+    return CashflowProjection(
+        as_of=today,
+        granularity=granularity,
+        horizon_days=horizon_days,
+        opening_balance=opening_balance,
+        points=points,
+    )
+
+
+@router.get("/projection", response_model=CashflowProjection)
+async def cashflow_projection(
+    horizon_days: int = Query(90, ge=1, le=730),
+    granularity: Granularity = Query("day"),
+    account_id: Optional[int] = Query(None),
+    db: AsyncReadSession = Depends(get_async_read_db),
+    user=Depends(require_role("viewer")),
+):
+    return await db.run_sync(_projection, horizon_days, granularity, account_id)
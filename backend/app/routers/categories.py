@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from ..auth import require_role
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models import Category, CostCenter, Transaction
 from ..schemas import CategoryCreate, CategoryOut, CostCenterCreate, CostCenterOut
 
@@ -19,7 +19,7 @@ def create_category(payload: CategoryCreate, db: Session = Depends(get_db), user
 
 
 @router.get("", response_model=list[CategoryOut])
-def list_categories(db: Session = Depends(get_db), user=Depends(require_role("viewer"))):
+def list_categories(db: Session = Depends(get_read_db), user=Depends(require_role("viewer"))):
     return db.query(Category).all()
 
 
@@ -62,5 +62,5 @@ def create_cost_center(payload: CostCenterCreate, db: Session = Depends(get_db),
 
 
 @router.get("/cost-centers", response_model=list[CostCenterOut])
-def list_cost_centers(db: Session = Depends(get_db), user=Depends(require_role("viewer"))):
+def list_cost_centers(db: Session = Depends(get_read_db), user=Depends(require_role("viewer"))):
     return db.query(CostCenter).all()
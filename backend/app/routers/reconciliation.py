@@ -1,18 +1,43 @@
+import base64
+import codecs
 import csv
+import html
 import io
 import importlib.util
 import logging
+import multiprocessing
+import os
 import re
+import threading
 import zlib
-from datetime import datetime
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime
+from functools import lru_cache, partial
 from io import BytesIO
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from itertools import islice
+from typing import BinaryIO, NamedTuple, Optional
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from .. import statement_cache, statement_parsers
 from ..auth import require_role
-from ..database import get_db
-from ..models import ActionLog, ReconciliationItem, Transaction
-from ..schemas import ReconciliationItemOut, TransactionOut
+from ..cache import report_cache
+from ..database import AsyncReadSession, SessionLocal, get_async_read_db, get_db
+from ..exports import ExportFormat, stream_export
+from ..ledger import STATEMENT_ITEM_STATUS, STATEMENT_PAYMENT_METHOD, insert_transactions, statement_fingerprint
+from ..matching import MATCH_WINDOW_DAYS, match_pending
+from ..models import Account, Category, ImportJob, ReconciliationItem, StatementImport, Transaction
+from ..schemas import (
+    ImportJobOut,
+    ReconciliationImportSummary,
+    ReconciliationItemOut,
+    ReconciliationMatchSummary,
+    TransactionOut,
+)
 
 if importlib.util.find_spec("pypdf") is not None:
     from pypdf import PdfReader
@@ -73,6 +98,9 @@ NOISE_PATTERNS = [
         r"^0800",
     )
 ]
+# All noise patterns are anchored at the start, so one alternation is equivalent
+# to trying them one by one.
+NOISE_RE = re.compile("|".join(f"(?:{pattern.pattern})" for pattern in NOISE_PATTERNS), re.IGNORECASE)
 
 PORTUGUESE_MONTHS = {
     "janeiro": 1,
@@ -99,6 +127,61 @@ AMOUNT_PATTERNS = [
 ]
 LITERAL_STRING_RE = re.compile(r"\((?:\\.|[^\\()])*\)")
 SHORT_DATE_RE = re.compile(r"^\d{2}/\d{2}/\d{4}$")
+GLUED_DATE_SPLIT_RE = re.compile(
+    r"(?<!^)(?<![\d/])(?=(\d{1,2}\s+de\s+[a-zç]+\s+de\s+\d{4}(?:,\s*[a-z-]+)?))",
+    re.IGNORECASE,
+)
+WHITESPACE_RE = re.compile(r"\s+")
+NOISY_CHARS = ("", "", "", "", "•", "·", "\uf0e6", "\uf131", "\uf12e", "\uf3e1")
+NOISY_CHARS_TABLE = str.maketrans({"−": "-", "–": "-", "—": "-", **{char: " " for char in NOISY_CHARS}})
+LINE_DATE = "date"
+LINE_BALANCE = "balance"
+LINE_NOISE = "noise"
+LINE_SHORT_DATE = "short_date"
+LINE_AMOUNT = "amount"
+LINE_TEXT = "text"
+SANTANDER_BANK_MARKER = "santander"
+# Phrases such as "internet banking empresarial" are shared by other Brazilian banks, so
+# they only count next to the bank's name.
+SANTANDER_LAYOUT_MARKERS = ("internet banking empresarial", "extrato de conta corrente", "saldo do dia")
+ALREADY_IMPORTED_DETAIL = "Este extrato já foi importado."
+JOB_INTERRUPTED_DETAIL = "Importação interrompida por reinício do servidor. Envie o arquivo novamente."
+PDF_NOT_PARSED_DETAIL = (
+    "Não foi possível localizar lançamentos no PDF. Use um extrato Santander no mesmo layout do template."
+)
+IMPORT_WORKERS = int(os.getenv("CASHUP_IMPORT_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_EXTRACT_WORKERS = int(os.getenv("CASHUP_PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("CASHUP_PDF_PARALLEL_MIN_PAGES", "20"))
+_process_pools: dict[str, ProcessPoolExecutor] = {}
+_process_pools_lock = threading.Lock()
+IMPORT_BATCH_SIZE = 1000
+OFX_CHUNK_SIZE = 1 << 16
+PDF_STREAM_START_RE = re.compile(rb"(?<![A-Za-z])stream(?:\r\n|\n|\r)")
+PDF_STREAM_END_RE = re.compile(rb"\s*endstream")
+PDF_OBJECT_RE = re.compile(rb"(\d+)\s+\d+\s+obj\b")
+PDF_LENGTH_RE = re.compile(rb"/Length\s+(\d+)\b(?!\s+\d+\s+R)")
+PDF_FILTER_RE = re.compile(rb"/Filter\s*(\[[^\]]*\]|/\w+)")
+PDF_NAME_RE = re.compile(rb"/(\w+)")
+# Image codecs never hold page text, so their streams are skipped without decoding.
+PDF_IMAGE_FILTERS = {b"DCTDecode", b"DCT", b"JPXDecode", b"CCITTFaxDecode", b"CCF", b"JBIG2Decode"}
+PDF_ASCII_WHITESPACE = b" \t\n\r\x0b\x0c\x00"
+PDF_TOUNICODE_RE = re.compile(rb"/ToUnicode\s+(\d+)\s+\d+\s+R")
+PDF_HEX_STRING_RE = re.compile(r"<[0-9A-Fa-f\s]+>")
+PDF_NON_HEX_RE = re.compile(r"[^0-9A-Fa-f]")
+PDF_GLYPH_MEMO_SIZE = 4096
+OFX_HEADER_SIZE = 1024
+OFX_TOKEN_RE = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+OFX_DEBIT_TYPES = {"DEBIT", "PAYMENT", "FEE", "SRVCHG", "ATM", "POS", "CHECK", "DIRECTDEBIT", "REPEATPMT"}
+JOB_WRITTEN_TABLES = ("transactions", "reconciliation_items", "account_balances", "account_daily_balances")
+EXPORT_COLUMNS = ["id", "external_id", "date", "description", "value", "status", "matched_transaction_id", "account_id"]
+
+
+class StatementLine(NamedTuple):
+    kind: str
+    text: str
+    statement_date: Optional[date] = None
+    amount: Optional[float] = None
+    text_before_amount: str = ""
 
 
 def _decode_pdf_literal(value: str) -> str:
@@ -145,97 +228,234 @@ def _decode_pdf_literal(value: str) -> str:
     return "".join(buffer)
 
 
-def _decompress_pdf_stream(raw_stream: bytes) -> list[bytes]:
-    candidates = [raw_stream]
+class PdfStream(NamedTuple):
+    object_number: Optional[int]
+    filters: tuple[bytes, ...]
+    start: int
+    end: int
+
+
+def _index_pdf_streams(content: bytes) -> tuple[list[PdfStream], set[int]]:
+    """Locate every stream and the objects referenced as ToUnicode maps in one pass.
+
+    Only the bytes between streams are searched; stream bodies are skipped by
+    their declared /Length, so binary data is never scanned by a regex.
+    """
+    streams = []
+    tounicode_objects: set[int] = set()
+    position = 0
+    while match := PDF_STREAM_START_RE.search(content, position):
+        headers = list(PDF_OBJECT_RE.finditer(content, position, match.start()))
+        dictionary = content[headers[-1].end() if headers else position : match.start()]
+        tounicode_objects.update(map(int, PDF_TOUNICODE_RE.findall(content, position, match.start())))
+        start = match.end()
+        length = PDF_LENGTH_RE.search(dictionary)
+        if length and PDF_STREAM_END_RE.match(content, start + int(length.group(1))):
+            end = start + int(length.group(1))
+        else:
+            # Indirect or wrong /Length: fall back to the endstream keyword.
+            end = content.find(b"endstream", start)
+            if end < 0:
+                break
+            while end > start and content[end - 1] in b"\r\n":
+                end -= 1
+        declared_filter = PDF_FILTER_RE.search(dictionary)
+        streams.append(
+            PdfStream(
+                object_number=int(headers[-1].group(1)) if headers else None,
+                filters=tuple(PDF_NAME_RE.findall(declared_filter.group(1))) if declared_filter else (),
+                start=start,
+                end=end,
+            )
+        )
+        position = content.find(b"endstream", end) + len(b"endstream")
+    tounicode_objects.update(map(int, PDF_TOUNICODE_RE.findall(content, position)))
+    return streams, tounicode_objects
+
+
+def _inflate(data) -> Optional[bytes]:
     for wbits in (zlib.MAX_WBITS, -zlib.MAX_WBITS):
         try:
-            candidates.append(zlib.decompress(raw_stream, wbits))
+            # A decompressor object keeps what it inflated before any trailing garbage.
+            return zlib.decompressobj(wbits).decompress(data)
         except zlib.error:
             continue
-    return candidates
+    return None
 
 
-def _build_tounicode_map(content: bytes) -> dict[str, str]:
-    glyph_map: dict[str, str] = {}
-    object_re = re.compile(rb"\d+\s+\d+\s+obj(.*?)endobj", re.S)
-    for object_match in object_re.finditer(content):
-        object_body = object_match.group(1)
-        if b"begincmap" not in object_body:
-            continue
-        stream_match = re.search(rb"stream\r?\n(.*?)\r?\nendstream", object_body, re.S)
-        if not stream_match:
-            continue
-        for candidate in _decompress_pdf_stream(stream_match.group(1)):
-            decoded = candidate.decode("latin-1", errors="ignore")
-            if "begincmap" not in decoded:
-                continue
-            for src, dst in re.findall(r"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>", decoded):
-                glyph_map[src.upper()] = _decode_pdf_hex_string(dst, {})
-            range_pattern = re.compile(
-                r"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>\s*(?:<([0-9A-Fa-f]+)>|\[(.*?)\])",
-                re.S,
-            )
-            for start_hex, end_hex, single_target, target_list in range_pattern.findall(decoded):
-                start = int(start_hex, 16)
-                end = int(end_hex, 16)
-                if single_target:
-                    current = int(single_target, 16)
-                    for offset, codepoint in enumerate(range(start, end + 1)):
-                        glyph_map[f"{codepoint:0{len(start_hex)}X}"] = _decode_pdf_hex_string(
-                            f"{current + offset:0{len(single_target)}X}", {}
-                        )
-                elif target_list:
-                    targets = [value.upper() for value in re.findall(r"<([0-9A-Fa-f]+)>", target_list)]
-                    for offset, codepoint in enumerate(range(start, end + 1)):
-                        if offset >= len(targets):
-                            break
-                        glyph_map[f"{codepoint:0{len(start_hex)}X}"] = _decode_pdf_hex_string(targets[offset], {})
-            break
-    return glyph_map
+def _decode_ascii_hex(data) -> Optional[bytes]:
+    digits = bytes(data).split(b">", 1)[0].translate(None, PDF_ASCII_WHITESPACE)
+    try:
+        # An odd final digit is followed by an implicit 0.
+        return bytes.fromhex((digits + b"0" * (len(digits) % 2)).decode("ascii"))
+    except (UnicodeDecodeError, ValueError):
+        return None
 
 
-def _decode_pdf_hex_string(value: str, glyph_map: dict[str, str]) -> str:
-    normalized = re.sub(r"[^0-9A-Fa-f]", "", value).upper()
-    if not normalized:
-        return ""
+def _decode_ascii85(data) -> Optional[bytes]:
+    body = bytes(data).strip(PDF_ASCII_WHITESPACE)
+    if body.startswith(b"<~"):
+        body = body[2:]
+    body = body.split(b"~>", 1)[0]
+    try:
+        return base64.a85decode(body, ignorechars=PDF_ASCII_WHITESPACE)
+    except ValueError:
+        return None
+
+
+PDF_STREAM_DECODERS = {
+    b"FlateDecode": _inflate,
+    b"Fl": _inflate,
+    b"ASCIIHexDecode": _decode_ascii_hex,
+    b"AHx": _decode_ascii_hex,
+    b"ASCII85Decode": _decode_ascii85,
+    b"A85": _decode_ascii85,
+}
+
+
+def _decode_pdf_stream(data: memoryview, filters: tuple[bytes, ...]) -> Optional[bytes]:
+    """Stream bytes with their filter chain applied, or None for image streams."""
+    if any(name in PDF_IMAGE_FILTERS for name in filters):
+        return None
+    decoded = data
+    for name in filters:
+        decoder = PDF_STREAM_DECODERS.get(name)
+        decoded = decoder(decoded) if decoder else None
+        if decoded is None:
+            # Unknown chains and broken data get the old best effort: inflated if that works, raw otherwise.
+            return _inflate(data) or bytes(data)
+    return bytes(decoded)
 
-    for chunk_size in (4, 2):
-        if len(normalized) % chunk_size != 0:
-            continue
-        chunks = [normalized[index : index + chunk_size] for index in range(0, len(normalized), chunk_size)]
-        if glyph_map and any(chunk in glyph_map for chunk in chunks):
-            decoded = []
-            for chunk in chunks:
-                if chunk in glyph_map:
-                    decoded.append(glyph_map[chunk])
-                else:
-                    decoded.append(_decode_pdf_hex_string(chunk, {}))
-            return "".join(decoded)
 
+class PdfStreamIndex:
+    """The streams of a PDF, each decompressed at most once and only when asked for."""
+
+    def __init__(self, content: bytes):
+        self._view = memoryview(content)
+        self.streams, self._tounicode_objects = _index_pdf_streams(content)
+        self._texts: dict[int, Optional[str]] = {}
+        self._glyph_decoder: Optional[GlyphDecoder] = None
+
+    def text(self, position: int) -> Optional[str]:
+        """Decoded stream as latin-1 text, or None for image streams, which cannot hold text."""
+        if position not in self._texts:
+            stream = self.streams[position]
+            decoded = _decode_pdf_stream(self._view[stream.start : stream.end], stream.filters)
+            self._texts[position] = decoded.decode("latin-1") if decoded is not None else None
+        return self._texts[position]
+
+    def texts(self) -> Iterator[str]:
+        for position in range(len(self.streams)):
+            text = self.text(position)
+            if text is not None:
+                yield text
+
+    @property
+    def glyph_decoder(self) -> "GlyphDecoder":
+        """Decoder for the ToUnicode mappings of every font, compiled on first use."""
+        if self._glyph_decoder is None:
+            glyph_map: dict[str, str] = {}
+            for position, stream in enumerate(self.streams):
+                # Maps inside compressed object streams cannot be told apart by reference.
+                if self._tounicode_objects and stream.object_number not in self._tounicode_objects:
+                    continue
+                text = self.text(position)
+                if text and "begincmap" in text:
+                    _merge_tounicode_cmap(text, glyph_map)
+            if not glyph_map and self._tounicode_objects:
+                for text in self.texts():
+                    if "begincmap" in text:
+                        _merge_tounicode_cmap(text, glyph_map)
+            self._glyph_decoder = GlyphDecoder(glyph_map)
+        return self._glyph_decoder
+
+
+def _merge_tounicode_cmap(decoded: str, glyph_map: dict[str, str]) -> None:
+    # Pairs and ranges are read only inside their own sections: consecutive
+    # bfchar lines would otherwise also read as a "<start> <end> <target>" range.
+    for block in re.findall(r"beginbfchar(.*?)endbfchar", decoded, re.S):
+        for src, dst in re.findall(r"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>", block):
+            glyph_map[src.upper()] = _decode_hex_bytes(dst.upper())
+    range_pattern = re.compile(
+        r"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>\s*(?:<([0-9A-Fa-f]+)>|\[(.*?)\])",
+        re.S,
+    )
+    ranges = "\n".join(re.findall(r"beginbfrange(.*?)endbfrange", decoded, re.S))
+    for start_hex, end_hex, single_target, target_list in range_pattern.findall(ranges):
+        start = int(start_hex, 16)
+        end = int(end_hex, 16)
+        if single_target:
+            current = int(single_target, 16)
+            for offset, codepoint in enumerate(range(start, end + 1)):
+                glyph_map[f"{codepoint:0{len(start_hex)}X}"] = _decode_hex_bytes(
+                    f"{current + offset:0{len(single_target)}X}"
+                )
+        elif target_list:
+            targets = [value.upper() for value in re.findall(r"<([0-9A-Fa-f]+)>", target_list)]
+            for offset, codepoint in enumerate(range(start, end + 1)):
+                if offset >= len(targets):
+                    break
+                glyph_map[f"{codepoint:0{len(start_hex)}X}"] = _decode_hex_bytes(targets[offset])
+
+
+def _decode_hex_bytes(normalized: str) -> str:
+    """Uppercase hex digits read without a ToUnicode map: UTF-16BE when that yields text, latin-1 otherwise."""
+    if not normalized:
+        return ""
     try:
-        if len(normalized) % 4 == 0:
-            decoded_utf16 = bytes.fromhex(normalized).decode("utf-16-be")
+        data = bytes.fromhex(normalized)
+    except ValueError:
+        return ""
+    if len(normalized) % 4 == 0:
+        try:
+            decoded_utf16 = data.decode("utf-16-be")
             if decoded_utf16.strip("\x00").strip():
                 return decoded_utf16
-    except Exception:
-        pass
+        except UnicodeDecodeError:
+            pass
+    return data.decode("latin-1")
 
-    try:
-        decoded_latin = bytes.fromhex(normalized).decode("latin-1", errors="ignore")
-        if decoded_latin:
-            return decoded_latin
-    except Exception:
-        pass
 
-    return ""
+class GlyphDecoder:
+    """Hex string decoder compiled from the ToUnicode maps of one document.
+
+    Chunks missing from the maps are decoded once into the same lookup table and whole
+    tokens are memoized, so the words a statement repeats on every page decode only once.
+    """
+
+    def __init__(self, glyph_map: dict[str, str]):
+        self.glyph_map = glyph_map
+        self._table = dict(glyph_map)
+        # Only chunk sizes used by some mapping can switch a token to glyph decoding.
+        self._chunk_sizes = tuple(size for size in (4, 2) if any(len(code) == size for code in glyph_map))
+        self.decode = lru_cache(maxsize=PDF_GLYPH_MEMO_SIZE)(self._decode)
+
+    def _decode(self, value: str) -> str:
+        normalized = PDF_NON_HEX_RE.sub("", value).upper()
+        for size in self._chunk_sizes:
+            if len(normalized) % size:
+                continue
+            chunks = [normalized[index : index + size] for index in range(0, len(normalized), size)]
+            if any(chunk in self.glyph_map for chunk in chunks):
+                return "".join(self._chunk_text(chunk) for chunk in chunks)
+        return _decode_hex_bytes(normalized)
+
+    def _chunk_text(self, chunk: str) -> str:
+        text = self._table.get(chunk)
+        if text is None:
+            text = self._table[chunk] = _decode_hex_bytes(chunk)
+        return text
+
 
+PLAIN_GLYPH_DECODER = GlyphDecoder({})
 
-def _decode_pdf_text_token(token: str, glyph_map: dict[str, str]) -> str:
+
+def _decode_pdf_text_token(token: str, decoder: GlyphDecoder) -> str:
     token = token.strip()
     if token.startswith("(") and token.endswith(")"):
         return _decode_pdf_literal(token[1:-1])
     if token.startswith("<") and token.endswith(">"):
-        return _decode_pdf_hex_string(token[1:-1], glyph_map)
+        return decoder.decode(token[1:-1])
     return token
 
 
@@ -261,21 +481,21 @@ def _looks_like_statement_page(lines: list[str]) -> bool:
     return has_keyword or (has_amount and has_date)
 
 
-def _extract_generic_text_fragments(stream: str, glyph_map: dict[str, str]) -> list[str]:
+def _extract_generic_text_fragments(stream: str, decoder: GlyphDecoder) -> list[str]:
     fragments: list[str] = []
     for match in re.finditer(r"\((?:\\.|[^\\()])*\)|<[0-9A-Fa-f\s]{4,}>", stream):
-        decoded = _decode_pdf_text_token(match.group(0), glyph_map)
+        decoded = _decode_pdf_text_token(match.group(0), decoder)
         normalized = re.sub(r"\s+", " ", decoded).strip()
         if _is_meaningful_statement_text(normalized):
             fragments.append(normalized)
     return fragments
 
 
-def _extract_text_lines_from_stream(stream: str, glyph_map: dict[str, str]) -> list[str]:
+def _extract_text_lines_from_stream(stream: str, decoder: GlyphDecoder) -> list[str]:
     lines: list[str] = []
     current_parts: list[str] = []
     token_re = re.compile(
-        r"(?P<array>\[(?:.|\n)*?\]\s*TJ)|"
+        r"(?P<array>\[.*?\]\s*TJ)|"
         r"(?P<text>\((?:\\.|[^\\()])*\)\s*Tj)|"
         r"(?P<hex><[0-9A-Fa-f\s]+>\s*Tj)|"
         r"(?P<newline>T\*)|"
@@ -292,7 +512,7 @@ def _extract_text_lines_from_stream(stream: str, glyph_map: dict[str, str]) -> l
             current_parts.append(_decode_pdf_literal(literal[1:]))
         elif match.lastgroup == "hex":
             hex_token = token[: token.rfind(">") + 1]
-            decoded = _decode_pdf_text_token(hex_token, glyph_map)
+            decoded = _decode_pdf_text_token(hex_token, decoder)
             if decoded:
                 current_parts.append(decoded)
         elif match.lastgroup == "array":
@@ -300,7 +520,7 @@ def _extract_text_lines_from_stream(stream: str, glyph_map: dict[str, str]) -> l
                 fragment.group(0)
                 for fragment in re.finditer(r"\((?:\\.|[^\\()])*\)|<[0-9A-Fa-f\s]+>", token)
             ]
-            text = "".join(_decode_pdf_text_token(fragment, glyph_map) for fragment in fragments)
+            text = "".join(_decode_pdf_text_token(fragment, decoder) for fragment in fragments)
             if text:
                 current_parts.append(text)
         elif match.lastgroup in {"newline", "move", "setmatrix", "end"}:
@@ -316,50 +536,111 @@ def _extract_text_lines_from_stream(stream: str, glyph_map: dict[str, str]) -> l
 
 def _extract_pdf_pages_fallback(content: bytes) -> list[list[str]]:
     pages: list[list[str]] = []
-    glyph_map = _build_tounicode_map(content)
-    decoded_streams: list[str] = []
-    for match in re.finditer(rb"stream\r?\n(.*?)\r?\nendstream", content, re.S):
-        raw_stream = match.group(1)
-        for candidate in _decompress_pdf_stream(raw_stream):
-            decoded = candidate.decode("latin-1", errors="ignore")
-            decoded_streams.append(decoded)
-            if "BT" not in decoded and "Tj" not in decoded and "TJ" not in decoded:
-                continue
-            lines = [
-                re.sub(r"\s+", " ", line).strip()
-                for line in _extract_text_lines_from_stream(decoded, glyph_map)
-            ]
-            lines = [line for line in lines if line]
-            if lines and _looks_like_statement_page(lines):
-                pages.append(lines)
-                break
+    index = PdfStreamIndex(content)
+    for text in index.texts():
+        if "BT" not in text and "Tj" not in text and "TJ" not in text:
+            continue
+        # Literal strings decode on their own; the ToUnicode maps are only needed for hex strings.
+        decoder = index.glyph_decoder if PDF_HEX_STRING_RE.search(text) else PLAIN_GLYPH_DECODER
+        lines = [re.sub(r"\s+", " ", line).strip() for line in _extract_text_lines_from_stream(text, decoder)]
+        lines = [line for line in lines if line]
+        if lines and _looks_like_statement_page(lines):
+            pages.append(lines)
     if not pages:
         generic_lines: list[str] = []
-        for decoded in decoded_streams:
-            generic_lines.extend(_extract_generic_text_fragments(decoded, glyph_map))
+        for text in index.texts():
+            generic_lines.extend(_extract_generic_text_fragments(text, index.glyph_decoder))
         if generic_lines and _looks_like_statement_page(generic_lines):
             logger.info("Falling back to generic PDF text extraction with %s fragments.", len(generic_lines))
             pages.append(generic_lines)
-    logger.info("PDF extraction generated %s text page blocks and %s glyph mappings.", len(pages), len(glyph_map))
+    logger.info(
+        "PDF extraction generated %s text page blocks from %s streams and %s glyph mappings.",
+        len(pages),
+        len(index.streams),
+        len(index.glyph_decoder.glyph_map),
+    )
     return pages
 
 
-def _extract_pdf_pages(content: bytes) -> list[list[str]]:
+def _text_to_statement_lines(page_text: str) -> list[str]:
+    page_lines = []
+    for raw_line in page_text.splitlines():
+        normalized = _normalize_statement_line(raw_line)
+        if normalized:
+            page_lines.append(normalized)
+    return page_lines
+
+
+def _extract_page_range_pdfplumber(content: bytes, start: int, stop: int) -> list[list[str]]:
+    extracted_pages: list[list[str]] = []
+    with pdfplumber.open(BytesIO(content), pages=list(range(start + 1, stop + 1))) as pdf:
+        for page in pdf.pages:
+            page_lines = _text_to_statement_lines(page.extract_text() or "")
+            logger.info("pdfplumber page %s extracted %s lines.", page.page_number, len(page_lines))
+            extracted_pages.append(page_lines)
+    return extracted_pages
+
+
+def _extract_page_range_pypdf(content: bytes, start: int, stop: int) -> list[list[str]]:
+    reader = PdfReader(BytesIO(content))
+    extracted_pages: list[list[str]] = []
+    for page_index in range(start, stop):
+        page = reader.pages[page_index]
+        page_text = ""
+        try:
+            page_text = page.extract_text(extraction_mode="layout") or ""
+        except TypeError:
+            page_text = page.extract_text() or ""
+        except Exception as error:
+            logger.warning("PdfReader failed on page %s: %s", page_index + 1, error)
+        page_lines = _text_to_statement_lines(page_text)
+        logger.info("PdfReader page %s extracted %s lines.", page_index + 1, len(page_lines))
+        extracted_pages.append(page_lines)
+    return extracted_pages
+
+
+def _get_process_pool(name: str, max_workers: int) -> ProcessPoolExecutor:
+    with _process_pools_lock:
+        if name not in _process_pools:
+            # spawn keeps workers independent of the API's threads and open connections.
+            _process_pools[name] = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pools[name]
+
+
+def _discard_process_pool(name: str) -> None:
+    with _process_pools_lock:
+        _process_pools.pop(name, None)
+
+
+def _extract_pages_in_parallel(extractor, content: bytes, page_count: int, workers: int) -> list[list[str]]:
+    if workers <= 1 or page_count < PDF_PARALLEL_MIN_PAGES:
+        return extractor(content, 0, page_count)
+    chunk_size = -(-page_count // workers)
+    ranges = [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+    pool = _get_process_pool("pdf-extract", PDF_EXTRACT_WORKERS)
+    try:
+        futures = [pool.submit(extractor, content, start, stop) for start, stop in ranges]
+        return [page for future in futures for page in future.result()]
+    except BrokenProcessPool:
+        _discard_process_pool("pdf-extract")
+        raise
+
+
+def _extract_pdf_pages(content: bytes, workers: Optional[int] = None) -> list[list[str]]:
+    workers = PDF_EXTRACT_WORKERS if workers is None else workers
     # --- Primary: pdfplumber (handles custom-encoded fonts like Santander's PDFs) ---
     if pdfplumber is not None:
         try:
-            extracted_pages: list[list[str]] = []
             with pdfplumber.open(BytesIO(content)) as pdf:
-                for page_index, page in enumerate(pdf.pages, start=1):
-                    page_text = page.extract_text() or ""
-                    page_lines = []
-                    for raw_line in page_text.splitlines():
-                        normalized = _normalize_statement_line(raw_line)
-                        if normalized:
-                            page_lines.append(normalized)
-                    logger.info("pdfplumber page %s extracted %s lines.", page_index, len(page_lines))
-                    if page_lines:
-                        extracted_pages.append(page_lines)
+                page_count = len(pdf.pages)
+            extracted_pages = [
+                page
+                for page in _extract_pages_in_parallel(_extract_page_range_pdfplumber, content, page_count, workers)
+                if page
+            ]
             logger.info(
                 "pdfplumber extracted %s pages with text, line_counts=%s.",
                 len(extracted_pages),
@@ -376,24 +657,12 @@ def _extract_pdf_pages(content: bytes) -> list[list[str]]:
     # --- Secondary: pypdf / PyPDF2 ---
     if PdfReader is not None:
         try:
-            reader = PdfReader(BytesIO(content))
-            extracted_pages = []
-            for page_index, page in enumerate(reader.pages, start=1):
-                page_text = ""
-                try:
-                    page_text = page.extract_text(extraction_mode="layout") or ""
-                except TypeError:
-                    page_text = page.extract_text() or ""
-                except Exception as error:
-                    logger.warning("PdfReader failed on page %s: %s", page_index, error)
-                page_lines = []
-                for raw_line in page_text.splitlines():
-                    normalized = _normalize_statement_line(raw_line)
-                    if normalized:
-                        page_lines.append(normalized)
-                logger.info("PdfReader page %s extracted %s lines.", page_index, len(page_lines))
-                if page_lines:
-                    extracted_pages.append(page_lines)
+            page_count = len(PdfReader(BytesIO(content)).pages)
+            extracted_pages = [
+                page
+                for page in _extract_pages_in_parallel(_extract_page_range_pypdf, content, page_count, workers)
+                if page
+            ]
             logger.info(
                 "PdfReader extracted %s pages with text, line_counts=%s.",
                 len(extracted_pages),
@@ -418,16 +687,12 @@ def _extract_pdf_pages(content: bytes) -> list[list[str]]:
 
 
 def _normalize_statement_line(line: str) -> str:
-    normalized = line.replace("−", "-").replace("–", "-").replace("—", "-")
-    for noisy_char in ("", "", "", "", "•", "·", "\uf0e6", "\uf131", "\uf12e", "\uf3e1"):
-        normalized = normalized.replace(noisy_char, " ")
-    return re.sub(r"\s+", " ", normalized).strip(" \u00a0")
+    return WHITESPACE_RE.sub(" ", line.translate(NOISY_CHARS_TABLE)).strip(" \u00a0")
 
 
-def _extract_statement_date(line: str):
-    normalized = _normalize_statement_line(line.lower())
+def _match_statement_date(lowered: str):
     for pattern in DATE_HEADER_PATTERNS:
-        match = pattern.search(normalized)
+        match = pattern.search(lowered)
         if not match:
             continue
         day = int(match.group("day"))
@@ -441,131 +706,97 @@ def _extract_statement_date(line: str):
     return None
 
 
-def _line_is_ignored(line: str) -> bool:
-    normalized = _normalize_statement_line(line)
-    if not normalized:
-        return True
-    return any(pattern.search(normalized) for pattern in NOISE_PATTERNS)
-
-
-def _is_balance_line(line: str) -> bool:
-    return "saldo do dia" in _normalize_statement_line(line).lower()
-
-
-def _is_short_date_line(line: str) -> bool:
-    return bool(SHORT_DATE_RE.fullmatch(_normalize_statement_line(line)))
+def _extract_statement_date(line: str):
+    return _match_statement_date(_normalize_statement_line(line.lower()))
 
 
-def _split_glued_date_lines(line: str) -> list[str]:
-    normalized = _normalize_statement_line(line)
+def _split_glued_date_lines(normalized: str) -> list[str]:
     if not normalized:
         return []
-    split_pattern = re.compile(
-        r"(?<!^)(?<![\d/])(?=(\d{1,2}\s+de\s+[a-zç]+\s+de\s+\d{4}(?:,\s*[a-z-]+)?))",
-        re.IGNORECASE,
-    )
-    pieces = [piece.strip() for piece in split_pattern.split(normalized) if piece and piece.strip()]
+    pieces = [piece.strip() for piece in GLUED_DATE_SPLIT_RE.split(normalized) if piece and piece.strip()]
     return pieces or [normalized]
 
 
-def _prepare_statement_lines(lines: list[str]) -> list[str]:
-    prepared: list[str] = []
-    for raw_line in lines:
-        for piece in _split_glued_date_lines(raw_line):
-            normalized = _normalize_statement_line(piece)
-            if not normalized or _line_is_ignored(normalized):
-                continue
-            prepared.append(normalized)
-    return prepared
-
-
-def _extract_page_dates(lines: list[str]) -> list[datetime.date]:
-    dates: list[datetime.date] = []
-    seen = set()
-    for line in lines:
-        statement_date = _extract_statement_date(line)
-        if statement_date and statement_date not in seen:
-            dates.append(statement_date)
-            seen.add(statement_date)
-    return dates
-
-
-def _clean_transaction_parts(parts: list[str]) -> list[str]:
-    cleaned: list[str] = []
-    for part in parts:
-        normalized = _normalize_statement_line(part)
-        if not normalized:
-            continue
-        if _extract_statement_date(normalized):
-            continue
-        if _is_short_date_line(normalized):
-            continue
-        if _is_balance_line(normalized):
-            continue
-        if _line_is_ignored(normalized):
-            continue
-        cleaned.append(normalized)
-    return cleaned
-
-
-def _extract_amount(line: str):
+def _match_amount(normalized: str):
     for pattern in AMOUNT_PATTERNS:
-        match = pattern.search(line)
+        match = pattern.search(normalized)
         if not match:
             continue
         value = float(match.group("value").replace(".", "").replace(",", "."))
         if match.group("sign"):
             value *= -1
-        return {
-            "value": value,
-            "text_before_amount": _normalize_statement_line(line[: match.start()]),
-        }
+        return value, normalized[: match.start()].strip()
     return None
 
 
-def _parse_santander_pdf_transactions(content: bytes, filename: str) -> list[dict]:
-    pages = _extract_pdf_pages(content)
+def _classify_statement_line(normalized: str) -> StatementLine:
+    """Tag an already normalized line; each pattern runs at most once."""
+    if not normalized or NOISE_RE.match(normalized):
+        return StatementLine(LINE_NOISE, normalized)
+    lowered = normalized.lower()
+    statement_date = _match_statement_date(lowered)
+    if statement_date:
+        return StatementLine(LINE_DATE, normalized, statement_date=statement_date)
+    if "saldo do dia" in lowered:
+        return StatementLine(LINE_BALANCE, normalized)
+    amount = _match_amount(normalized)
+    if amount:
+        return StatementLine(LINE_AMOUNT, normalized, amount=amount[0], text_before_amount=amount[1])
+    if SHORT_DATE_RE.fullmatch(normalized):
+        return StatementLine(LINE_SHORT_DATE, normalized)
+    return StatementLine(LINE_TEXT, normalized)
+
+
+def _classify_page_lines(lines: list[str]) -> list[StatementLine]:
+    classified: list[StatementLine] = []
+    for raw_line in lines:
+        for piece in _split_glued_date_lines(_normalize_statement_line(raw_line)):
+            line = _classify_statement_line(piece)
+            if line.kind != LINE_NOISE:
+                classified.append(line)
+    return classified
+
+
+def _parse_statement_pages(pages: list[list[str]], filename: str) -> list[dict]:
     transactions = []
     seen_transactions = set()
     for page_number, lines in enumerate(pages, start=1):
-        prepared_lines = _prepare_statement_lines(lines)
-        page_dates = _extract_page_dates(prepared_lines)
+        classified_lines = _classify_page_lines(lines)
+        page_dates = list(dict.fromkeys(line.statement_date for line in classified_lines if line.kind == LINE_DATE))
         if not page_dates:
             continue
         current_date_index = 0
         current_date = page_dates[current_date_index]
         pending_parts: list[str] = []
         committed_for_current_date = False
-        for line in prepared_lines:
-            if not line:
-                continue
-            if _extract_statement_date(line):
+        for line in classified_lines:
+            if line.kind == LINE_DATE:
                 continue
-            if _is_balance_line(line):
+            if line.kind == LINE_BALANCE:
                 pending_parts = []
                 if committed_for_current_date and current_date_index + 1 < len(page_dates):
                     current_date_index += 1
                     current_date = page_dates[current_date_index]
                     committed_for_current_date = False
                 continue
-            if _line_is_ignored(line):
+            if line.kind == LINE_SHORT_DATE:
                 continue
-            amount_data = _extract_amount(line)
-            if not amount_data:
-                if _is_short_date_line(line):
-                    continue
-                pending_parts.append(line)
+            if line.kind == LINE_TEXT:
+                pending_parts.append(line.text)
                 continue
-            parts = [part for part in pending_parts if part]
-            if amount_data["text_before_amount"]:
-                parts.append(amount_data["text_before_amount"])
+            parts = pending_parts
+            # Text glued before the amount may itself be a date or a noise fragment.
+            if line.text_before_amount and _classify_statement_line(line.text_before_amount).kind in (
+                LINE_TEXT,
+                LINE_AMOUNT,
+            ):
+                parts = parts + [line.text_before_amount]
             pending_parts = []
-            parts = _clean_transaction_parts(parts)
-            if not parts or current_date is None:
+            if not parts:
                 continue
             description = parts[0]
             detail = " · ".join(parts[1:]) if len(parts) > 1 else None
-            value = amount_data["value"]
+            value = line.amount
             transaction_type = "Saída" if value < 0 else "Entrada"
             dedupe_key = (
                 current_date.isoformat(),
@@ -596,52 +827,344 @@ def _parse_santander_pdf_transactions(content: bytes, filename: str) -> list[dic
     return transactions
 
 
-def _parse_ofx(content: str):
-    transactions = []
-    pattern = re.compile(r"<STMTTRN>(.*?)</STMTTRN>", re.DOTALL)
-    for block in pattern.findall(content):
-        date_match = re.search(r"<DTPOSTED>(\d{8})", block)
-        amount_match = re.search(r"<TRNAMT>([-0-9.]+)", block)
-        name_match = re.search(r"<NAME>(.+)", block)
-        if date_match and amount_match and name_match:
-            date = datetime.strptime(date_match.group(1), "%Y%m%d").date()
-            transactions.append(
-                {
-                    "date": date,
-                    "description": name_match.group(1).strip(),
-                    "value": float(amount_match.group(1)),
-                }
-            )
-    return transactions
+def _sniff_santander_page(lines: list[str]) -> bool:
+    lowered = " ".join(lines).lower()
+    if SANTANDER_BANK_MARKER in lowered and any(marker in lowered for marker in SANTANDER_LAYOUT_MARKERS):
+        return True
+    # Without the bank's name, require the template's structure: "12 de agosto de 2024" day headers
+    # closed by "Saldo do dia" lines. Any statement may carry a long-form date (e.g. its issue date).
+    kinds = {line.kind for line in _classify_page_lines(lines)}
+    return LINE_DATE in kinds and LINE_BALANCE in kinds
 
 
-@router.post("/import", response_model=list[ReconciliationItemOut])
-def import_statement(file: UploadFile = File(...), db: Session = Depends(get_db), user=Depends(require_role("finance"))):
-    content = file.file.read()
-    decoded = content.decode("utf-8", errors="ignore")
-    items = []
+def _extract_first_pdf_page(content: bytes) -> list[str]:
+    """Text lines of the first page, from the first page-level extractor that reads any."""
+    extractors = []
+    if pdfplumber is not None:
+        extractors.append(_extract_page_range_pdfplumber)
+    if PdfReader is not None:
+        extractors.append(_extract_page_range_pypdf)
+    for extractor in extractors:
+        try:
+            pages = extractor(content, 0, 1)
+        except Exception as error:
+            logger.warning("%s could not read the first PDF page: %s", extractor.__name__, error)
+            continue
+        if pages and pages[0]:
+            return pages[0]
+    return []
+
+
+def _parse_pdf_statement(
+    content: bytes,
+    filename: str,
+    extract_workers: Optional[int] = None,
+) -> list[dict]:
+    first_page = _extract_first_pdf_page(content)
+    layout = statement_parsers.detect(first_page) if first_page else None
+    if first_page and layout is None:
+        logger.warning("No statement layout matched the first page of %s. Preview: %s", filename, first_page[:10])
+        return []
+    pages = _extract_pdf_pages(content, extract_workers)
+    if layout is None:
+        # Only the raw fallback read any text, so sniff the first page it found.
+        layout = statement_parsers.detect(pages[0]) if pages else None
+        if layout is None:
+            logger.warning("No statement layout matched the extracted pages of %s.", filename)
+            return []
+    logger.info("Parsing %s as a %s statement.", filename, layout.bank)
+    return layout.parse(pages, filename)
+
+
+def _detect_ofx_encoding(head: bytes) -> str:
+    # OFX 1.x declares its charset in the SGML header; Brazilian banks mostly
+    # export CHARSET:1252.
+    header = head.upper()
+    if b"CHARSET:1252" in header or b"WINDOWS-1252" in header or b"ISO-8859-1" in header:
+        return "cp1252"
+    return "utf-8"
+
+
+def _build_ofx_entry(fields: dict[str, str]):
+    raw_date = fields.get("DTPOSTED", "")[:8]
+    raw_amount = fields.get("TRNAMT", "").replace(",", ".")
+    name = fields.get("NAME", "")
+    memo = fields.get("MEMO", "")
+    description = " · ".join(part for part in (name, memo if memo != name else "") if part)
+    if not (raw_date.isdigit() and len(raw_date) == 8 and raw_amount and description):
+        return None
+    try:
+        value = float(raw_amount)
+        entry_date = datetime.strptime(raw_date, "%Y%m%d").date()
+    except ValueError:
+        return None
+    transaction_type = fields.get("TRNTYPE", "").upper()
+    if transaction_type in OFX_DEBIT_TYPES and value > 0:
+        value = -value
+    return {
+        "date": entry_date,
+        "description": description[:255],
+        "value": value,
+        "external_id": fields.get("FITID") or None,
+    }
+
+
+def _iter_ofx_transactions(stream: BinaryIO, chunk_size: int = OFX_CHUNK_SIZE) -> Iterator[dict]:
+    """Yield STMTTRN records as they close, reading the upload in chunks.
+
+    Handles both SGML (OFX 1.x, leaf elements without closing tags) and XML
+    (OFX 2.x) files; only the current record is kept in memory.
+    """
+    # The first read always covers the header, where the charset is declared.
+    first_chunk = stream.read(max(chunk_size, OFX_HEADER_SIZE))
+    decoder = codecs.getincrementaldecoder(_detect_ofx_encoding(first_chunk[:OFX_HEADER_SIZE]))(errors="ignore")
+    buffer = ""
+    fields: Optional[dict[str, str]] = None
+    chunk = first_chunk
+    while True:
+        at_end = not chunk
+        buffer += decoder.decode(chunk, final=at_end)
+        # The text after the last "<" may continue in the next chunk.
+        limit = len(buffer) if at_end else buffer.rfind("<")
+        consumed = 0
+        for match in OFX_TOKEN_RE.finditer(buffer, 0, max(limit, 0)):
+            consumed = match.end()
+            closing, tag, text = match.group(1), match.group(2).upper(), match.group(3)
+            if tag == "STMTTRN":
+                if fields is not None:
+                    entry = _build_ofx_entry(fields)
+                    if entry:
+                        yield entry
+                fields = None if closing else {}
+            elif fields is not None and not closing:
+                value = html.unescape(text.strip())
+                if value:
+                    fields[tag] = value
+        buffer = buffer[consumed:]
+        if at_end:
+            break
+        chunk = stream.read(chunk_size)
+    if fields is not None:
+        entry = _build_ofx_entry(fields)
+        if entry:
+            yield entry
+
+
+def _ensure_not_imported(db: Session, digest: str) -> None:
+    if db.query(StatementImport.id).filter(StatementImport.content_hash == digest).first():
+        raise HTTPException(status_code=409, detail=ALREADY_IMPORTED_DETAIL)
+
+
+def _is_statement_import_conflict(error: Exception) -> bool:
+    """Whether the error is the unique statement digest, i.e. the same file was imported concurrently."""
+    return isinstance(error, IntegrityError) and StatementImport.__tablename__ in str(error.orig)
+
+
+def _record_statement_import(db: Session, digest: str, filename: str, entry_count: int, user_id: int) -> None:
+    db.add(StatementImport(content_hash=digest, filename=filename, entry_count=entry_count, user_id=user_id))
+
+
+def _parse_cached(kind: str, parser, filename: str, digest: str) -> list[dict]:
+    cached = statement_cache.load(kind, digest, filename)
+    if cached is not None:
+        return cached
+    parsed = parser()
+    if parsed:
+        statement_cache.store(kind, digest, filename, parsed)
+    return parsed
+
+
+def _batched(entries: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(entries)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _iter_csv_items(stream: BinaryIO) -> Iterator[dict]:
+    text = io.TextIOWrapper(stream, encoding="utf-8", errors="ignore", newline="")
+    try:
+        for row in csv.DictReader(text):
+            yield {
+                "date": datetime.strptime(row["date"], "%Y-%m-%d").date(),
+                "description": row["description"],
+                "value": float(row["value"]),
+                "external_id": row.get("external_id") or None,
+            }
+    finally:
+        # Detach so closing the wrapper does not close the upload itself.
+        text.detach()
+
+
+def _insert_new_items(db: Session, batch: list[dict]) -> int:
+    """Insert the batch, skipping items whose external_id is already stored for the same account.
+
+    OFX FITIDs are only unique per account, so items imported into an account
+    are compared with that account's items only.
+    """
+    seen = set()
+    for account_id in {item["account_id"] for item in batch}:
+        external_ids = {
+            item["external_id"] for item in batch if item["external_id"] and item["account_id"] == account_id
+        }
+        if not external_ids:
+            continue
+        query = select(ReconciliationItem.external_id).where(ReconciliationItem.external_id.in_(external_ids))
+        if account_id is not None:
+            query = query.where(ReconciliationItem.account_id == account_id)
+        seen.update((account_id, external_id) for external_id in db.scalars(query))
+    new_items = []
+    for item in batch:
+        if item["external_id"]:
+            key = (item["account_id"], item["external_id"])
+            if key in seen:
+                continue
+            seen.add(key)
+        new_items.append(item)
+    if not new_items:
+        return 0
+    return len(db.execute(insert(ReconciliationItem).returning(ReconciliationItem.id), new_items).all())
+
+
+@router.post("/import", response_model=ReconciliationImportSummary)
+def import_statement(
+    file: UploadFile = File(...),
+    account_id: Optional[int] = Form(None),
+    db: Session = Depends(get_db),
+    user=Depends(require_role("finance")),
+):
+    if account_id is not None and not db.get(Account, account_id):
+        raise HTTPException(status_code=404, detail="Conta não encontrada.")
+    digest = statement_cache.file_hash(file.file)
+    _ensure_not_imported(db, digest)
     if file.filename.endswith(".ofx"):
-        parsed = _parse_ofx(decoded)
-        for entry in parsed:
-            item = ReconciliationItem(**entry)
-            db.add(item)
-            items.append(item)
+        items = _iter_ofx_transactions(file.file)
     else:
-        reader = csv.DictReader(io.StringIO(decoded))
-        for row in reader:
-            date = datetime.strptime(row["date"], "%Y-%m-%d").date()
-            item = ReconciliationItem(
-                date=date,
-                description=row["description"],
-                value=float(row["value"]),
-                external_id=row.get("external_id"),
-            )
-            db.add(item)
-            items.append(item)
+        items = _iter_csv_items(file.file)
+    created = skipped = 0
+    for batch in _batched(items, IMPORT_BATCH_SIZE):
+        for item in batch:
+            item["account_id"] = account_id
+        inserted = _insert_new_items(db, batch)
+        created += inserted
+        skipped += len(batch) - inserted
+    _record_statement_import(db, digest, file.filename, created, user.id)
     db.commit()
-    for item in items:
-        db.refresh(item)
-    return items
+    return ReconciliationImportSummary(filename=file.filename, created=created, skipped=skipped)
+
+
+def _pdf_transaction_row(
+    entry: dict,
+    filename: str,
+    account_id: int,
+    income_category_id: int,
+    expense_category_id: int,
+    created_at: datetime,
+) -> dict:
+    category_id = income_category_id if entry["transaction_type"] == "Entrada" else expense_category_id
+    notes = f"Importado do extrato PDF {filename} na página {entry['source_page']}."
+    if entry["detail"]:
+        notes = f"{notes} Detalhes: {entry['detail']}"
+    return {
+        "transaction_type": entry["transaction_type"],
+        "date": entry["date"],
+        "value": entry["value"],
+        "category_id": category_id,
+        "account_id": account_id,
+        "payment_method": STATEMENT_PAYMENT_METHOD,
+        "description": entry["description"],
+        "client_supplier": entry["detail"],
+        "document_number": entry["external_id"],
+        "notes": notes,
+        "invoice_number": None,
+        "document_path": filename,
+        "tax_id": None,
+        "created_at": created_at,
+        "fingerprint": statement_fingerprint(
+            account_id, entry["date"], entry["description"], entry["detail"], entry["signed_value"]
+        ),
+    }
+
+
+def _skip_known_lines(db: Session, batch: list[dict], rows: list[dict]) -> list[tuple[dict, dict]]:
+    """Pair each new line with its row, dropping lines whose fingerprint is already in the ledger."""
+    known = set(
+        db.scalars(
+            select(Transaction.fingerprint).where(Transaction.fingerprint.in_({row["fingerprint"] for row in rows}))
+        )
+    )
+    new_lines = []
+    for entry, row in zip(batch, rows):
+        if row["fingerprint"] in known:
+            continue
+        known.add(row["fingerprint"])
+        new_lines.append((entry, row))
+    return new_lines
+
+
+def _persist_pdf_entries(
+    db: Session,
+    parsed: list[dict],
+    filename: str,
+    account_id: int,
+    income_category_id: int,
+    expense_category_id: int,
+    user_id: int,
+) -> list[dict]:
+    """Insert the statement lines in batches and return the created transactions as rows.
+
+    Each batch is one existence check on the line fingerprints, then one
+    executemany for the new transactions, their audit logs and their
+    reconciliation items. Lines already in the ledger, e.g. from an
+    overlapping statement, are skipped, so an import is safe to retry.
+    ``created_at`` is set here, so the rows are complete without reading
+    them back.
+    """
+    created_at = datetime.utcnow()
+    created = []
+    for batch in _batched(parsed, IMPORT_BATCH_SIZE):
+        rows = [
+            _pdf_transaction_row(entry, filename, account_id, income_category_id, expense_category_id, created_at)
+            for entry in batch
+        ]
+        new_lines = _skip_known_lines(db, batch, rows)
+        if not new_lines:
+            continue
+        transaction_ids = insert_transactions(db, [row for _, row in new_lines], user_id, action="Importou PDF")
+        db.execute(
+            insert(ReconciliationItem),
+            [
+                {
+                    "external_id": entry["external_id"],
+                    "date": entry["date"],
+                    "description": entry["description"],
+                    "value": entry["signed_value"],
+                    "status": STATEMENT_ITEM_STATUS,
+                    "matched_transaction_id": transaction_id,
+                    "account_id": account_id,
+                    "fingerprint": row["fingerprint"],
+                }
+                for (entry, row), transaction_id in zip(new_lines, transaction_ids)
+            ],
+        )
+        created.extend({**row, "id": transaction_id} for (_, row), transaction_id in zip(new_lines, transaction_ids))
+    if len(created) < len(parsed):
+        logger.info("Skipped %s statement lines of %s already in the ledger.", len(parsed) - len(created), filename)
+    return created
+
+
+def _ensure_import_targets(db: Session, account_id: int, income_category_id: int, expense_category_id: int) -> None:
+    if not db.get(Account, account_id):
+        raise HTTPException(status_code=404, detail="Conta não encontrada.")
+    category_ids = {income_category_id, expense_category_id}
+    if db.scalar(select(func.count()).where(Category.id.in_(category_ids))) != len(category_ids):
+        raise HTTPException(status_code=404, detail="Categoria não encontrada.")
+
+
+def _read_pdf_upload(file: UploadFile) -> tuple[str, bytes]:
+    filename = file.filename or "extrato.pdf"
+    if not filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=400, detail="Envie um arquivo PDF válido.")
+    return filename, file.file.read()
 
 
 @router.post("/import/pdf", response_model=list[TransactionOut])
@@ -653,59 +1176,205 @@ def import_pdf_statement(
     db: Session = Depends(get_db),
     user=Depends(require_role("finance")),
 ):
-    filename = file.filename or "extrato.pdf"
-    if not filename.lower().endswith(".pdf"):
-        raise HTTPException(status_code=400, detail="Envie um arquivo PDF válido.")
-    content = file.file.read()
-    parsed = _parse_santander_pdf_transactions(content, filename)
+    _ensure_import_targets(db, account_id, income_category_id, expense_category_id)
+    filename, content = _read_pdf_upload(file)
+    digest = statement_cache.content_hash(content)
+    _ensure_not_imported(db, digest)
+    parsed = _parse_cached("pdf", lambda: _parse_pdf_statement(content, filename), filename, digest)
     if not parsed:
         logger.warning("PDF import failed to parse statement lines for file %s.", filename)
-        raise HTTPException(
-            status_code=400,
-            detail="Não foi possível localizar lançamentos no PDF. Use um extrato Santander no mesmo layout do template.",
-        )
+        raise HTTPException(status_code=400, detail=PDF_NOT_PARSED_DETAIL)
     logger.info("Parsed %s statement lines from %s for account %s.", len(parsed), filename, account_id)
-    created_transactions = []
-    for entry in parsed:
-        category_id = income_category_id if entry["transaction_type"] == "Entrada" else expense_category_id
-        notes = f"Importado do extrato PDF {filename} na página {entry['source_page']}."
-        if entry["detail"]:
-            notes = f"{notes} Detalhes: {entry['detail']}"
-        transaction = Transaction(
-            transaction_type=entry["transaction_type"],
-            date=entry["date"],
-            value=entry["value"],
-            category_id=category_id,
-            account_id=account_id,
-            payment_method="Extrato bancário PDF",
-            description=entry["description"],
-            client_supplier=entry["detail"],
-            document_number=entry["external_id"],
-            notes=notes,
-            invoice_number=None,
-            document_path=filename,
-            tax_id=None,
+    try:
+        created_transactions = _persist_pdf_entries(
+            db, parsed, filename, account_id, income_category_id, expense_category_id, user.id
         )
-        db.add(transaction)
-        db.flush()
-        db.add(
-            ReconciliationItem(
-                external_id=entry["external_id"],
-                date=entry["date"],
-                description=entry["description"],
-                value=entry["signed_value"],
-                status="Importado",
-                matched_transaction_id=transaction.id,
-            )
+        _record_statement_import(db, digest, filename, len(created_transactions), user.id)
+        db.commit()
+    except IntegrityError as error:
+        # A concurrent upload of the same or an overlapping statement committed
+        # its lines between our existence checks and this commit.
+        db.rollback()
+        logger.warning("PDF import of %s conflicted with a concurrent import: %s", filename, error.orig)
+        raise HTTPException(status_code=409, detail=ALREADY_IMPORTED_DETAIL) from error
+    return created_transactions
+
+
+def _update_import_job(db: Session, job: ImportJob, **changes) -> None:
+    for name, value in changes.items():
+        setattr(job, name, value)
+    db.commit()
+
+
+def _run_pdf_import_job(job_id: int, content: bytes, digest: str) -> None:
+    # Runs inside a worker process: it owns its session and reports progress
+    # through the job row, which the polling endpoint reads.
+    db = SessionLocal()
+    try:
+        job = db.get(ImportJob, job_id)
+        _update_import_job(db, job, status="Processando", progress=10, started_at=datetime.utcnow())
+        # Jobs already run one per process; extracting pages in yet another
+        # pool would only oversubscribe the cores.
+        parsed = _parse_cached(
+            "pdf",
+            lambda: _parse_pdf_statement(content, job.filename, extract_workers=1),
+            job.filename,
+            digest,
+        )
+        if not parsed:
+            logger.warning("PDF import job %s found no statement lines in %s.", job_id, job.filename)
+            _update_import_job(db, job, status="Erro", error=PDF_NOT_PARSED_DETAIL, finished_at=datetime.utcnow())
+            return
+        _update_import_job(db, job, progress=60, parsed_count=len(parsed))
+        created_transactions = _persist_pdf_entries(
+            db,
+            parsed,
+            job.filename,
+            job.account_id,
+            job.income_category_id,
+            job.expense_category_id,
+            job.user_id,
         )
-        db.add(ActionLog(user_id=user.id, action="Importou PDF", entity="Transaction", entity_id=transaction.id))
-        created_transactions.append(transaction)
+        _record_statement_import(db, digest, job.filename, len(created_transactions), job.user_id)
+        job.created_count = len(created_transactions)
+        _update_import_job(db, job, status="Concluído", progress=100, finished_at=datetime.utcnow())
+        logger.info("PDF import job %s created %s transactions.", job_id, job.created_count)
+    except Exception as error:
+        db.rollback()
+        # A concurrent job for the same file won the statement_imports row; any
+        # other failure, e.g. a race on the line fingerprints, is reported as is.
+        detail = ALREADY_IMPORTED_DETAIL if _is_statement_import_conflict(error) else str(error)
+        logger.exception("PDF import job %s failed.", job_id)
+        job = db.get(ImportJob, job_id)
+        if job is not None:
+            _update_import_job(db, job, status="Erro", error=detail, finished_at=datetime.utcnow())
+    finally:
+        db.close()
+
+
+def _on_import_job_done(job_id: int, future: Future) -> None:
+    # The job committed from another process, where this process' cache is out of reach.
+    report_cache.invalidate(JOB_WRITTEN_TABLES)
+    error = future.exception()
+    if error is None:
+        return
+    # The worker died before it could record the failure itself.
+    logger.error("PDF import job %s worker crashed: %s", job_id, error)
+    db = SessionLocal()
+    try:
+        job = db.get(ImportJob, job_id)
+        if job is not None and job.status not in ("Concluído", "Erro"):
+            _update_import_job(db, job, status="Erro", error=str(error), finished_at=datetime.utcnow())
+    finally:
+        db.close()
+
+
+def fail_interrupted_import_jobs() -> int:
+    """Close the jobs a previous process left unfinished; their uploads only lived in its memory."""
+    db = SessionLocal()
+    try:
+        interrupted = db.execute(
+            update(ImportJob)
+            .where(ImportJob.status.in_(("Na fila", "Processando")))
+            .values(status="Erro", error=JOB_INTERRUPTED_DETAIL, finished_at=datetime.utcnow())
+        ).rowcount
+        db.commit()
+    finally:
+        db.close()
+    if interrupted:
+        logger.warning("Marked %s PDF import jobs interrupted by a restart as failed.", interrupted)
+    return interrupted
+
+
+@router.post("/import/pdf/jobs", response_model=ImportJobOut, status_code=202)
+def submit_pdf_import_job(
+    file: UploadFile = File(...),
+    account_id: int = Form(...),
+    income_category_id: int = Form(...),
+    expense_category_id: int = Form(...),
+    db: Session = Depends(get_db),
+    user=Depends(require_role("finance")),
+):
+    _ensure_import_targets(db, account_id, income_category_id, expense_category_id)
+    filename, content = _read_pdf_upload(file)
+    digest = statement_cache.content_hash(content)
+    _ensure_not_imported(db, digest)
+    job = ImportJob(
+        filename=filename,
+        account_id=account_id,
+        income_category_id=income_category_id,
+        expense_category_id=expense_category_id,
+        user_id=user.id,
+    )
+    db.add(job)
     db.commit()
-    for transaction in created_transactions:
-        db.refresh(transaction)
-    return created_transactions
+    db.refresh(job)
+    try:
+        future = _get_process_pool("pdf-import", IMPORT_WORKERS).submit(
+            _run_pdf_import_job, job.id, content, digest
+        )
+    except BrokenProcessPool as error:
+        _discard_process_pool("pdf-import")
+        _update_import_job(db, job, status="Erro", error=str(error), finished_at=datetime.utcnow())
+        raise HTTPException(status_code=503, detail="Fila de importação indisponível. Tente novamente.") from error
+    future.add_done_callback(partial(_on_import_job_done, job.id))
+    logger.info("Queued PDF import job %s for %s.", job.id, filename)
+    return job
+
+
+@router.get("/import/jobs", response_model=list[ImportJobOut])
+async def list_import_jobs(
+    db: AsyncReadSession = Depends(get_async_read_db), user=Depends(require_role("finance"))
+):
+    return await db.run_sync(lambda session: session.query(ImportJob).order_by(ImportJob.id.desc()).limit(50).all())
+
+
+@router.get("/import/jobs/{job_id}", response_model=ImportJobOut)
+async def get_import_job(
+    job_id: int, db: AsyncReadSession = Depends(get_async_read_db), user=Depends(require_role("finance"))
+):
+    job = await db.run_sync(lambda session: session.get(ImportJob, job_id))
+    if not job:
+        raise HTTPException(status_code=404, detail="Importação não encontrada.")
+    return job
+
+
+@router.post("/match", response_model=ReconciliationMatchSummary)
+def match_reconciliation(
+    account_id: Optional[int] = Query(None),
+    window_days: int = Query(MATCH_WINDOW_DAYS, ge=0, le=31),
+    limit: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db),
+    user=Depends(require_role("finance")),
+):
+    result = match_pending(db, account_id=account_id, window_days=window_days, limit=limit)
+    db.commit()
+    logger.info("Matched %s of %s pending reconciliation items.", result.matched, result.pending)
+    return ReconciliationMatchSummary(**result._asdict())
 
 
 @router.get("", response_model=list[ReconciliationItemOut])
-def list_reconciliation(db: Session = Depends(get_db), user=Depends(require_role("viewer"))):
-    return db.query(ReconciliationItem).all()
+async def list_reconciliation(
+    db: AsyncReadSession = Depends(get_async_read_db), user=Depends(require_role("viewer"))
+):
+    return await db.run_sync(lambda session: session.query(ReconciliationItem).all())
+
+
+@router.get("/export")
+def export_reconciliation(
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    status: Optional[str] = None,
+    user=Depends(require_role("viewer")),
+):
+    def build_query(db: Session):
+        query = db.query(*(getattr(ReconciliationItem, column) for column in EXPORT_COLUMNS))
+        if status:
+            query = query.filter(ReconciliationItem.status == status)
+        return query.order_by(ReconciliationItem.date, ReconciliationItem.id)
+
+    return stream_export(build_query, EXPORT_COLUMNS, export_format, "conciliacao")
+
+
+# Bank-specific plugins go first, even if registered later; the Santander sniffer is the broadest of the layouts.
+statement_parsers.load_plugins()
+statement_parsers.register("Santander", _sniff_santander_page, _parse_statement_pages, fallback=True)
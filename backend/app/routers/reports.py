@@ -1,54 +1,269 @@
-from datetime import date
-from fastapi import APIRouter, Depends
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, aliased
+from starlette.concurrency import run_in_threadpool
 
 from ..auth import require_role
-from ..database import get_db
-from ..models import Account, Category, PayableReceivable, Transaction
-from ..schemas import ReportItem
+from ..cache import report_cache
+from ..database import AsyncReadSession, get_async_read_db
+from ..models import Account, Category, MonthlyRollup, PayableReceivable, RollupDirtyMonth, Transaction
+from ..rollups import month_start, next_month, refresh_rollups
+from ..schemas import CategoryTreeItem, ReportCacheStats, ReportItem
 
 router = APIRouter(prefix="/api/reports", tags=["Relatórios"])
 
+Granularity = Literal["day", "month", "quarter"]
+
+
+def _period_label(day: date, granularity: Optional[Granularity]) -> Optional[str]:
+    if granularity == "day":
+        return day.isoformat()
+    if granularity == "month":
+        return f"{day.year}-{day.month:02d}"
+    if granularity == "quarter":
+        return f"{day.year}-Q{(day.month + 2) // 3}"
+    return None
+
+
+def _rollup_span(
+    date_from: Optional[date], date_to: Optional[date], granularity: Optional[Granularity]
+) -> Optional[tuple[Optional[date], date]]:
+    """Whole closed months inside the range, as [start, end), or None when rollups do not apply."""
+    if granularity == "day":
+        return None
+    start = None
+    if date_from:
+        start = date_from if date_from.day == 1 else next_month(month_start(date_from))
+    # The current month is still open, so it is always read from the raw rows.
+    end = month_start(date.today())
+    if date_to:
+        day_after = date_to + timedelta(days=1)
+        end = min(end, day_after if day_after.day == 1 else month_start(date_to))
+    if start is not None and start >= end:
+        return None
+    return start, end
+
+
+def _raw_totals(db: Session, key_column, lower: Optional[date], upper: Optional[date]):
+    # Grouping by (date, key, type), the exact prefix of a covering index, reads
+    # the range straight from the index with no sort.
+    query = db.query(Transaction.date, key_column, Transaction.transaction_type, func.sum(Transaction.value))
+    if lower:
+        query = query.filter(Transaction.date >= lower)
+    if upper:
+        query = query.filter(Transaction.date <= upper)
+    return query.group_by(Transaction.date, key_column, Transaction.transaction_type).all()
+
+
+def _dirty_months(db: Session, start: Optional[date], end: date) -> list[date]:
+    query = db.query(RollupDirtyMonth.month).filter(RollupDirtyMonth.month < end)
+    if start:
+        query = query.filter(RollupDirtyMonth.month >= start)
+    return [month for (month,) in query.all()]
+
+
+def _rollup_totals(db: Session, key_column, start: Optional[date], end: date, skip_months: list[date]):
+    rollup_key = getattr(MonthlyRollup, key_column.key)
+    query = db.query(MonthlyRollup.month, rollup_key, MonthlyRollup.transaction_type, func.sum(MonthlyRollup.total))
+    if start:
+        query = query.filter(MonthlyRollup.month >= start)
+    query = query.filter(MonthlyRollup.month < end)
+    if skip_months:
+        query = query.filter(MonthlyRollup.month.not_in(skip_months))
+    return query.group_by(MonthlyRollup.month, rollup_key, MonthlyRollup.transaction_type).all()
+
+
+def _period_rows(
+    db: Session,
+    key_column,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    granularity: Optional[Granularity],
+) -> list:
+    """(day or month, key, type, total) rows covering the range.
+
+    Closed months come from the monthly rollups; the open month, partial
+    months at the edges of the range and months whose rollup is still stale
+    (the refresh could not take the write lock) come from the raw rows.
+    """
+    span = _rollup_span(date_from, date_to, granularity)
+    if span is None:
+        rows = _raw_totals(db, key_column, date_from, date_to)
+    else:
+        start, end = span
+        dirty = _dirty_months(db, start, end)
+        rows = _rollup_totals(db, key_column, start, end, dirty)
+        for month in dirty:
+            rows += _raw_totals(db, key_column, month, next_month(month) - timedelta(days=1))
+        if date_to is None or date_to >= end:
+            rows += _raw_totals(db, key_column, end, date_to)
+        if start and date_from and date_from < start:
+            rows += _raw_totals(db, key_column, date_from, start - timedelta(days=1))
+    return rows
+
+
+def _aggregate(
+    db: Session,
+    key_column,
+    group,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    granularity: Optional[Granularity],
+) -> list[ReportItem]:
+    """Sum transaction values per period and group.
+
+    ``group(key, transaction_type)`` returns the (id, label) a row is counted
+    under, or None to leave it out. Days are folded into periods here, which
+    keeps the SQL portable.
+    """
+    totals: dict[tuple, float] = defaultdict(float)
+    for day, key, transaction_type, total in _period_rows(db, key_column, date_from, date_to, granularity):
+        grouped = group(key, transaction_type)
+        if grouped is not None:
+            totals[(_period_label(day, granularity), *grouped)] += total
+    ordered = sorted(totals.items(), key=lambda item: (item[0][0] or "", item[0][2], item[0][1] or 0))
+    return [
+        ReportItem(id=item_id, label=label, value=float(total), period=period)
+        for (period, item_id, label), total in ordered
+    ]
+
+
+def _named_groups(db: Session, model):
+    names = dict(db.query(model.id, model.name).all())
+    return lambda key, transaction_type: (key, names[key]) if key in names else None
+
+
+async def _cached_report(db: AsyncReadSession, key: tuple, tables: tuple[str, ...], compute) -> list:
+    """Serve a report from the cache, calling ``compute(session)`` only on a miss.
+
+    Hits never touch the writer engine: the rollups are refreshed on a miss,
+    before the read session takes its snapshot.
+    """
+    cached = report_cache.get(key)
+    if cached is not None:
+        return cached
+    await run_in_threadpool(refresh_rollups)
+    return await db.run_sync(lambda session: report_cache.get_or_set(key, tables, lambda: compute(session)))
+
 
 @router.get("/cashflow", response_model=list[ReportItem])
-def report_cashflow(db: Session = Depends(get_db), user=Depends(require_role("viewer"))):
-    totals = (
-        db.query(Transaction.transaction_type, func.sum(Transaction.value))
-        .group_by(Transaction.transaction_type)
-        .all()
-    )
-    return [ReportItem(label=kind, value=float(total)) for kind, total in totals]
+async def report_cashflow(
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    granularity: Optional[Granularity] = Query(None),
+    db: AsyncReadSession = Depends(get_async_read_db),
+    user=Depends(require_role("viewer")),
+):
+    def compute(session: Session):
+        return _aggregate(
+            session, Transaction.category_id, lambda key, kind: (None, kind), date_from, date_to, granularity
+        )
+
+    return await _cached_report(db, ("cashflow", date_from, date_to, granularity), ("transactions",), compute)
 
 
 @router.get("/by-category", response_model=list[ReportItem])
-def report_by_category(db: Session = Depends(get_db), user=Depends(require_role("viewer"))):
-    totals = (
-        db.query(Category.name, func.sum(Transaction.value))
-        .join(Transaction, Transaction.category_id == Category.id)
-        .group_by(Category.name)
-        .all()
+async def report_by_category(
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    granularity: Optional[Granularity] = Query(None),
+    db: AsyncReadSession = Depends(get_async_read_db),
+    user=Depends(require_role("viewer")),
+):
+    def compute(session: Session):
+        # Grouped by id: two categories with the same name stay apart.
+        groups = _named_groups(session, Category)
+        return _aggregate(session, Transaction.category_id, groups, date_from, date_to, granularity)
+
+    key = ("by-category", date_from, date_to, granularity)
+    return await _cached_report(db, key, ("transactions", "categories"), compute)
+
+
+def _category_closure(db: Session):
+    """(ancestor_id, category_id) for every category and each of its descendants, itself included."""
+    tree = select(Category.id.label("ancestor_id"), Category.id.label("category_id")).cte(
+        "category_tree", recursive=True
     )
-    return [ReportItem(label=name, value=float(total)) for name, total in totals]
+    child = aliased(Category)
+    tree = tree.union(select(tree.c.ancestor_id, child.id).where(child.parent_id == tree.c.category_id))
+    return db.execute(select(tree.c.ancestor_id, tree.c.category_id))
 
 
-@router.get("/by-account", response_model=list[ReportItem])
-def report_by_account(db: Session = Depends(get_db), user=Depends(require_role("viewer"))):
-    totals = (
-        db.query(Account.name, func.sum(Transaction.value))
-        .join(Transaction, Transaction.account_id == Account.id)
-        .group_by(Account.name)
-        .all()
+def _category_tree(db: Session, date_from: Optional[date], date_to: Optional[date]) -> list[CategoryTreeItem]:
+    direct: dict[int, float] = defaultdict(float)
+    for _, category_id, _, total in _period_rows(db, Transaction.category_id, date_from, date_to, None):
+        direct[category_id] += total
+    subtree: dict[int, float] = defaultdict(float)
+    for ancestor_id, category_id in _category_closure(db):
+        subtree[ancestor_id] += direct.get(category_id, 0.0)
+
+    categories = db.query(Category).order_by(Category.name, Category.id).all()
+    children = defaultdict(list)
+    for category in categories:
+        children[category.parent_id].append(category)
+    items = []
+    # Depth-first, so each category is followed by its subcategories.
+    pending = [(category, 0) for category in reversed(children[None])]
+    while pending:
+        category, depth = pending.pop()
+        items.append(
+            CategoryTreeItem(
+                id=category.id,
+                name=category.name,
+                category_type=category.category_type,
+                parent_id=category.parent_id,
+                depth=depth,
+                value=subtree[category.id],
+                direct_value=direct.get(category.id, 0.0),
+            )
+        )
+        pending.extend((child, depth + 1) for child in reversed(children[category.id]))
+    return items
+
+
+@router.get("/category-tree", response_model=list[CategoryTreeItem])
+async def report_category_tree(
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    db: AsyncReadSession = Depends(get_async_read_db),
+    user=Depends(require_role("viewer")),
+):
+    key = ("category-tree", date_from, date_to)
+    return await _cached_report(
+        db, key, ("transactions", "categories"), lambda session: _category_tree(session, date_from, date_to)
     )
-    return [ReportItem(label=name, value=float(total)) for name, total in totals]
+
+
+@router.get("/by-account", response_model=list[ReportItem])
+async def report_by_account(
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    granularity: Optional[Granularity] = Query(None),
+    db: AsyncReadSession = Depends(get_async_read_db),
+    user=Depends(require_role("viewer")),
+):
+    def compute(session: Session):
+        groups = _named_groups(session, Account)
+        return _aggregate(session, Transaction.account_id, groups, date_from, date_to, granularity)
+
+    key = ("by-account", date_from, date_to, granularity)
+    return await _cached_report(db, key, ("transactions", "accounts"), compute)
 
 
 @router.get("/overdue")
-def report_overdue(db: Session = Depends(get_db), user=Depends(require_role("viewer"))):
+async def report_overdue(db: AsyncReadSession = Depends(get_async_read_db), user=Depends(require_role("viewer"))):
     today = date.today()
-    overdue = (
-        db.query(PayableReceivable)
+    return await db.run_sync(
+        lambda session: session.query(PayableReceivable)
         .filter(PayableReceivable.due_date < today, PayableReceivable.status == "Pendente")
         .all()
     )
-    return overdue
+
+
+@router.get("/cache", response_model=ReportCacheStats)
+def report_cache_stats(user=Depends(require_role("admin"))):
+    return report_cache.stats()
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from ..auth import require_role
-from ..database import get_db
+from ..database import get_db, get_read_db
+from ..ledger import apply_transactions
 from ..models import ActionLog, PayableReceivable, Transaction
 from ..schemas import TitleCreate, TitleOut
 
@@ -22,7 +23,7 @@ def create_title(payload: TitleCreate, db: Session = Depends(get_db), user=Depen
 
 
 @router.get("", response_model=list[TitleOut])
-def list_titles(db: Session = Depends(get_db), user=Depends(require_role("viewer"))):
+def list_titles(db: Session = Depends(get_read_db), user=Depends(require_role("viewer"))):
     return db.query(PayableReceivable).all()
 
 
@@ -45,6 +46,7 @@ def settle_title(title_id: int, db: Session = Depends(get_db), user=Depends(requ
         client_supplier=title.client_supplier,
     )
     db.add(transaction)
+    apply_transactions(db, [transaction])
     db.commit()
     db.refresh(transaction)
     title.status = "Recebido" if title.title_type == "Receber" else "Pago"
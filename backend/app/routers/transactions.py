@@ -1,26 +1,189 @@
-from fastapi import APIRouter, Depends
+import base64
+import binascii
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 
 from ..auth import require_role
-from ..database import get_db
-from ..models import ActionLog, Transaction
-from ..schemas import TransactionCreate, TransactionOut
+from ..database import AsyncReadSession, get_async_read_db, get_db
+from ..exports import ExportFormat, stream_export
+from ..ledger import insert_transactions
+from ..models import Account, Category, Transaction
+from ..schemas import TransactionBatchResult, TransactionCreate, TransactionOut
 
 router = APIRouter(prefix="/api/transactions", tags=["Lançamentos"])
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_BATCH_SIZE = 5000
+TRANSACTION_TYPES = ("Entrada", "Saída")
+EXPORT_COLUMNS = [
+    "id",
+    "transaction_type",
+    "date",
+    "value",
+    "category_id",
+    "account_id",
+    "payment_method",
+    "description",
+    "client_supplier",
+    "document_number",
+    "notes",
+    "invoice_number",
+    "document_path",
+    "tax_id",
+    "created_at",
+]
+
+
+def _encode_cursor(transaction: Transaction) -> str:
+    raw = f"{transaction.date.isoformat()}|{transaction.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[date, int]:
+    try:
+        raw_date, raw_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return date.fromisoformat(raw_date), int(raw_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="Cursor de paginação inválido.") from exc
+
+
+def _filtered_transactions(
+    db: Session,
+    account_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    transaction_type: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    q: Optional[str] = None,
+):
+    query = db.query(Transaction)
+    if account_id is not None:
+        query = query.filter(Transaction.account_id == account_id)
+    if category_id is not None:
+        query = query.filter(Transaction.category_id == category_id)
+    if transaction_type:
+        query = query.filter(Transaction.transaction_type == transaction_type)
+    if date_from:
+        query = query.filter(Transaction.date >= date_from)
+    if date_to:
+        query = query.filter(Transaction.date <= date_to)
+    if q:
+        query = query.filter(Transaction.description.icontains(q, autoescape=True))
+    return query
+
+
+def _row_errors(db: Session, rows: list[TransactionCreate]) -> list[Optional[HTTPException]]:
+    """Why each row cannot be inserted, or None; one query each for the accounts and categories."""
+    account_ids = {row.account_id for row in rows}
+    category_ids = {row.category_id for row in rows}
+    known_accounts = {account_id for (account_id,) in db.query(Account.id).filter(Account.id.in_(account_ids))}
+    known_categories = {
+        category_id for (category_id,) in db.query(Category.id).filter(Category.id.in_(category_ids))
+    }
+    errors: list[Optional[HTTPException]] = []
+    for row in rows:
+        if row.transaction_type not in TRANSACTION_TYPES:
+            errors.append(HTTPException(status_code=400, detail="Tipo de lançamento inválido."))
+        elif row.account_id not in known_accounts:
+            errors.append(HTTPException(status_code=404, detail="Conta não encontrada."))
+        elif row.category_id not in known_categories:
+            errors.append(HTTPException(status_code=404, detail="Categoria não encontrada."))
+        else:
+            errors.append(None)
+    return errors
+
 
 @router.post("", response_model=TransactionOut)
 def create_transaction(payload: TransactionCreate, db: Session = Depends(get_db), user=Depends(require_role("finance"))):
-    transaction = Transaction(**payload.model_dump())
-    db.add(transaction)
+    error = _row_errors(db, [payload])[0]
+    if error:
+        raise error
+    transaction_id = insert_transactions(db, [payload.model_dump()], user.id)[0]
     db.commit()
-    db.refresh(transaction)
-    log = ActionLog(user_id=user.id, action="Criou", entity="Transaction", entity_id=transaction.id)
-    db.add(log)
+    return db.get(Transaction, transaction_id)
+
+
+@router.post("/batch", response_model=list[TransactionBatchResult])
+def create_transactions_batch(
+    payload: list[TransactionCreate],
+    db: Session = Depends(get_db),
+    user=Depends(require_role("finance")),
+):
+    if len(payload) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Envie no máximo {MAX_BATCH_SIZE} lançamentos por lote.")
+    results: list[TransactionBatchResult] = []
+    accepted: list[tuple[TransactionBatchResult, dict]] = []
+    for index, (row, error) in enumerate(zip(payload, _row_errors(db, payload))):
+        result = TransactionBatchResult(index=index, status="created")
+        if error:
+            result.status, result.detail = "error", error.detail
+        else:
+            accepted.append((result, row.model_dump()))
+        results.append(result)
+
+    transaction_ids = insert_transactions(db, [values for _, values in accepted], user.id)
     db.commit()
-    return transaction
+    for (result, _), transaction_id in zip(accepted, transaction_ids):
+        result.id = transaction_id
+    return results
 
 
 @router.get("", response_model=list[TransactionOut])
-def list_transactions(db: Session = Depends(get_db), user=Depends(require_role("viewer"))):
-    return db.query(Transaction).order_by(Transaction.date.desc()).all()
+async def list_transactions(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    account_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    transaction_type: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    q: Optional[str] = None,
+    db: AsyncReadSession = Depends(get_async_read_db),
+    user=Depends(require_role("viewer")),
+):
+    after = _decode_cursor(cursor) if cursor else None
+    # Pagination is opt-in, so older builds of the web client still get the whole listing.
+    # The current one sends limit and follows X-Next-Cursor page by page.
+    paginate = limit is not None or cursor is not None
+    limit = limit or DEFAULT_PAGE_SIZE
+
+    def fetch_page(session: Session) -> list[Transaction]:
+        query = _filtered_transactions(session, account_id, category_id, transaction_type, date_from, date_to, q)
+        if after:
+            query = query.filter(tuple_(Transaction.date, Transaction.id) < tuple_(*after))
+        query = query.order_by(Transaction.date.desc(), Transaction.id.desc())
+        # Fetch one extra row to know whether another page exists.
+        return query.limit(limit + 1).all() if paginate else query.all()
+
+    page = await db.run_sync(fetch_page)
+    if paginate and len(page) > limit:
+        page = page[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(page[-1])
+    return page
+
+
+@router.get("/export")
+def export_transactions(
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    account_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    transaction_type: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    q: Optional[str] = None,
+    user=Depends(require_role("viewer")),
+):
+    def build_query(db: Session):
+        return (
+            _filtered_transactions(db, account_id, category_id, transaction_type, date_from, date_to, q)
+            .with_entities(*(getattr(Transaction, column) for column in EXPORT_COLUMNS))
+            .order_by(Transaction.date, Transaction.id)
+        )
+
+    return stream_export(build_query, EXPORT_COLUMNS, export_format, "lancamentos")
@@ -1,15 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from ..auth import (
     authenticate_user,
     create_access_token,
     get_current_user,
     get_password_hash,
+    get_password_hash_async,
+    login_rate_limiter,
+    password_pool,
     require_role,
-    verify_password,
+    verify_password_async,
 )
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models import ActionLog, User
 from ..schemas import ChangePasswordRequest, LoginRequest, TokenResponse, UserCreate, UserOut
 
@@ -17,8 +21,8 @@ router = APIRouter(prefix="/api/auth", tags=["Usuários"])
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
-    user = authenticate_user(db, payload.email, payload.password)
+async def login(payload: LoginRequest, db: Session = Depends(get_db)):
+    user = await authenticate_user(db, payload.email, payload.password)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     token = create_access_token({"sub": user.email})
@@ -47,7 +51,7 @@ def create_user(payload: UserCreate, db: Session = Depends(get_db), user=Depends
 
 
 @router.get("/users", response_model=list[UserOut])
-def list_users(db: Session = Depends(get_db), user=Depends(require_role("admin"))):
+def list_users(db: Session = Depends(get_read_db), user=Depends(require_role("admin"))):
     return db.query(User).all()
 
 
@@ -57,10 +61,18 @@ def read_me(user=Depends(get_current_user)):
 
 
 @router.post("/change-password")
-def change_password(payload: ChangePasswordRequest, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    if not verify_password(payload.current_password, user.password_hash):
+async def change_password(
+    payload: ChangePasswordRequest, db: Session = Depends(get_db), user=Depends(get_current_user)
+):
+    # The authenticated user is a cached snapshot without the hash; load the row itself.
+    account = await run_in_threadpool(db.get, User, user.id)
+    if not account or not await verify_password_async(payload.current_password, account.password_hash):
         raise HTTPException(status_code=400, detail="Invalid current password")
-    user.password_hash = get_password_hash(payload.new_password)
-    db.add(user)
-    db.commit()
+    account.password_hash = await get_password_hash_async(payload.new_password)
+    await run_in_threadpool(db.commit)
     return {"status": "ok"}
+
+
+@router.get("/password-pool")
+def password_pool_stats(user=Depends(require_role("admin"))):
+    return {**password_pool.stats(), "rate_limited": login_rate_limiter.limited}
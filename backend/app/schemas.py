@@ -103,6 +103,13 @@ class TransactionOut(TransactionBase):
         from_attributes = True
 
 
+class TransactionBatchResult(BaseModel):
+    index: int
+    status: str
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+
 class TitleBase(BaseModel):
     title_type: str
     client_supplier: str
@@ -177,9 +184,53 @@ class CashflowSummary(BaseModel):
     total_out: float
 
 
+class CashflowProjectionPoint(BaseModel):
+    period_start: date
+    inflow: float
+    outflow: float
+    title_count: int
+    balance: float
+
+
+class CashflowProjection(BaseModel):
+    as_of: date
+    granularity: str
+    horizon_days: int
+    opening_balance: float
+    points: list[CashflowProjectionPoint]
+
+
+class AccountDailyBalanceOut(BaseModel):
+    date: date
+    total_in: float
+    total_out: float
+    balance: float
+
+
 class ReportItem(BaseModel):
     label: str
     value: float
+    period: Optional[str] = None
+    id: Optional[int] = None
+
+
+class CategoryTreeItem(BaseModel):
+    id: int
+    name: str
+    category_type: str
+    parent_id: Optional[int] = None
+    depth: int
+    value: float
+    direct_value: float
+
+
+class ReportCacheStats(BaseModel):
+    entries: int
+    hits: int
+    misses: int
+    hit_ratio: float
+    invalidations: int
+    ttl_seconds: float
 
 
 class ReconciliationItemBase(BaseModel):
@@ -189,6 +240,7 @@ class ReconciliationItemBase(BaseModel):
     value: float
     status: str = "Pendente"
     matched_transaction_id: Optional[int] = None
+    account_id: Optional[int] = None
 
 
 class ReconciliationItemOut(ReconciliationItemBase):
@@ -196,3 +248,33 @@ class ReconciliationItemOut(ReconciliationItemBase):
 
     class Config:
         from_attributes = True
+
+
+class ReconciliationImportSummary(BaseModel):
+    filename: str
+    created: int
+    skipped: int = 0
+
+
+class ReconciliationMatchSummary(BaseModel):
+    pending: int
+    matched: int
+    ambiguous: int
+    unmatched: int
+
+
+class ImportJobOut(BaseModel):
+    id: int
+    filename: str
+    status: str
+    progress: int
+    parsed_count: int
+    created_count: int
+    error: Optional[str] = None
+    account_id: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import date
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+logger = logging.getLogger("cashup.statement_cache")
+
+CACHE_DIR = Path(os.getenv("CASHUP_STATEMENT_CACHE_DIR", "./statement_cache"))
+CACHE_MAX_ENTRIES = int(os.getenv("CASHUP_STATEMENT_CACHE_MAX_ENTRIES", "200"))
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_hash(fileobj: BinaryIO, chunk_size: int = 1 << 16) -> str:
+    """Hash a seekable upload in chunks and rewind it for the actual import."""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def _entry_path(kind: str, digest: str) -> Path:
+    return CACHE_DIR / f"{kind}-{digest}.json"
+
+
+def load(kind: str, digest: str, filename: str) -> Optional[list[dict]]:
+    """Return the parsed entries cached for this upload, or None on a miss.
+
+    Entries embed the upload's filename (e.g. in external_id), so a renamed
+    copy of the same file is treated as a miss.
+    """
+    path = _entry_path(kind, digest)
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as error:
+        logger.warning("Discarding unreadable statement cache entry %s: %s", path.name, error)
+        path.unlink(missing_ok=True)
+        return None
+    if payload.get("filename") != filename:
+        return None
+    # Touch the file so eviction keeps recently used statements.
+    os.utime(path)
+    entries = payload["entries"]
+    for entry in entries:
+        entry["date"] = date.fromisoformat(entry["date"])
+    logger.info("Statement cache hit for %s (%s entries).", filename, len(entries))
+    return entries
+
+
+def store(kind: str, digest: str, filename: str, entries: list[dict]) -> None:
+    payload = json.dumps({"filename": filename, "entries": entries}, default=date.isoformat, ensure_ascii=False)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so concurrent import workers never read a partial file.
+        handle, temp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(handle, "w", encoding="utf-8") as temp_file:
+            temp_file.write(payload)
+        os.replace(temp_path, _entry_path(kind, digest))
+        _evict()
+    except OSError as error:
+        # The cache is only an accelerator; an import must not fail because of it.
+        logger.warning("Could not write statement cache entry for %s: %s", filename, error)
+
+
+def _evict() -> None:
+    cached = []
+    for path in CACHE_DIR.glob("*.json"):
+        try:
+            cached.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    cached.sort()
+    for _, path in cached[: max(0, len(cached) - CACHE_MAX_ENTRIES)]:
+        path.unlink(missing_ok=True)
@@ -0,0 +1,58 @@
+import importlib
+import logging
+import os
+from collections.abc import Callable
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger("cashup.statement_parsers")
+
+PLUGIN_MODULES = [name.strip() for name in os.getenv("CASHUP_STATEMENT_PLUGINS", "").split(",") if name.strip()]
+
+PageSniffer = Callable[[list[str]], bool]
+PagesParser = Callable[[list[list[str]], str], list[dict]]
+
+
+class StatementLayout(NamedTuple):
+    bank: str
+    sniff: PageSniffer
+    parse: PagesParser
+    fallback: bool = False
+
+
+# Tried in registration order, fallback layouts last. Plugins (modules listed in
+# CASHUP_STATEMENT_PLUGINS that call register on import) therefore always run before the
+# built-in Santander layout, whose sniffer is the broadest, whenever they are registered.
+_layouts: list[StatementLayout] = []
+
+
+def register(bank: str, sniff: PageSniffer, parse: PagesParser, fallback: bool = False) -> StatementLayout:
+    """Add a layout, replacing any previous one registered for the same bank."""
+    layout = StatementLayout(bank, sniff, parse, fallback)
+    layouts = [existing for existing in _layouts if existing.bank != bank] + [layout]
+    # sorted is stable: registration order is kept within each group.
+    _layouts[:] = sorted(layouts, key=lambda existing: existing.fallback)
+    return layout
+
+
+def layouts() -> list[StatementLayout]:
+    return list(_layouts)
+
+
+def detect(first_page: list[str]) -> Optional[StatementLayout]:
+    """First layout whose sniffer claims the text lines of a statement's first page."""
+    for layout in _layouts:
+        try:
+            if layout.sniff(first_page):
+                return layout
+        except Exception:
+            # A broken plugin must not block the other layouts.
+            logger.exception("Statement sniffer for %s failed.", layout.bank)
+    return None
+
+
+def load_plugins() -> None:
+    for module_name in PLUGIN_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError as error:
+            logger.error("Could not load statement parser plugin %s: %s", module_name, error)
@@ -0,0 +1,173 @@
+from pathlib import Path
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+CHUNK = 50_000
+EMAIL = "bench@cashup.local"
+PASSWORD = "bench"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compara a vazão das rotas de leitura com a sessão síncrona e com o banco assíncrono.",
+    )
+    parser.add_argument("--rows", type=int, default=200_000, help="Quantidade de lançamentos.")
+    parser.add_argument("--clients", type=int, default=64, help="Clientes simultâneos.")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duração da medição por modo.")
+    parser.add_argument("--port", type=int, default=8765, help="Porta do servidor de teste.")
+    parser.add_argument("--modes", default="sync,async", help="Modos a comparar, separados por vírgula.")
+    return parser.parse_args()
+
+
+def populate(rows: int) -> None:
+    from sqlalchemy import insert
+
+    from app.auth import get_password_hash
+    from app.database import SessionLocal, ensure_schema
+    from app.models import Account, Category, Transaction, User
+    from app.rollups import rebuild_rollups
+
+    ensure_schema()
+    db = SessionLocal()
+    db.add(User(id=1, name="Bench", email=EMAIL, role="admin", password_hash=get_password_hash(PASSWORD)))
+    for account_id in range(1, 6):
+        db.add(Account(id=account_id, name=f"Conta {account_id}", account_type="corrente", initial_balance=0))
+    for category_id in range(1, 21):
+        db.add(Category(id=category_id, name=f"Categoria {category_id}", category_type="Receita"))
+    db.flush()
+    rng = random.Random(7)
+    start = date(2022, 1, 1)
+    batch = []
+    for index in range(rows):
+        batch.append(
+            {
+                "transaction_type": "Entrada" if index % 3 == 0 else "Saída",
+                "date": start + timedelta(days=rng.randrange(3 * 365)),
+                "value": rng.randrange(100, 1_000_000) / 100,
+                "category_id": rng.randrange(1, 21),
+                "account_id": rng.randrange(1, 6),
+                "payment_method": "PIX",
+                "description": f"Lançamento {index}",
+            }
+        )
+        if len(batch) == CHUNK:
+            db.execute(insert(Transaction), batch)
+            batch = []
+    if batch:
+        db.execute(insert(Transaction), batch)
+    rebuild_rollups(db)
+    db.commit()
+    db.close()
+
+
+def request_path(rng: random.Random) -> str:
+    day = date(2022, 1, 1) + timedelta(days=rng.randrange(3 * 365))
+    month = day.replace(day=1)
+    return rng.choice(
+        [
+            f"/api/transactions?limit=100&date_to={day.isoformat()}",
+            f"/api/transactions?limit=50&account_id={rng.randrange(1, 6)}&date_to={day.isoformat()}",
+            "/api/cashflow/summary",
+            "/api/cashflow/projection?granularity=week",
+            f"/api/reports/by-category?date_from={month.isoformat()}&date_to={day.isoformat()}&granularity=day",
+            "/api/reconciliation/import/jobs",
+        ]
+    )
+
+
+def wait_for_server(port: int, process: subprocess.Popen) -> None:
+    for _ in range(200):
+        if process.poll() is not None:
+            raise RuntimeError("o servidor terminou antes de responder")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/docs")
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("o servidor não respondeu")
+
+
+def login(port: int) -> str:
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    body = json.dumps({"email": EMAIL, "password": PASSWORD})
+    connection.request("POST", "/api/auth/login", body=body, headers={"Content-Type": "application/json"})
+    return json.loads(connection.getresponse().read())["access_token"]
+
+
+def run_mode(mode: str, args: argparse.Namespace, database_url: str) -> None:
+    env = dict(os.environ, CASHUP_DATABASE_URL=database_url, CASHUP_ASYNC_DB="1" if mode == "async" else "0")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+    )
+    try:
+        wait_for_server(args.port, server)
+        headers = {"Authorization": f"Bearer {login(args.port)}"}
+        stop = threading.Event()
+        latencies: list[list[float]] = [[] for _ in range(args.clients)]
+        errors = [0] * args.clients
+
+        def client(slot: int) -> None:
+            rng = random.Random(slot)
+            connection = http.client.HTTPConnection("127.0.0.1", args.port, timeout=60)
+            while not stop.is_set():
+                started = time.perf_counter()
+                connection.request("GET", request_path(rng), headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors[slot] += 1
+                latencies[slot].append((time.perf_counter() - started) * 1000)
+            connection.close()
+
+        threads = [threading.Thread(target=client, args=(slot,)) for slot in range(args.clients)]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    timings = sorted(value for slot in latencies for value in slot)
+    p95 = timings[int(len(timings) * 0.95) - 1] if timings else 0.0
+    median = statistics.median(timings) if timings else 0.0
+    print(
+        f"{mode:>5} | {len(timings) / args.seconds:8.0f} req/s | p50 {median:7.1f}ms | p95 {p95:7.1f}ms"
+        f" | erros {sum(errors)}"
+    )
+
+
+def main() -> None:
+    args = parse_args()
+    workdir = tempfile.mkdtemp()
+    database_url = f"sqlite:///{Path(workdir) / 'bench.db'}"
+    # The engine is configured at import time, so point it at the scratch database first.
+    os.environ["CASHUP_DATABASE_URL"] = database_url
+    started = time.perf_counter()
+    populate(args.rows)
+    print(f"base: {args.rows} lançamentos em {time.perf_counter() - started:.1f}s, {args.clients} clientes")
+    for mode in args.modes.split(","):
+        run_mode(mode.strip(), args, database_url)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+from pathlib import Path
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Mede a vazão de leituras concorrentes enquanto uma importação grava lançamentos.",
+    )
+    parser.add_argument("--journal-mode", default="WAL", help="Journal do SQLite (WAL, DELETE...).")
+    parser.add_argument("--readers", type=int, default=4, help="Quantidade de threads de leitura.")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duração da medição.")
+    parser.add_argument("--batch", type=int, default=500, help="Lançamentos por commit do escritor.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    workdir = tempfile.mkdtemp()
+    # The engine profile is read at import time, so configure it first.
+    os.environ["CASHUP_DATABASE_URL"] = f"sqlite:///{Path(workdir) / 'bench.db'}"
+    os.environ["CASHUP_SQLITE_JOURNAL_MODE"] = args.journal_mode
+
+    from app.database import ReadSessionLocal, SessionLocal, ensure_schema
+    from app.ledger import cashflow_totals, insert_transactions
+    from app.models import Account, Category, Transaction, User
+
+    ensure_schema()
+    db = SessionLocal()
+    db.add(User(id=1, name="Bench", email="bench@cashup.local", role="admin", password_hash="-"))
+    db.add(Account(id=1, name="Conta", account_type="corrente", initial_balance=0))
+    db.add(Category(id=1, name="Geral", category_type="Receita"))
+    db.commit()
+    db.close()
+
+    stop = threading.Event()
+    reads = [0] * args.readers
+    written = [0]
+
+    def writer() -> None:
+        session = SessionLocal()
+        start = date(2024, 1, 1)
+        while not stop.is_set():
+            offset = written[0]
+            rows = [
+                {
+                    "transaction_type": "Entrada",
+                    "date": start + timedelta(days=(offset + index) % 365),
+                    "value": 10.0,
+                    "category_id": 1,
+                    "account_id": 1,
+                    "payment_method": "Extrato bancário PDF",
+                    "description": f"Linha importada {offset + index}",
+                }
+                for index in range(args.batch)
+            ]
+            insert_transactions(session, rows, user_id=1, action="Importou PDF")
+            session.commit()
+            written[0] += len(rows)
+        session.close()
+
+    def reader(slot: int) -> None:
+        session = ReadSessionLocal()
+        while not stop.is_set():
+            cashflow_totals(session)
+            session.query(Transaction).order_by(Transaction.date.desc(), Transaction.id.desc()).limit(100).all()
+            session.rollback()
+            reads[slot] += 1
+        session.close()
+
+    threads = [threading.Thread(target=writer)] + [
+        threading.Thread(target=reader, args=(slot,)) for slot in range(args.readers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    print(f"journal_mode={args.journal_mode} leitores={args.readers} duração={args.seconds:.1f}s")
+    print(f"- leituras: {sum(reads)} ({sum(reads) / args.seconds:,.0f}/s)")
+    print(f"- lançamentos gravados: {written[0]} ({written[0] / args.seconds:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+from pathlib import Path
+import argparse
+import cProfile
+import os
+import pstats
+import random
+import statistics
+import sys
+import time
+import zlib
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.routers.reconciliation import _extract_pdf_pages_fallback, _parse_statement_pages
+
+MONTHS = ("janeiro", "fevereiro", "março", "abril", "maio", "junho")
+# Glyph codes are shifted away from ASCII, so the text only reads right through the ToUnicode map.
+GLYPH_OFFSET = 0x100
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Mede o extrator de PDF de último recurso (leitura direta dos streams) em um extrato grande.",
+    )
+    parser.add_argument("--pages", type=int, default=200, help="Páginas do extrato gerado.")
+    parser.add_argument("--repeat", type=int, default=5, help="Execuções (vale a mediana).")
+    parser.add_argument(
+        "--profile", action="store_true", help="Mostra as funções mais caras de uma execução extra."
+    )
+    return parser.parse_args()
+
+
+def _glyphs(text: str) -> str:
+    return "".join(f"{ord(char) + GLYPH_OFFSET:04X}" for char in text)
+
+
+def _page_lines(page: int, rng: random.Random) -> list[str]:
+    month = MONTHS[page // 30 % len(MONTHS)]
+    lines = ["Internet Banking Empresarial", "Extrato de conta corrente", "Agencia: 1234 Conta: 56789-0"]
+    for day_offset in range(3):
+        lines.append(f"{page % 28 + 1} de {month} de 2024" if day_offset == 0 else f"{day_offset} de {month} de 2024")
+        for entry in range(6):
+            cents = rng.randrange(100, 500_000)
+            sign = "-" if entry % 2 else ""
+            kind = "PIX ENVIADO" if sign else "PIX RECEBIDO"
+            lines.append(f"{kind} FORNECEDOR {page}-{day_offset}-{entry}")
+            amount = f"{cents // 100:,}".replace(",", ".")
+            lines.append(f"Pagamento ref {page * 100 + entry} {sign}{amount},{cents % 100:02d}")
+        lines.append("Saldo do dia 10.000,00")
+    return lines
+
+
+def build_statement_pdf(pages: int) -> bytes:
+    objects: list[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    def stream(dictionary: bytes, data: bytes) -> int:
+        return add(b"<< %s /Length %d >>\nstream\n%s\nendstream" % (dictionary, len(data), data))
+
+    cmap = "\n".join(
+        [
+            "/CIDInit /ProcSet findresource begin 12 dict begin begincmap",
+            "1 begincodespacerange <0000> <FFFF> endcodespacerange",
+            "2 beginbfrange",
+            f"<{0x21 + GLYPH_OFFSET:04X}> <{0x7E + GLYPH_OFFSET:04X}> <0021>",
+            f"<{0xA0 + GLYPH_OFFSET:04X}> <{0xFF + GLYPH_OFFSET:04X}> <00A0>",
+            "endbfrange endcmap CMapName currentdict /CMap defineresource pop end end",
+        ]
+    ).encode("latin-1")
+    to_unicode = stream(b"/Filter /FlateDecode", zlib.compress(cmap))
+    font = add(
+        b"<< /Type /Font /Subtype /Type0 /BaseFont /Statement /Encoding /Identity-H /ToUnicode %d 0 R >>" % to_unicode
+    )
+    pages_id = add(b"")
+    kids = []
+    for page in range(pages):
+        # Each page carries its own image (e.g. a QR code): binary data the extractor has to skip.
+        logo = stream(b"/Type /XObject /Subtype /Image /Width 64 /Height 64 /Filter /DCTDecode", os.urandom(8_000))
+        operations = ["BT /F1 9 Tf 40 800 Td 12 TL"]
+        for line in _page_lines(page, random.Random(page)):
+            # One show operator per word, as most generators emit; the extractor joins them with spaces.
+            operations.append(" ".join(f"<{_glyphs(word)}> Tj" for word in line.split()) + " T*")
+        operations.append("ET q 64 0 0 64 480 760 cm /Logo Do Q")
+        content = stream(b"/Filter /FlateDecode", zlib.compress("\n".join(operations).encode("latin-1")))
+        kids.append(
+            add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] /Contents %d 0 R"
+                b" /Resources << /Font << /F1 %d 0 R >> /XObject << /Logo %d 0 R >> >> >>"
+                % (pages_id, content, font, logo)
+            )
+        )
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids),
+        len(kids),
+    )
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    output = bytearray(b"%PDF-1.5\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(output)
+
+
+def main() -> None:
+    args = parse_args()
+    content = build_statement_pdf(args.pages)
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        pages = _extract_pdf_pages_fallback(content)
+        timings.append(time.perf_counter() - started)
+    entries = _parse_statement_pages(pages, "extrato.pdf")
+    print(f"PDF de {args.pages} páginas ({len(content) / 1_000_000:.1f} MB): {len(pages)} páginas com texto")
+    print(f"- {len(entries)} lançamentos reconhecidos")
+    print(f"- extração: mediana {statistics.median(timings) * 1000:.0f}ms em {args.repeat} execuções")
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.runcall(_extract_pdf_pages_fallback, content)
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats("tottime").print_stats(12)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+from pathlib import Path
+import argparse
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.database import Base
+from app.ledger import apply_transactions
+from app.models import Account, ActionLog, Category, ReconciliationItem, Transaction, User
+from app.routers.reconciliation import _persist_pdf_entries
+
+FILENAME = "extrato.pdf"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compara a gravação de um extrato PDF já interpretado linha a linha e em lotes.",
+    )
+    parser.add_argument("--lines", type=int, default=5000, help="Linhas do extrato interpretado.")
+    return parser.parse_args()
+
+
+def build_entries(count: int) -> list[dict]:
+    start = date(2024, 1, 1)
+    entries = []
+    for index in range(count):
+        value = float(index % 997) + 0.5
+        income = index % 3 != 0
+        entries.append(
+            {
+                "transaction_type": "Entrada" if income else "Saída",
+                "date": start + timedelta(days=index % 365),
+                "value": value,
+                "signed_value": value if income else -value,
+                "description": f"PIX RECEBIDO CLIENTE {index}",
+                "detail": f"Pagamento ref {index}" if index % 2 else "",
+                "external_id": f"{FILENAME}-{index // 40 + 1}-{index}",
+                "source_page": index // 40 + 1,
+            }
+        )
+    return entries
+
+
+def make_session(db_path: Path) -> Session:
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    db.add(User(id=1, name="Bench", email="bench@cashup.local", role="admin", password_hash="-"))
+    db.add(Account(id=1, name="Conta", account_type="corrente", initial_balance=0))
+    db.add(Category(id=1, name="Receitas", category_type="Receita"))
+    db.add(Category(id=2, name="Despesas", category_type="Despesa"))
+    db.commit()
+    return db
+
+
+def per_row(db: Session, entries: list[dict]) -> None:
+    # Mirrors the previous import: a flush per line for its id, then a refresh per transaction.
+    created = []
+    for entry in entries:
+        transaction = Transaction(
+            transaction_type=entry["transaction_type"],
+            date=entry["date"],
+            value=entry["value"],
+            category_id=1 if entry["transaction_type"] == "Entrada" else 2,
+            account_id=1,
+            payment_method="Extrato bancário PDF",
+            description=entry["description"],
+            client_supplier=entry["detail"],
+            document_number=entry["external_id"],
+            notes=f"Importado do extrato PDF {FILENAME} na página {entry['source_page']}.",
+            document_path=FILENAME,
+        )
+        db.add(transaction)
+        db.flush()
+        db.add(
+            ReconciliationItem(
+                external_id=entry["external_id"],
+                date=entry["date"],
+                description=entry["description"],
+                value=entry["signed_value"],
+                status="Importado",
+                matched_transaction_id=transaction.id,
+                account_id=1,
+            )
+        )
+        db.add(ActionLog(user_id=1, action="Importou PDF", entity="Transaction", entity_id=transaction.id))
+        created.append(transaction)
+    apply_transactions(db, created)
+    db.commit()
+    for transaction in created:
+        db.refresh(transaction)
+
+
+def batched(db: Session, entries: list[dict]) -> None:
+    _persist_pdf_entries(db, entries, FILENAME, 1, 1, 2, 1)
+    db.commit()
+
+
+def main() -> None:
+    args = parse_args()
+    entries = build_entries(args.lines)
+    with tempfile.TemporaryDirectory() as workdir:
+        for label, runner in (("linha a linha", per_row), ("em lotes", batched)):
+            db = make_session(Path(workdir) / f"{runner.__name__}.db")
+            started = time.perf_counter()
+            runner(db, entries)
+            elapsed = time.perf_counter() - started
+            db.close()
+            print(f"{label:>14}: {len(entries)} linhas em {elapsed:.3f}s ({len(entries) / elapsed:,.0f} linhas/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from pathlib import Path
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.database import Base
+from app.matching import MATCH_WINDOW_DAYS, match_pending
+from app.models import Account, Category, ReconciliationItem, Transaction
+
+ACCOUNTS = 3
+CHUNK = 50_000
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Mede a conciliação automática de itens pendentes contra os lançamentos.",
+    )
+    parser.add_argument("--items", type=int, default=50_000, help="Itens de extrato pendentes.")
+    parser.add_argument("--transactions", type=int, default=500_000, help="Lançamentos existentes.")
+    parser.add_argument(
+        "--naive-sample",
+        type=int,
+        default=500,
+        help="Itens usados para estimar a abordagem de uma consulta por item (0 desativa).",
+    )
+    return parser.parse_args()
+
+
+def populate(db: Session, items: int, transactions: int) -> None:
+    rng = random.Random(42)
+    start = date(2023, 1, 1)
+    for account_id in range(1, ACCOUNTS + 1):
+        db.add(Account(id=account_id, name=f"Conta {account_id}", account_type="corrente", initial_balance=0))
+    db.add(Category(id=1, name="Geral", category_type="Receita"))
+    db.flush()
+
+    rows = []
+    for index in range(transactions):
+        rows.append(
+            {
+                "transaction_type": "Entrada" if index % 3 == 0 else "Saída",
+                "date": start + timedelta(days=rng.randrange(730)),
+                "value": rng.randrange(100, 500_000) / 100,
+                "category_id": 1,
+                "account_id": rng.randrange(1, ACCOUNTS + 1),
+                "payment_method": "Boleto",
+                "description": f"Pagamento fornecedor {rng.randrange(5000)}",
+            }
+        )
+        if len(rows) == CHUNK:
+            db.execute(insert(Transaction), rows)
+            rows = []
+    if rows:
+        db.execute(insert(Transaction), rows)
+
+    # Most items mirror a transaction a few days later; the rest have no counterpart.
+    sources = db.execute(
+        select(
+            Transaction.account_id,
+            Transaction.date,
+            Transaction.value,
+            Transaction.transaction_type,
+            Transaction.description,
+        )
+        .order_by(Transaction.id)
+        .limit(items)
+    ).all()
+    rows = []
+    for index, (account_id, day, value, transaction_type, description) in enumerate(sources):
+        signed = value if transaction_type == "Entrada" else -value
+        if index % 5 == 4:
+            signed += 0.01
+        rows.append(
+            {
+                "external_id": f"EXT-{index}",
+                "date": day + timedelta(days=rng.randrange(MATCH_WINDOW_DAYS)),
+                "description": description.upper(),
+                "value": signed,
+                "status": "Pendente",
+                "account_id": account_id,
+            }
+        )
+    db.execute(insert(ReconciliationItem), rows)
+    db.commit()
+
+
+def naive_match(db: Session, sample: int) -> float:
+    # One candidate query per item, as a straightforward matcher would do.
+    items = db.execute(select(ReconciliationItem).limit(sample)).scalars().all()
+    started = time.perf_counter()
+    for item in items:
+        window = timedelta(days=MATCH_WINDOW_DAYS)
+        db.execute(
+            select(Transaction.id, Transaction.description).where(
+                Transaction.account_id == item.account_id,
+                Transaction.value == abs(item.value),
+                Transaction.date.between(item.date - window, item.date + window),
+            )
+        ).all()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(f"sqlite:///{Path(workdir) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine, autoflush=False)()
+        started = time.perf_counter()
+        populate(db, args.items, args.transactions)
+        print(f"base: {args.transactions} lançamentos e {args.items} itens em {time.perf_counter() - started:.1f}s")
+
+        if args.naive_sample:
+            elapsed = naive_match(db, args.naive_sample)
+            estimate = elapsed / args.naive_sample * args.items
+            print(f"consulta por item: {args.naive_sample} itens em {elapsed:.2f}s (estimativa total: {estimate:.0f}s)")
+
+        started = time.perf_counter()
+        result = match_pending(db)
+        db.commit()
+        elapsed = time.perf_counter() - started
+        print(
+            f"índice em memória: {result.pending} itens em {elapsed:.2f}s — "
+            f"conciliados {result.matched}, ambíguos {result.ambiguous}, sem par {result.unmatched}"
+        )
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
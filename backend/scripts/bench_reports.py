@@ -0,0 +1,109 @@
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+CHUNK = 50_000
+TARGET_MS = 50
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Mede o tempo dos relatórios por período sobre uma base grande de lançamentos.",
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Quantidade de lançamentos.")
+    parser.add_argument("--repeat", type=int, default=5, help="Execuções por cenário (vale a mediana).")
+    return parser.parse_args()
+
+
+def populate(db, rows: int) -> None:
+    from sqlalchemy import insert
+
+    from app.models import Account, Category, Transaction
+    from app.rollups import rebuild_rollups
+
+    rng = random.Random(7)
+    for account_id in range(1, 6):
+        db.add(Account(id=account_id, name=f"Conta {account_id}", account_type="corrente", initial_balance=0))
+    for category_id in range(1, 21):
+        db.add(Category(id=category_id, name=f"Categoria {category_id}", category_type="Receita"))
+    db.flush()
+    start = date(2022, 1, 1)
+    batch = []
+    for index in range(rows):
+        batch.append(
+            {
+                "transaction_type": "Entrada" if index % 3 == 0 else "Saída",
+                "date": start + timedelta(days=rng.randrange(3 * 365)),
+                "value": rng.randrange(100, 1_000_000) / 100,
+                "category_id": rng.randrange(1, 21),
+                "account_id": rng.randrange(1, 6),
+                "payment_method": "PIX",
+                "description": f"Lançamento {index}",
+            }
+        )
+        if len(batch) == CHUNK:
+            db.execute(insert(Transaction), batch)
+            batch = []
+    if batch:
+        db.execute(insert(Transaction), batch)
+    rebuild_rollups(db)
+    db.commit()
+    db.connection().exec_driver_sql("ANALYZE")
+    db.commit()
+
+
+def main() -> None:
+    args = parse_args()
+    workdir = tempfile.mkdtemp()
+    # The engine is configured at import time, so point it at the scratch database first.
+    os.environ["CASHUP_DATABASE_URL"] = f"sqlite:///{Path(workdir) / 'bench.db'}"
+
+    from app.cache import report_cache
+    from app.database import ReadSessionLocal, SessionLocal, ThreadedSession, ensure_schema
+    from app.routers.reports import report_by_account, report_by_category, report_cashflow
+
+    ensure_schema()
+    db = SessionLocal()
+    started = time.perf_counter()
+    populate(db, args.rows)
+    db.close()
+    print(f"base: {args.rows} lançamentos em {time.perf_counter() - started:.1f}s")
+
+    scenarios = [
+        ("mês, total", date(2024, 3, 1), date(2024, 3, 31), None),
+        ("mês, por dia", date(2024, 3, 1), date(2024, 3, 31), "day"),
+        ("trimestre, por mês", date(2024, 1, 1), date(2024, 3, 31), "month"),
+        ("ano, por trimestre", date(2024, 1, 1), date(2024, 12, 31), "quarter"),
+        ("três anos, por mês", None, None, "month"),
+    ]
+    reports = (("cashflow", report_cashflow), ("by-category", report_by_category), ("by-account", report_by_account))
+    read_db = ThreadedSession(ReadSessionLocal())
+    for label, date_from, date_to, granularity in scenarios:
+        for name, report in reports:
+            timings = []
+            for _ in range(args.repeat):
+                # Measure the SQL aggregation itself, not the report cache.
+                report_cache.clear()
+                started = time.perf_counter()
+                asyncio.run(
+                    report(date_from=date_from, date_to=date_to, granularity=granularity, db=read_db, user=None)
+                )
+                timings.append((time.perf_counter() - started) * 1000)
+            median = statistics.median(timings)
+            flag = "" if median <= TARGET_MS else f"  (acima de {TARGET_MS}ms)"
+            print(f"{label:>20} | {name:<12} {median:8.1f}ms{flag}")
+    read_db.session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+from pathlib import Path
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.routers.reconciliation import (
+    AMOUNT_PATTERNS,
+    DATE_HEADER_PATTERNS,
+    NOISE_PATTERNS,
+    PORTUGUESE_MONTHS,
+    SHORT_DATE_RE,
+    _parse_statement_pages,
+)
+
+MONTH_NAMES = ["janeiro", "fevereiro", "abril", "maio", "junho", "julho", "agosto", "setembro", "outubro"]
+
+
+# --- Reference: the previous per-predicate implementation, where every check
+# re-normalizes the line and the glued-date regex is compiled on each call. ---
+
+
+def _normalize_statement_line(line: str) -> str:
+    normalized = line.replace("−", "-").replace("–", "-").replace("—", "-")
+    for noisy_char in ("", "", "", "", "•", "·", "\uf0e6", "\uf131", "\uf12e", "\uf3e1"):
+        normalized = normalized.replace(noisy_char, " ")
+    return re.sub(r"\s+", " ", normalized).strip(" \u00a0")
+
+
+def _extract_statement_date(line: str):
+    normalized = _normalize_statement_line(line.lower())
+    for pattern in DATE_HEADER_PATTERNS:
+        match = pattern.search(normalized)
+        if not match:
+            continue
+        day = int(match.group("day"))
+        month = PORTUGUESE_MONTHS.get(match.group("month").lower())
+        year = int(match.group("year"))
+        if month:
+            try:
+                return datetime(year, month, day).date()
+            except ValueError:
+                continue
+    return None
+
+
+def _line_is_ignored(line: str) -> bool:
+    normalized = _normalize_statement_line(line)
+    if not normalized:
+        return True
+    return any(pattern.search(normalized) for pattern in NOISE_PATTERNS)
+
+
+def _is_balance_line(line: str) -> bool:
+    return "saldo do dia" in _normalize_statement_line(line).lower()
+
+
+def _is_short_date_line(line: str) -> bool:
+    return bool(SHORT_DATE_RE.fullmatch(_normalize_statement_line(line)))
+
+
+def _split_glued_date_lines(line: str) -> list[str]:
+    normalized = _normalize_statement_line(line)
+    if not normalized:
+        return []
+    split_pattern = re.compile(
+        r"(?<!^)(?<![\d/])(?=(\d{1,2}\s+de\s+[a-zç]+\s+de\s+\d{4}(?:,\s*[a-z-]+)?))",
+        re.IGNORECASE,
+    )
+    pieces = [piece.strip() for piece in split_pattern.split(normalized) if piece and piece.strip()]
+    return pieces or [normalized]
+
+
+def _prepare_statement_lines(lines: list[str]) -> list[str]:
+    prepared: list[str] = []
+    for raw_line in lines:
+        for piece in _split_glued_date_lines(raw_line):
+            normalized = _normalize_statement_line(piece)
+            if not normalized or _line_is_ignored(normalized):
+                continue
+            prepared.append(normalized)
+    return prepared
+
+
+def _extract_page_dates(lines: list[str]) -> list:
+    dates: list = []
+    seen = set()
+    for line in lines:
+        statement_date = _extract_statement_date(line)
+        if statement_date and statement_date not in seen:
+            dates.append(statement_date)
+            seen.add(statement_date)
+    return dates
+
+
+def _clean_transaction_parts(parts: list[str]) -> list[str]:
+    cleaned: list[str] = []
+    for part in parts:
+        normalized = _normalize_statement_line(part)
+        if not normalized:
+            continue
+        if _extract_statement_date(normalized):
+            continue
+        if _is_short_date_line(normalized):
+            continue
+        if _is_balance_line(normalized):
+            continue
+        if _line_is_ignored(normalized):
+            continue
+        cleaned.append(normalized)
+    return cleaned
+
+
+def _extract_amount(line: str):
+    for pattern in AMOUNT_PATTERNS:
+        match = pattern.search(line)
+        if not match:
+            continue
+        value = float(match.group("value").replace(".", "").replace(",", "."))
+        if match.group("sign"):
+            value *= -1
+        return {
+            "value": value,
+            "text_before_amount": _normalize_statement_line(line[: match.start()]),
+        }
+    return None
+
+
+def legacy_parse_statement_pages(pages: list[list[str]], filename: str) -> list[dict]:
+    transactions = []
+    seen_transactions = set()
+    for page_number, lines in enumerate(pages, start=1):
+        prepared_lines = _prepare_statement_lines(lines)
+        page_dates = _extract_page_dates(prepared_lines)
+        if not page_dates:
+            continue
+        current_date_index = 0
+        current_date = page_dates[current_date_index]
+        pending_parts: list[str] = []
+        committed_for_current_date = False
+        for line in prepared_lines:
+            if not line:
+                continue
+            if _extract_statement_date(line):
+                continue
+            if _is_balance_line(line):
+                pending_parts = []
+                if committed_for_current_date and current_date_index + 1 < len(page_dates):
+                    current_date_index += 1
+                    current_date = page_dates[current_date_index]
+                    committed_for_current_date = False
+                continue
+            if _line_is_ignored(line):
+                continue
+            amount_data = _extract_amount(line)
+            if not amount_data:
+                if _is_short_date_line(line):
+                    continue
+                pending_parts.append(line)
+                continue
+            parts = [part for part in pending_parts if part]
+            if amount_data["text_before_amount"]:
+                parts.append(amount_data["text_before_amount"])
+            pending_parts = []
+            parts = _clean_transaction_parts(parts)
+            if not parts or current_date is None:
+                continue
+            description = parts[0]
+            detail = " · ".join(parts[1:]) if len(parts) > 1 else None
+            value = amount_data["value"]
+            transaction_type = "Saída" if value < 0 else "Entrada"
+            dedupe_key = (
+                current_date.isoformat(),
+                description.lower(),
+                detail.lower() if detail else "",
+                round(value, 2),
+                transaction_type,
+            )
+            if dedupe_key in seen_transactions:
+                continue
+            seen_transactions.add(dedupe_key)
+            transactions.append(
+                {
+                    "date": current_date,
+                    "description": description,
+                    "detail": detail,
+                    "value": abs(value),
+                    "signed_value": value,
+                    "transaction_type": transaction_type,
+                    "source_page": page_number,
+                    "external_id": f"{filename}-{page_number}-{current_date.isoformat()}-{len(transactions) + 1}",
+                }
+            )
+            committed_for_current_date = True
+    return transactions
+
+
+def build_statement(line_count: int, seed: int = 7) -> list[list[str]]:
+    rng = random.Random(seed)
+    pages: list[list[str]] = []
+    lines: list[str] = []
+    produced = 0
+    day = 1
+    month = 0
+    while produced < line_count:
+        if len(lines) >= 60:
+            pages.append(lines)
+            lines = []
+        lines.append("Internet Banking Empresarial")
+        lines.append(f"{day} de {MONTH_NAMES[month]} de 2024")
+        for entry in range(rng.randint(3, 8)):
+            value = f"{rng.randint(1, 99)}.{rng.randint(100, 999)},{rng.randint(0, 99):02d}"
+            sign = rng.choice(["", "-", "− "])
+            if rng.random() < 0.3:
+                lines.append(f"PIX RECEBIDO • CLIENTE {produced}")
+                lines.append(f"{day:02d}/{month + 1:02d}/2024")
+                lines.append(f"Documento {entry} R$ {sign}{value}")
+            else:
+                lines.append(f"PAGAMENTO BOLETO FORNECEDOR {produced} {sign}{value}")
+        lines.append(f"Saldo do dia R$ {rng.randint(1, 99)}.000,00")
+        if rng.random() < 0.2:
+            lines.append(f"Página {len(pages) + 1}")
+        produced = sum(len(page) for page in pages) + len(lines)
+        day += 1
+        if day > 28:
+            day = 1
+            month = (month + 1) % len(MONTH_NAMES)
+    pages.append(lines)
+    return pages
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compara o classificador de linhas de extrato com a implementação anterior.",
+    )
+    parser.add_argument("--lines", type=int, default=10000, help="Linhas do extrato sintético.")
+    parser.add_argument("--rounds", type=int, default=5, help="Repetições de cada cenário.")
+    return parser.parse_args()
+
+
+def best_of(rounds: int, runner, pages: list[list[str]]) -> float:
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        runner(pages, "extrato.pdf")
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    args = parse_args()
+    pages = build_statement(args.lines)
+    line_count = sum(len(page) for page in pages)
+    expected = legacy_parse_statement_pages(pages, "extrato.pdf")
+    current = _parse_statement_pages(pages, "extrato.pdf")
+    if expected != current:
+        print("ERRO: o classificador gerou lançamentos diferentes da implementação anterior.")
+        raise SystemExit(1)
+    legacy_time = best_of(args.rounds, legacy_parse_statement_pages, pages)
+    current_time = best_of(args.rounds, _parse_statement_pages, pages)
+    print(f"{line_count} linhas, {len(pages)} páginas, {len(current)} lançamentos (resultados idênticos)")
+    print(f"- anterior:      {legacy_time * 1000:.1f} ms")
+    print(f"- classificador: {current_time * 1000:.1f} ms ({legacy_time / current_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
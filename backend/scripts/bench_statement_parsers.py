@@ -0,0 +1,149 @@
+from pathlib import Path
+import argparse
+import logging
+import random
+import statistics
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app import statement_parsers
+from app.routers.reconciliation import (
+    _extract_first_pdf_page,
+    _extract_pdf_pages,
+    _parse_pdf_statement,
+    _parse_statement_pages,
+)
+
+MONTHS = ("janeiro", "fevereiro", "março", "abril", "maio", "junho")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Mede a detecção do layout de extratos PDF pela primeira página: quanto custa reconhecer o banco "
+            "e quanto se economiza ao recusar um layout não suportado sem extrair o documento inteiro."
+        ),
+    )
+    parser.add_argument("--pages", type=int, default=60, help="Páginas dos extratos gerados.")
+    parser.add_argument("--repeat", type=int, default=3, help="Execuções por medição (vale a mediana).")
+    parser.add_argument(
+        "--fixtures",
+        type=Path,
+        help="Pasta com extratos reais (*.pdf) de qualquer banco, medidos além dos gerados.",
+    )
+    return parser.parse_args()
+
+
+def build_pdf(pages: list[list[str]]) -> bytes:
+    objects: list[bytes] = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>", b""]
+    kids = []
+    for lines in pages:
+        operations = ["BT /F1 9 Tf 40 800 Td 12 TL"]
+        for line in lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            operations.append(f"({escaped}) Tj T*")
+        operations.append("ET")
+        data = "\n".join(operations).encode("cp1252")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(data), data))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 1 0 R >> >>"
+            b" /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % kid for kid in kids), len(kids))
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, len(objects), xref)
+    return bytes(output)
+
+
+def _amount(rng: random.Random) -> str:
+    cents = rng.randrange(100, 500_000)
+    return f"{cents // 100:,}".replace(",", ".") + f",{cents % 100:02d}"
+
+
+def santander_statement(pages: int) -> bytes:
+    rng = random.Random(1)
+    content = []
+    for page in range(pages):
+        month = MONTHS[page // 10 % len(MONTHS)]
+        lines = ["Internet Banking Empresarial", "Extrato de conta corrente", "Agencia: 1234 Conta: 56789-0"]
+        for day in range(3):
+            lines.append(f"{page % 9 * 3 + day + 1} de {month} de 2024")
+            for entry in range(6):
+                sign = "-" if entry % 2 else ""
+                lines.append(f"{'PIX ENVIADO' if sign else 'PIX RECEBIDO'} FORNECEDOR {page}-{day}-{entry}")
+                lines.append(f"Pagamento ref {page * 100 + entry} {sign}{_amount(rng)}")
+            lines.append("Saldo do dia 10.000,00")
+        content.append(lines)
+    return build_pdf(content)
+
+
+def other_bank_statement(pages: int) -> bytes:
+    # Another bank's layout: one line per entry with short dates under a long-form issue date, which the
+    # built-in layout must not claim.
+    rng = random.Random(2)
+    content = []
+    for page in range(pages):
+        lines = [
+            "Banco Exemplo S.A.",
+            "Extrato mensal - conta empresarial",
+            "Extrato emitido em 05 de março de 2024",
+            "Data Histórico Documento Valor",
+        ]
+        for entry in range(40):
+            day = f"{entry % 28 + 1:02d}/{page % 12 + 1:02d}/2024"
+            lines.append(f"{day} TED RECEBIDA {page:04d}{entry:02d} {_amount(rng)}")
+        content.append(lines)
+    return build_pdf(content)
+
+
+def median_time(repeat: int, function, *args):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def measure(label: str, content: bytes, repeat: int) -> None:
+    sniff_time, first_page = median_time(repeat, _extract_first_pdf_page, content)
+    layout = statement_parsers.detect(first_page)
+    # Before the registry, every upload was fully extracted and handed to the Santander parser.
+    full_time, entries = median_time(
+        repeat, lambda: _parse_statement_pages(_extract_pdf_pages(content, 1), "extrato.pdf")
+    )
+    registry_time, detected_entries = median_time(repeat, _parse_pdf_statement, content, "extrato.pdf", 1)
+    print(f"{label}: layout {layout.bank if layout else 'não reconhecido'}")
+    print(f"- primeira página: {sniff_time * 1000:.0f}ms")
+    print(f"- extração completa (antes): {full_time * 1000:.0f}ms, {len(entries)} lançamentos")
+    print(f"- com detecção do layout: {registry_time * 1000:.0f}ms, {len(detected_entries)} lançamentos")
+
+
+def main() -> None:
+    args = parse_args()
+    # Unmatched layouts are logged as warnings; keep the report readable.
+    logging.getLogger("cashup").setLevel(logging.ERROR)
+    print(f"Layouts registrados: {', '.join(layout.bank for layout in statement_parsers.layouts())}")
+    measure(f"Santander gerado ({args.pages} páginas)", santander_statement(args.pages), args.repeat)
+    measure(f"Layout de outro banco ({args.pages} páginas)", other_bank_statement(args.pages), args.repeat)
+    if args.fixtures:
+        for path in sorted(args.fixtures.glob("*.pdf")):
+            measure(path.name, path.read_bytes(), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
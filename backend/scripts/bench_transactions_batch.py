@@ -0,0 +1,86 @@
+from pathlib import Path
+import argparse
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.database import Base
+from app.ledger import apply_transactions, insert_transactions
+from app.models import Account, ActionLog, Category, Transaction, User
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compara a gravação de lançamentos linha a linha com a gravação em lote.",
+    )
+    parser.add_argument("--rows", type=int, default=2000, help="Quantidade de lançamentos por cenário.")
+    return parser.parse_args()
+
+
+def build_rows(count: int) -> list[dict]:
+    start = date(2024, 1, 1)
+    return [
+        {
+            "transaction_type": "Entrada" if index % 3 else "Saída",
+            "date": start + timedelta(days=index % 365),
+            "value": float(index % 997) + 0.5,
+            "category_id": 1,
+            "account_id": 1,
+            "payment_method": "PIX",
+            "description": f"Lançamento ERP {index}",
+            "document_number": f"ERP-{index}",
+        }
+        for index in range(count)
+    ]
+
+
+def make_session(db_path: Path) -> Session:
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    db.add(User(id=1, name="Bench", email="bench@cashup.local", role="admin", password_hash="-"))
+    db.add(Account(id=1, name="Conta", account_type="corrente", initial_balance=0))
+    db.add(Category(id=1, name="Geral", category_type="Receita"))
+    db.commit()
+    return db
+
+
+def per_row(db: Session, rows: list[dict]) -> None:
+    # Mirrors POST /api/transactions: one commit for the row, another for its log.
+    for values in rows:
+        transaction = Transaction(**values)
+        db.add(transaction)
+        apply_transactions(db, [transaction])
+        db.commit()
+        db.refresh(transaction)
+        db.add(ActionLog(user_id=1, action="Criou", entity="Transaction", entity_id=transaction.id))
+        db.commit()
+
+
+def batched(db: Session, rows: list[dict]) -> None:
+    insert_transactions(db, rows, user_id=1)
+    db.commit()
+
+
+def main() -> None:
+    args = parse_args()
+    rows = build_rows(args.rows)
+    with tempfile.TemporaryDirectory() as workdir:
+        for label, runner in (("linha a linha", per_row), ("lote único", batched)):
+            db = make_session(Path(workdir) / f"{runner.__name__}.db")
+            started = time.perf_counter()
+            runner(db, rows)
+            elapsed = time.perf_counter() - started
+            db.close()
+            print(f"{label:>14}: {len(rows)} lançamentos em {elapsed:.3f}s ({len(rows) / elapsed:,.0f} linhas/s)")
+
+
+if __name__ == "__main__":
+    main()
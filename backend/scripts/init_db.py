@@ -7,12 +7,14 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 
 from app.auth import get_password_hash
-from app.database import Base, SessionLocal, engine
+from app.database import SessionLocal, ensure_schema
+from app.ledger import rebuild_balances
 from app.models import Account, Bank, Category, User
+from app.rollups import rebuild_rollups
 
 
 def main() -> None:
-    Base.metadata.create_all(bind=engine)
+    ensure_schema()
     db: Session = SessionLocal()
     admin = db.query(User).filter(User.email == "admin@cashup.local").first()
     if not admin:
@@ -36,6 +38,8 @@ def main() -> None:
         db.add(bank)
         db.flush()
         db.add(Account(name="Caixa", account_type="caixa", initial_balance=0, bank_id=bank.id))
+    rebuild_balances(db)
+    rebuild_rollups(db)
     db.commit()
     db.close()
 
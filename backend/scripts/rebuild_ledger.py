@@ -0,0 +1,55 @@
+from pathlib import Path
+import argparse
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.database import SessionLocal, ensure_schema
+from app.ledger import backfill_statement_fingerprints, rebuild_balances, verify_balances
+from app.rollups import rebuild_rollups
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Reconstrói (saldos, totais mensais e assinaturas de extrato) ou verifica os saldos "
+            "materializados a partir dos lançamentos."
+        ),
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Apenas compara os saldos gravados com os lançamentos, sem alterar nada.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    ensure_schema()
+    db = SessionLocal()
+    try:
+        if not args.verify:
+            rebuild_balances(db)
+            rebuild_rollups(db)
+            fingerprinted = backfill_statement_fingerprints(db)
+            db.commit()
+            print("Saldos e totais mensais reconstruídos.")
+            if fingerprinted:
+                print(f"{fingerprinted} lançamentos de extrato antigos receberam a assinatura de deduplicação.")
+        mismatches = verify_balances(db)
+    finally:
+        db.close()
+    if mismatches:
+        for mismatch in mismatches:
+            print(
+                f"- conta {mismatch['account_id']} dia {mismatch['date'] or '*'}: "
+                f"esperado {mismatch['expected']}, gravado {mismatch['stored']}"
+            )
+        raise SystemExit(1)
+    print("Saldos conferem com os lançamentos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -53,10 +53,54 @@ CREATE TABLE IF NOT EXISTS transactions (
   document_path TEXT,
   tax_id TEXT,
   created_at TEXT,
+  fingerprint TEXT,
   FOREIGN KEY(category_id) REFERENCES categories(id),
   FOREIGN KEY(account_id) REFERENCES accounts(id)
 );
 
+CREATE INDEX IF NOT EXISTS ix_transactions_date_id ON transactions(date, id);
+CREATE INDEX IF NOT EXISTS ix_transactions_account_date_id ON transactions(account_id, date, id);
+CREATE INDEX IF NOT EXISTS ix_transactions_category_date_id ON transactions(category_id, date, id);
+CREATE INDEX IF NOT EXISTS ix_transactions_type_date_id ON transactions(transaction_type, date, id);
+CREATE INDEX IF NOT EXISTS ix_transactions_date_category_type_value ON transactions(date, category_id, transaction_type, value);
+CREATE INDEX IF NOT EXISTS ix_transactions_date_account_type_value ON transactions(date, account_id, transaction_type, value);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_transactions_fingerprint ON transactions(fingerprint);
+
+CREATE TABLE IF NOT EXISTS account_balances (
+  account_id INTEGER PRIMARY KEY,
+  total_in REAL NOT NULL DEFAULT 0,
+  total_out REAL NOT NULL DEFAULT 0,
+  transaction_count INTEGER NOT NULL DEFAULT 0,
+  updated_at TEXT,
+  FOREIGN KEY(account_id) REFERENCES accounts(id)
+);
+
+CREATE TABLE IF NOT EXISTS account_daily_balances (
+  account_id INTEGER NOT NULL,
+  date TEXT NOT NULL,
+  total_in REAL NOT NULL DEFAULT 0,
+  total_out REAL NOT NULL DEFAULT 0,
+  transaction_count INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY(account_id, date),
+  FOREIGN KEY(account_id) REFERENCES accounts(id)
+);
+
+CREATE TABLE IF NOT EXISTS monthly_rollups (
+  month TEXT NOT NULL,
+  account_id INTEGER NOT NULL,
+  category_id INTEGER NOT NULL,
+  transaction_type TEXT NOT NULL,
+  total REAL NOT NULL DEFAULT 0,
+  transaction_count INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY(month, account_id, category_id, transaction_type),
+  FOREIGN KEY(account_id) REFERENCES accounts(id),
+  FOREIGN KEY(category_id) REFERENCES categories(id)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_dirty_months (
+  month TEXT PRIMARY KEY
+);
+
 CREATE TABLE IF NOT EXISTS titles (
   id INTEGER PRIMARY KEY AUTOINCREMENT,
   title_type TEXT NOT NULL,
@@ -80,7 +124,45 @@ CREATE TABLE IF NOT EXISTS reconciliation_items (
   value REAL NOT NULL,
   status TEXT DEFAULT 'Pendente',
   matched_transaction_id INTEGER,
-  FOREIGN KEY(matched_transaction_id) REFERENCES transactions(id)
+  account_id INTEGER,
+  fingerprint TEXT,
+  FOREIGN KEY(matched_transaction_id) REFERENCES transactions(id),
+  FOREIGN KEY(account_id) REFERENCES accounts(id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_reconciliation_items_external_id ON reconciliation_items(external_id);
+CREATE INDEX IF NOT EXISTS ix_reconciliation_items_account_external_id ON reconciliation_items(account_id, external_id);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_reconciliation_items_fingerprint ON reconciliation_items(fingerprint);
+
+CREATE TABLE IF NOT EXISTS statement_imports (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  content_hash TEXT NOT NULL UNIQUE,
+  filename TEXT NOT NULL,
+  entry_count INTEGER NOT NULL DEFAULT 0,
+  user_id INTEGER NOT NULL,
+  created_at TEXT,
+  FOREIGN KEY(user_id) REFERENCES users(id)
+);
+
+CREATE TABLE IF NOT EXISTS import_jobs (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  filename TEXT NOT NULL,
+  status TEXT NOT NULL DEFAULT 'Na fila',
+  progress INTEGER NOT NULL DEFAULT 0,
+  parsed_count INTEGER NOT NULL DEFAULT 0,
+  created_count INTEGER NOT NULL DEFAULT 0,
+  error TEXT,
+  account_id INTEGER NOT NULL,
+  income_category_id INTEGER NOT NULL,
+  expense_category_id INTEGER NOT NULL,
+  user_id INTEGER NOT NULL,
+  created_at TEXT,
+  started_at TEXT,
+  finished_at TEXT,
+  FOREIGN KEY(account_id) REFERENCES accounts(id),
+  FOREIGN KEY(income_category_id) REFERENCES categories(id),
+  FOREIGN KEY(expense_category_id) REFERENCES categories(id),
+  FOREIGN KEY(user_id) REFERENCES users(id)
 );
 
 CREATE TABLE IF NOT EXISTS action_logs (
@@ -0,0 +1,29 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# The engines are configured at import time, so point them at a scratch database first.
+WORKDIR = Path(tempfile.mkdtemp(prefix="cashup-tests-"))
+os.environ["CASHUP_DATABASE_URL"] = f"sqlite:///{WORKDIR / 'cashup.db'}"
+os.environ["CASHUP_STATEMENT_CACHE_DIR"] = str(WORKDIR / "statement_cache")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from scripts.init_db import main as init_db  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    init_db()
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client: TestClient) -> dict[str, str]:
+    response = client.post("/api/auth/login", json={"email": "admin@cashup.local", "password": "admin"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app import auth
+from app.auth import LoginRateLimiter, PasswordPool
+
+
+def test_login_attempts_are_limited_per_email(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(auth.clock, "monotonic", lambda: now[0])
+    limiter = LoginRateLimiter(attempts_per_minute=3)
+    for _ in range(3):
+        limiter.check("Ana@Empresa.com")
+    with pytest.raises(HTTPException) as error:
+        limiter.check(" ana@empresa.com ")
+    assert error.value.status_code == 429
+    assert error.value.headers["Retry-After"] == "61"
+    # Other emails keep their own window.
+    limiter.check("bruno@empresa.com")
+
+    now[0] += 30
+    with pytest.raises(HTTPException):
+        limiter.check("ana@empresa.com")
+    now[0] += 30
+    limiter.check("ana@empresa.com")
+    assert limiter.limited == 2
+
+
+def test_password_pool_rejects_beyond_the_queue_limit():
+    pool = PasswordPool(workers=1, queue_limit=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert pool.stats()["queue_depth"] == 1
+        with pytest.raises(HTTPException) as error:
+            await pool.run(release.wait)
+        assert (error.value.status_code, error.value.headers["Retry-After"]) == (503, "1")
+        release.set()
+        assert await asyncio.gather(*running) == [True, True]
+
+    asyncio.run(scenario())
+    assert pool.stats() == {
+        "workers": 1,
+        "queue_limit": 1,
+        "in_flight": 0,
+        "queue_depth": 0,
+        "peak": 2,
+        "rejected": 1,
+    }
+
+
+def test_login_answers_429_after_too_many_attempts(client):
+    credentials = {"email": "limite@cashup.local", "password": "errada"}
+    statuses = [
+        client.post("/api/auth/login", json=credentials).status_code for _ in range(auth.LOGIN_ATTEMPTS_PER_MINUTE + 1)
+    ]
+    assert statuses == [401] * auth.LOGIN_ATTEMPTS_PER_MINUTE + [429]
+    response = client.post("/api/auth/login", json={"email": "admin@cashup.local", "password": "admin"})
+    assert response.status_code == 200
@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+
+from app.database import SessionLocal
+from app.models import Account, PayableReceivable
+
+
+def test_weekly_projection_buckets_titles_by_monday(client, admin_headers):
+    today = date.today()
+    monday = today - timedelta(days=today.weekday())
+    sunday = monday + timedelta(days=6)
+    db = SessionLocal()
+    account = Account(name="Conta da projeção", account_type="corrente", initial_balance=1000)
+    db.add(account)
+    db.flush()
+    titles = [
+        # Overdue titles are still expected, so they fall in the current week.
+        ("Receber", today - timedelta(days=10), 50.0, "Pendente"),
+        ("Receber", sunday, 100.0, "Pendente"),
+        ("Pagar", sunday + timedelta(days=1), 30.0, "Pendente"),
+        # A Sunday closes its week; the next Monday opens a new one.
+        ("Pagar", sunday + timedelta(days=7), 20.0, "Pendente"),
+        ("Receber", sunday + timedelta(days=8), 5.0, "Pendente"),
+        # Settled titles and titles past the horizon are left out.
+        ("Receber", sunday, 999.0, "Recebido"),
+        ("Pagar", today + timedelta(days=40), 999.0, "Pendente"),
+    ]
+    db.add_all(
+        PayableReceivable(
+            title_type=title_type,
+            client_supplier="Cliente",
+            due_date=due_date,
+            value=value,
+            status=status,
+            account_id=account.id,
+        )
+        for title_type, due_date, value, status in titles
+    )
+    db.commit()
+    account_id = account.id
+    db.close()
+
+    response = client.get(
+        f"/api/cashflow/projection?granularity=week&horizon_days=21&account_id={account_id}", headers=admin_headers
+    )
+    assert response.status_code == 200, response.text
+    projection = response.json()
+    assert projection["opening_balance"] == 1000
+    points = projection["points"]
+    assert [point["period_start"] for point in points] == [
+        (monday + timedelta(days=7 * week)).isoformat() for week in range(len(points))
+    ]
+    last_week = date.fromisoformat(points[-1]["period_start"])
+    assert last_week <= today + timedelta(days=21) < last_week + timedelta(days=7)
+    summary = [(point["inflow"], point["outflow"], point["title_count"], point["balance"]) for point in points[:3]]
+    assert summary == [(150.0, 0.0, 2, 1150.0), (0.0, 50.0, 2, 1100.0), (5.0, 0.0, 1, 1105.0)]
+    assert all(point["title_count"] == 0 and point["balance"] == 1105.0 for point in points[3:])
+
+
+def test_projection_of_an_unknown_account_is_404(client, admin_headers):
+    response = client.get("/api/cashflow/projection?granularity=week&account_id=999999", headers=admin_headers)
+    assert response.status_code == 404
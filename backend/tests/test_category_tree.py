@@ -0,0 +1,61 @@
+from app.database import SessionLocal
+from app.models import Category
+
+
+def test_category_tree_sums_each_subtree(client, admin_headers):
+    db = SessionLocal()
+    root = Category(name="Árvore despesas", category_type="Despesa")
+    db.add(root)
+    db.flush()
+    office = Category(name="Árvore escritório", category_type="Despesa", parent_id=root.id)
+    travel = Category(name="Árvore viagens", category_type="Despesa", parent_id=root.id)
+    db.add_all([office, travel])
+    db.flush()
+    supplies = Category(name="Árvore papelaria", category_type="Despesa", parent_id=office.id)
+    db.add(supplies)
+    db.commit()
+    ids = {"root": root.id, "office": office.id, "travel": travel.id, "supplies": supplies.id}
+    db.close()
+
+    values = [
+        ("root", 1, "2018-03-10"),
+        ("office", 10, "2018-03-11"),
+        ("supplies", 100, "2018-04-12"),
+        ("supplies", 1000, "2018-05-02"),
+        ("travel", 10000, "2018-03-15"),
+    ]
+    for name, value, day in values:
+        transaction = {
+            "transaction_type": "Saída",
+            "date": day,
+            "value": value,
+            "category_id": ids[name],
+            "account_id": 1,
+            "payment_method": "PIX",
+            "description": "Árvore",
+        }
+        assert client.post("/api/transactions", json=transaction, headers=admin_headers).status_code == 200
+
+    def tree(query: str) -> list[tuple]:
+        response = client.get(f"/api/reports/category-tree?{query}", headers=admin_headers)
+        assert response.status_code == 200, response.text
+        # Other tests add transactions to other categories, so keep only this tree.
+        return [
+            (item["name"], item["depth"], item["value"], item["direct_value"])
+            for item in response.json()
+            if item["id"] in ids.values()
+        ]
+
+    # Each category is followed by its subcategories, sorted by name.
+    assert tree("date_from=2018-01-01&date_to=2018-12-31") == [
+        ("Árvore despesas", 0, 11111.0, 1.0),
+        ("Árvore escritório", 1, 1110.0, 10.0),
+        ("Árvore papelaria", 2, 1100.0, 1100.0),
+        ("Árvore viagens", 1, 10000.0, 10000.0),
+    ]
+    assert tree("date_from=2018-04-01&date_to=2018-04-30") == [
+        ("Árvore despesas", 0, 100.0, 0.0),
+        ("Árvore escritório", 1, 100.0, 0.0),
+        ("Árvore papelaria", 2, 100.0, 100.0),
+        ("Árvore viagens", 1, 0.0, 0.0),
+    ]
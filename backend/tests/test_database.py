@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.database import SQLITE_PRAGMAS, _connection_pragmas, engine, read_engine
+
+
+def _pragma(connection, name: str):
+    return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_writer_connections_get_the_sqlite_profile(client):
+    with engine.connect() as connection:
+        assert _pragma(connection, "journal_mode") == "wal"
+        assert _pragma(connection, "synchronous") == 1
+        assert _pragma(connection, "busy_timeout") == int(SQLITE_PRAGMAS["busy_timeout"])
+        assert _pragma(connection, "cache_size") == int(SQLITE_PRAGMAS["cache_size"])
+        assert _pragma(connection, "temp_store") == 2
+        assert _pragma(connection, "query_only") == 0
+
+
+def test_read_pool_is_separate_and_read_only(client):
+    assert read_engine is not engine
+    # The journal mode belongs to the database file, so readers never switch it.
+    assert "journal_mode" not in _connection_pragmas(read_only=True)
+    with read_engine.connect() as connection:
+        assert _pragma(connection, "query_only") == 1
+        assert _pragma(connection, "journal_mode") == "wal"
+        with pytest.raises(OperationalError, match="readonly"):
+            connection.execute(text("UPDATE accounts SET name = name"))
+
+
+def test_readers_are_not_blocked_by_an_open_write(client, admin_headers):
+    before = client.get("/api/accounts", headers=admin_headers).json()
+    with engine.connect() as writer:
+        writer.exec_driver_sql("BEGIN IMMEDIATE")
+        writer.exec_driver_sql("UPDATE accounts SET name = 'Renomeada sem commit' WHERE id = 1")
+        try:
+            # WAL readers keep the last committed snapshot instead of waiting for the writer.
+            with read_engine.connect() as reader:
+                assert reader.execute(text("SELECT name FROM accounts WHERE id = 1")).scalar() != "Renomeada sem commit"
+            assert client.get("/api/accounts", headers=admin_headers).json() == before
+        finally:
+            writer.rollback()
@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+
+from app import exports
+from app.routers.transactions import EXPORT_COLUMNS
+
+
+def _create(client, headers, rows: list[dict]) -> list[int]:
+    response = client.post("/api/transactions/batch", json=rows, headers=headers)
+    assert response.status_code == 200
+    return [result["id"] for result in response.json()]
+
+
+def _row(day: str, description: str, value: float = 10) -> dict:
+    return {
+        "transaction_type": "Entrada",
+        "date": day,
+        "value": value,
+        "category_id": 1,
+        "account_id": 1,
+        "payment_method": "PIX",
+        "description": description,
+    }
+
+
+def test_transaction_export_streams_filtered_rows_in_date_order(client, admin_headers, monkeypatch):
+    ids = _create(
+        client,
+        admin_headers,
+        [
+            _row("2017-03-02", "Exportação B", 2.5),
+            _row("2017-03-01", "Exportação A", 1),
+            _row("2017-03-02", "Exportação C", 3),
+            _row("2017-03-01", "Fora do filtro"),
+        ],
+    )
+    # Several flushes per export, so rows are checked across batch boundaries.
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 2)
+
+    response = client.get("/api/transactions/export?q=exporta&date_from=2017-03-01", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="lancamentos.ndjson"'
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [(record["id"], record["date"], record["value"]) for record in records] == [
+        (ids[1], "2017-03-01", 1.0),
+        (ids[0], "2017-03-02", 2.5),
+        (ids[2], "2017-03-02", 3.0),
+    ]
+    assert list(records[0]) == EXPORT_COLUMNS
+
+    csv_response = client.get("/api/transactions/export?format=csv&q=exporta", headers=admin_headers)
+    assert csv_response.headers["content-type"] == "text/csv; charset=utf-8"
+    table = list(csv.reader(io.StringIO(csv_response.text)))
+    assert table[0] == EXPORT_COLUMNS
+    assert [row[7] for row in table[1:]] == ["Exportação A", "Exportação B", "Exportação C"]
+
+
+def test_reconciliation_export_filters_by_status(client, admin_headers):
+    content = (
+        b"date,description,value,external_id\n"
+        b"2017-04-02,Exportar 2,-5.00,EXP-2\n"
+        b"2017-04-01,Exportar 1,7.50,EXP-1\n"
+    )
+    response = client.post(
+        "/api/reconciliation/import", files={"file": ("exportar.csv", content)}, headers=admin_headers
+    )
+    assert response.json()["created"] == 2
+
+    exported = client.get("/api/reconciliation/export?status=Pendente", headers=admin_headers)
+    records = [json.loads(line) for line in exported.text.splitlines()]
+    mine = [record for record in records if record["external_id"] in ("EXP-1", "EXP-2")]
+    assert [(record["external_id"], record["date"], record["value"]) for record in mine] == [
+        ("EXP-1", "2017-04-01", 7.5),
+        ("EXP-2", "2017-04-02", -5.0),
+    ]
+    assert all(record["status"] == "Pendente" for record in records)
+    assert client.get("/api/reconciliation/export?status=Conciliado", headers=admin_headers).text.count("EXP-") == 0
@@ -0,0 +1,51 @@
+import random
+import re
+
+from app.routers.reconciliation import PDF_GLYPH_MEMO_SIZE, GlyphDecoder
+
+GLYPH_MAP = {"0001": "P", "0002": "I", "0003": "X", "0010": "ç", "41": "A"}
+
+
+def _previous_decode(value: str, glyph_map: dict[str, str]) -> str:
+    # The decoder before memoization: normalize, then recurse for every unmapped chunk.
+    normalized = re.sub(r"[^0-9A-Fa-f]", "", value).upper()
+    if not normalized:
+        return ""
+    for chunk_size in (4, 2):
+        if len(normalized) % chunk_size != 0:
+            continue
+        chunks = [normalized[index : index + chunk_size] for index in range(0, len(normalized), chunk_size)]
+        if glyph_map and any(chunk in glyph_map for chunk in chunks):
+            return "".join(glyph_map.get(chunk) or _previous_decode(chunk, {}) for chunk in chunks)
+    if len(normalized) % 4 == 0:
+        try:
+            decoded_utf16 = bytes.fromhex(normalized).decode("utf-16-be")
+            if decoded_utf16.strip("\x00").strip():
+                return decoded_utf16
+        except UnicodeDecodeError:
+            pass
+    return bytes.fromhex(normalized).decode("latin-1")
+
+
+def test_decoder_matches_the_previous_decoding():
+    rng = random.Random(24)
+    alphabet = ["0001", "0002", "0003", "0010", "41", "0044", "00E7", "4F", "20", "D8", " ", "\n"]
+    tokens = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 6))) for _ in range(2000)]
+    decoder = GlyphDecoder(GLYPH_MAP)
+    plain = GlyphDecoder({})
+    for token in tokens + [token.lower() for token in tokens]:
+        assert decoder.decode(token) == _previous_decode(token, GLYPH_MAP), token
+        assert plain.decode(token) == _previous_decode(token, {}), token
+
+
+def test_repeated_tokens_decode_once():
+    decoder = GlyphDecoder(GLYPH_MAP)
+    for _ in range(50):
+        assert decoder.decode("0001 0044 0002") == "PDI"
+    info = decoder.decode.cache_info()
+    assert (info.hits, info.misses, info.maxsize) == (49, 1, PDF_GLYPH_MEMO_SIZE)
+    # Decoders of other documents keep their own maps and memo.
+    other = GlyphDecoder({"0001": "Q"})
+    assert other.decode("0001 0044 0002") == "QD\x02"
+    assert other.decode.cache_info().misses == 1
+    assert decoder.decode("0001 0044 0002") == "PDI"
@@ -0,0 +1,94 @@
+from app import statement_cache
+from app.database import SessionLocal
+from app.models import ImportJob, StatementImport
+from app.routers import reconciliation
+from app.routers.reconciliation import JOB_INTERRUPTED_DETAIL, fail_interrupted_import_jobs
+from scripts.bench_statement_parsers import build_pdf
+
+
+def _statement(day: int, footer: str = "") -> bytes:
+    lines = [f"{day} de abril de 2018", f"JOB PIX RECEBIDO DIA {day} 75,00", "Saldo do dia 75,00", footer]
+    return build_pdf([lines])
+
+
+def _create_job(db, filename: str, **changes) -> int:
+    job = ImportJob(filename=filename, account_id=1, income_category_id=1, expense_category_id=2, user_id=1)
+    for name, value in changes.items():
+        setattr(job, name, value)
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def _job(client, headers, job_id: int) -> dict:
+    return client.get(f"/api/reconciliation/import/jobs/{job_id}", headers=headers).json()
+
+
+def test_unfinished_jobs_are_failed_on_startup(client, admin_headers):
+    db = SessionLocal()
+    jobs = [
+        ImportJob(
+            filename=f"{status}.pdf",
+            status=status,
+            account_id=1,
+            income_category_id=1,
+            expense_category_id=2,
+            user_id=1,
+        )
+        for status in ("Na fila", "Processando", "Concluído")
+    ]
+    db.add_all(jobs)
+    db.commit()
+    job_ids = [job.id for job in jobs]
+    db.close()
+
+    assert fail_interrupted_import_jobs() == 2
+    jobs = [client.get(f"/api/reconciliation/import/jobs/{job_id}", headers=admin_headers).json() for job_id in job_ids]
+    assert [(job["status"], job["error"]) for job in jobs] == [
+        ("Erro", JOB_INTERRUPTED_DETAIL),
+        ("Erro", JOB_INTERRUPTED_DETAIL),
+        ("Concluído", None),
+    ]
+
+
+def test_jobs_for_unknown_accounts_or_categories_are_not_queued(client, admin_headers):
+    def submit(account_id: int, expense_category_id: int):
+        return client.post(
+            "/api/reconciliation/import/pdf/jobs",
+            files={"file": ("extrato.pdf", _statement(1), "application/pdf")},
+            data={"account_id": account_id, "income_category_id": 1, "expense_category_id": expense_category_id},
+            headers=admin_headers,
+        )
+
+    jobs_before = len(client.get("/api/reconciliation/import/jobs", headers=admin_headers).json())
+    missing_account = submit(9999, 2)
+    assert (missing_account.status_code, missing_account.json()["detail"]) == (404, "Conta não encontrada.")
+    missing_category = submit(1, 9999)
+    assert (missing_category.status_code, missing_category.json()["detail"]) == (404, "Categoria não encontrada.")
+    assert len(client.get("/api/reconciliation/import/jobs", headers=admin_headers).json()) == jobs_before
+
+
+def test_only_a_concurrent_import_of_the_same_file_is_reported_as_already_imported(
+    client, admin_headers, monkeypatch
+):
+    db = SessionLocal()
+    content = _statement(2)
+    digest = statement_cache.content_hash(content)
+    db.add(StatementImport(content_hash=digest, filename="outro.pdf", entry_count=1, user_id=1))
+    db.commit()
+    same_file = _create_job(db, "mesmo.pdf")
+    reconciliation._run_pdf_import_job(same_file, content, digest)
+    assert _job(client, admin_headers, same_file)["error"] == reconciliation.ALREADY_IMPORTED_DETAIL
+
+    # An overlapping statement whose lines another import committed after this job checked the ledger.
+    first = _create_job(db, "abril.pdf")
+    reconciliation._run_pdf_import_job(first, _statement(3), statement_cache.content_hash(_statement(3)))
+    assert _job(client, admin_headers, first)["status"] == "Concluído"
+    monkeypatch.setattr(reconciliation, "_skip_known_lines", lambda db, batch, rows: list(zip(batch, rows)))
+    overlapping = _create_job(db, "abril-novo.pdf")
+    content = _statement(3, footer="Segunda via")
+    reconciliation._run_pdf_import_job(overlapping, content, statement_cache.content_hash(content))
+    db.close()
+    job = _job(client, admin_headers, overlapping)
+    assert job["status"] == "Erro"
+    assert "transactions.fingerprint" in job["error"]
@@ -0,0 +1,30 @@
+from sqlalchemy import delete
+
+from app.database import SessionLocal
+from app.ledger import seed_balances
+from app.models import AccountBalance, AccountDailyBalance
+
+
+def test_startup_builds_balances_missing_after_an_upgrade(client, admin_headers):
+    transaction = {
+        "transaction_type": "Entrada",
+        "date": "2021-02-03",
+        "value": 100,
+        "category_id": 1,
+        "account_id": 1,
+        "payment_method": "PIX",
+        "description": "Antes da atualização",
+    }
+    assert client.post("/api/transactions", json=transaction, headers=admin_headers).status_code == 200
+    expected = client.get("/api/accounts/1/balance", headers=admin_headers).json()
+
+    # A database from before the materialized balances has transactions but no balance rows.
+    db = SessionLocal()
+    db.execute(delete(AccountDailyBalance))
+    db.execute(delete(AccountBalance))
+    db.commit()
+    db.close()
+
+    seed_balances()
+    assert client.get("/api/accounts/1/balance", headers=admin_headers).json() == expected
+    assert client.get("/api/cashflow/summary", headers=admin_headers).json()["total_in"] >= 100
@@ -0,0 +1,140 @@
+import random
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, SessionLocal
+from app.matching import MATCH_MIN_MARGIN, MATCHED_STATUS, _Candidate, _normalize, _score, match_pending
+from app.models import Account, Category, ReconciliationItem, Transaction
+
+START = date(2024, 1, 1)
+
+
+def _naive_match(transactions: list[dict], items: list[dict], window: int) -> dict[int, int]:
+    # Every item scans every transaction: the O(n·m) result the index must reproduce.
+    claimed: set[int] = set()
+    matches = {}
+    for item in sorted(items, key=lambda item: (item["date"], item["id"])):
+        day = item["date"].toordinal()
+        description = _normalize(item["description"])
+        scored = []
+        for transaction in transactions:
+            same_account = item["account_id"] is None or transaction["account_id"] == item["account_id"]
+            if (
+                transaction["id"] in claimed
+                or not same_account
+                or round(transaction["value"] * 100) != round(abs(item["value"]) * 100)
+                or (transaction["transaction_type"] == "Entrada") != (item["value"] > 0)
+                or abs(transaction["date"].toordinal() - day) > window
+            ):
+                continue
+            candidate = _Candidate(
+                transaction["date"].toordinal(), transaction["id"], _normalize(transaction["description"])
+            )
+            scored.append((_score(description, candidate, day, window), transaction["id"]))
+        scored.sort(reverse=True)
+        if not scored or (len(scored) > 1 and scored[0][0] - scored[1][0] < MATCH_MIN_MARGIN):
+            continue
+        claimed.add(scored[0][1])
+        matches[item["id"]] = scored[0][1]
+    return matches
+
+
+def test_indexed_matching_agrees_with_a_full_scan(tmp_path):
+    rng = random.Random(12)
+    engine = create_engine(f"sqlite:///{tmp_path / 'matching.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    db.add_all([Account(id=1, name="A", account_type="corrente"), Account(id=2, name="B", account_type="corrente")])
+    db.add(Category(id=1, name="Geral", category_type="Receita"))
+    db.flush()
+    transactions = [
+        {
+            "id": index + 1,
+            "transaction_type": rng.choice(["Entrada", "Saída"]),
+            "date": START + timedelta(days=rng.randrange(40)),
+            # Few distinct values, so buckets hold several candidates and ties happen.
+            "value": rng.choice([10.0, 25.5, 99.99, 100.0]),
+            "category_id": 1,
+            "account_id": rng.choice([1, 2]),
+            "payment_method": "Pix",
+            "description": f"Fornecedor {rng.randrange(6)}",
+        }
+        for index in range(300)
+    ]
+    items = [
+        {
+            "id": index + 1,
+            "external_id": f"M-{index}",
+            "date": START + timedelta(days=rng.randrange(40)),
+            "description": f"FORNECEDOR {rng.randrange(6)}",
+            "value": rng.choice([10.0, 25.5, 99.99, 100.0, 7.0]) * rng.choice([1, -1]),
+            "status": "Pendente",
+            "account_id": rng.choice([1, 2, None]),
+        }
+        for index in range(200)
+    ]
+    db.execute(insert(Transaction), transactions)
+    db.execute(insert(ReconciliationItem), items)
+    db.commit()
+
+    result = match_pending(db)
+    db.commit()
+
+    matched = dict(
+        db.execute(
+            select(ReconciliationItem.id, ReconciliationItem.matched_transaction_id).where(
+                ReconciliationItem.status == MATCHED_STATUS
+            )
+        ).all()
+    )
+    expected = _naive_match(transactions, items, 3)
+    assert matched == expected
+    assert result.matched == len(expected) > 10
+    assert result.ambiguous > 0
+    assert result.pending == result.matched + result.ambiguous + result.unmatched == len(items)
+    db.close()
+    engine.dispose()
+
+
+def test_match_endpoint_links_the_clear_candidate(client, admin_headers):
+    db = SessionLocal()
+    account = Account(name="Conta da conciliação", account_type="corrente", initial_balance=0)
+    db.add(account)
+    db.flush()
+    category_id = db.scalar(select(Category.id).limit(1))
+    transactions = [
+        Transaction(
+            transaction_type="Saída",
+            date=day,
+            value=4321.87,
+            category_id=category_id,
+            account_id=account.id,
+            payment_method="Boleto",
+            description=description,
+        )
+        for day, description in ((date(2024, 7, 10), "Aluguel sala"), (date(2024, 7, 11), "Energia elétrica"))
+    ]
+    db.add_all(transactions)
+    item = ReconciliationItem(
+        external_id="MATCH-API-1",
+        date=date(2024, 7, 12),
+        description="ALUGUEL SALA",
+        value=-4321.87,
+        status="Pendente",
+        account_id=account.id,
+    )
+    db.add(item)
+    db.commit()
+    account_id, item_id, rent_id = account.id, item.id, transactions[0].id
+    db.close()
+
+    response = client.post(f"/api/reconciliation/match?account_id={account_id}", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["matched"] >= 1
+
+    db = SessionLocal()
+    item = db.get(ReconciliationItem, item_id)
+    assert (item.status, item.matched_transaction_id) == (MATCHED_STATUS, rent_id)
+    db.close()
@@ -0,0 +1,82 @@
+from datetime import date
+from io import BytesIO
+
+from app.routers.reconciliation import _iter_ofx_transactions
+
+SGML_HEADER = "OFXHEADER:100\nDATA:OFXSGML\nVERSION:102\nENCODING:USASCII\nCHARSET:1252\n\n"
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n<?OFX OFXHEADER="200" VERSION="220"?>\n'
+
+
+def _sgml_record(fields: dict[str, str]) -> str:
+    # OFX 1.x leaves leaf elements unclosed, one per line.
+    return "<STMTTRN>\n" + "".join(f"<{tag}>{value}\n" for tag, value in fields.items()) + "</STMTTRN>\n"
+
+
+def _xml_record(fields: dict[str, str]) -> str:
+    return "<STMTTRN>" + "".join(f"<{tag}>{value}</{tag}>" for tag, value in fields.items()) + "</STMTTRN>\n"
+
+
+def _parse(content: bytes, chunk_size: int = 1 << 16) -> list[dict]:
+    return list(_iter_ofx_transactions(BytesIO(content), chunk_size))
+
+
+def test_sgml_statement_with_a_declared_charset():
+    body = _sgml_record(
+        {"TRNTYPE": "DEBIT", "DTPOSTED": "20240105120000[-3:BRT]", "TRNAMT": "-12.50", "FITID": "1", "NAME": "Pão"}
+    )
+    content = f"{SGML_HEADER}<OFX><BANKTRANLIST>\n{body}</BANKTRANLIST></OFX>".encode("cp1252")
+
+    assert _parse(content) == [{"date": date(2024, 1, 5), "description": "Pão", "value": -12.5, "external_id": "1"}]
+
+
+def test_xml_statement_matches_the_sgml_one():
+    fields = {"TRNTYPE": "CREDIT", "DTPOSTED": "20240106", "TRNAMT": "30,00", "FITID": "2", "NAME": "Café &amp; Cia"}
+    sgml = f"{SGML_HEADER}<OFX>{_sgml_record(fields)}</OFX>".encode("cp1252")
+    xml = f"{XML_HEADER}<OFX>{_xml_record(fields)}</OFX>".encode("utf-8")
+
+    expected = [{"date": date(2024, 1, 6), "description": "Café & Cia", "value": 30.0, "external_id": "2"}]
+    assert _parse(sgml) == _parse(xml) == expected
+
+
+def test_records_split_across_chunk_boundaries():
+    records = "".join(
+        _xml_record(
+            {
+                "TRNTYPE": "CREDIT",
+                "DTPOSTED": "20240107",
+                "TRNAMT": f"{index}.25",
+                "FITID": str(index),
+                "NAME": f"Transferência {index}",
+            }
+        )
+        for index in range(1, 80)
+    )
+    content = f"{XML_HEADER}<OFX><BANKTRANLIST>{records}</BANKTRANLIST></OFX>".encode("utf-8")
+    assert len(content) > 4 * 1024
+
+    whole = _parse(content)
+    assert len(whole) == 79
+    # Small odd chunk sizes cut through tags, values and the two-byte "ê".
+    for chunk_size in (7, 13, 1000):
+        assert _parse(content, chunk_size) == whole
+
+
+def test_debit_signs_and_descriptions():
+    body = "".join(
+        _sgml_record(fields)
+        for fields in (
+            # Some banks export debits as positive amounts; the type decides the sign.
+            {"TRNTYPE": "DEBIT", "DTPOSTED": "20240108", "TRNAMT": "40.00", "NAME": "Tarifa", "MEMO": "Pacote"},
+            {"TRNTYPE": "PAYMENT", "DTPOSTED": "20240108", "TRNAMT": "-15.00", "NAME": "Boleto", "MEMO": "Boleto"},
+            {"TRNTYPE": "CREDIT", "DTPOSTED": "20240108", "TRNAMT": "20.00", "MEMO": "Só memo"},
+            {"TRNTYPE": "CREDIT", "DTPOSTED": "20240108", "TRNAMT": "20.00"},
+            {"TRNTYPE": "CREDIT", "DTPOSTED": "2024-01-08", "TRNAMT": "20.00", "NAME": "Data inválida"},
+        )
+    )
+    entries = _parse(f"{SGML_HEADER}<OFX>{body}</OFX>".encode("cp1252"))
+
+    assert [(entry["description"], entry["value"], entry["external_id"]) for entry in entries] == [
+        ("Tarifa · Pacote", -40.0, None),
+        ("Boleto", -15.0, None),
+        ("Só memo", 20.0, None),
+    ]
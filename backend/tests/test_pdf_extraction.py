@@ -0,0 +1,53 @@
+from concurrent.futures import Future
+
+from app.routers import reconciliation
+from scripts.bench_statement_parsers import build_pdf
+
+
+def _numbered_pdf(pages: int) -> bytes:
+    return build_pdf([[f"Pagina numero {page}", f"Linha {page}-a", f"Linha {page}-b"] for page in range(pages)])
+
+
+class InlinePool:
+    """Runs each page range on submit, recording the ranges."""
+
+    def __init__(self):
+        self.ranges = []
+
+    def submit(self, extractor, content, start, stop):
+        self.ranges.append((start, stop))
+        future = Future()
+        future.set_result(extractor(content, start, stop))
+        return future
+
+
+def test_parallel_extraction_matches_the_serial_one(monkeypatch):
+    content = _numbered_pdf(9)
+    monkeypatch.setattr(reconciliation, "PDF_PARALLEL_MIN_PAGES", 4)
+
+    serial = reconciliation._extract_pdf_pages(content, workers=1)
+    parallel = reconciliation._extract_pdf_pages(content, workers=2)
+
+    assert [page[0] for page in serial] == [f"Pagina numero {page}" for page in range(9)]
+    assert parallel == serial
+
+
+def test_page_ranges_are_split_evenly_and_rejoined_in_order(monkeypatch):
+    pool = InlinePool()
+    monkeypatch.setattr(reconciliation, "_get_process_pool", lambda name, max_workers: pool)
+    monkeypatch.setattr(reconciliation, "PDF_PARALLEL_MIN_PAGES", 1)
+
+    pages = reconciliation._extract_pages_in_parallel(
+        reconciliation._extract_page_range_pypdf, _numbered_pdf(5), 5, 2
+    )
+
+    assert pool.ranges == [(0, 3), (3, 5)]
+    assert [page[0] for page in pages] == [f"Pagina numero {page}" for page in range(5)]
+
+
+def test_small_documents_are_extracted_in_process(monkeypatch):
+    def no_pool(name, max_workers):
+        raise AssertionError("a small PDF must not start the extraction pool")
+
+    monkeypatch.setattr(reconciliation, "_get_process_pool", no_pool)
+    assert len(reconciliation._extract_pdf_pages(_numbered_pdf(3), workers=4)) == 3
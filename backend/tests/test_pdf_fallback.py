@@ -0,0 +1,84 @@
+import base64
+import zlib
+
+from app.routers.reconciliation import GlyphDecoder, PdfStreamIndex, _extract_pdf_pages_fallback
+
+PAGE_TEXT = b"BT /F1 9 Tf 40 800 Td 12 TL (Extrato de conta corrente) Tj T* (5 de junho de 2024) Tj T* "
+TOUNICODE_MAP = b"""/CIDInit /ProcSet findresource begin
+begincmap
+2 beginbfchar
+<0001> <0050>
+<0002> <0049>
+endbfchar
+1 beginbfrange
+<0003> <0005> <0041>
+endbfrange
+endcmap
+end"""
+
+
+def _stream(dictionary: bytes, data: bytes) -> bytes:
+    return b"<< %s /Length %d >>\nstream\n%s\nendstream" % (dictionary, len(data), data)
+
+
+def _fixture_pdf() -> bytes:
+    """One statement page whose content is split over streams with different filter chains."""
+    pix_line = b"<0001 0003 0002> Tj ( RECEBIDO 150,00) Tj T* "
+    objects = [
+        b"<< /Type /Font /Subtype /Type0 /BaseFont /Extrato /ToUnicode 2 0 R >>",
+        _stream(b"/Filter /FlateDecode", zlib.compress(TOUNICODE_MAP)),
+        _stream(b"/Filter /FlateDecode", zlib.compress(PAGE_TEXT)),
+        _stream(b"/Filter [/ASCII85Decode /FlateDecode]", base64.a85encode(zlib.compress(pix_line), adobe=True)),
+        _stream(b"/Filter /ASCIIHexDecode", (b"(Saldo do dia 150,00) Tj ET").hex().encode() + b">"),
+        # LZW is not decoded here; like before the index, such streams are tried raw and inflated.
+        _stream(b"/Filter /LZWDecode", zlib.compress(b"BT (TARIFA MENSAL -12,00) Tj ET")),
+        _stream(b"/Subtype /Image /Filter /DCTDecode", b"\xff\xd8\xff\xe0 BT (not text) Tj ET"),
+    ]
+    output = b"%PDF-1.4\n"
+    for number, body in enumerate(objects, start=1):
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    return output + b"%%EOF\n"
+
+
+def test_stream_index_applies_each_filter_chain():
+    index = PdfStreamIndex(_fixture_pdf())
+
+    assert [stream.filters for stream in index.streams] == [
+        (b"FlateDecode",),
+        (b"FlateDecode",),
+        (b"ASCII85Decode", b"FlateDecode"),
+        (b"ASCIIHexDecode",),
+        (b"LZWDecode",),
+        (b"DCTDecode",),
+    ]
+    texts = [index.text(position) for position in range(len(index.streams))]
+    assert texts[1] == PAGE_TEXT.decode("latin-1")
+    assert texts[2].startswith("<0001 0003 0002> Tj")
+    assert texts[3] == "(Saldo do dia 150,00) Tj ET"
+    assert texts[4] == "BT (TARIFA MENSAL -12,00) Tj ET"
+    assert texts[5] is None
+
+
+def test_glyph_decoder_uses_the_tounicode_maps():
+    decoder = PdfStreamIndex(_fixture_pdf()).glyph_decoder
+
+    assert decoder.glyph_map == {"0001": "P", "0002": "I", "0003": "A", "0004": "B", "0005": "C"}
+    assert decoder.decode("0001 0003 0002") == "PAI"
+    # Chunks missing from the map still decode as UTF-16BE.
+    assert decoder.decode("00010044") == "PD"
+    assert GlyphDecoder({}).decode("4F6921") == "Oi!"
+
+
+def test_fallback_extraction_reads_every_filtered_stream():
+    pages = _extract_pdf_pages_fallback(_fixture_pdf())
+
+    # No single stream holds a whole page here, so the text comes back as fragments.
+    lines = [line for page in pages for line in page]
+    assert lines == [
+        "Extrato de conta corrente",
+        "5 de junho de 2024",
+        "PAI",
+        "RECEBIDO 150,00",
+        "Saldo do dia 150,00",
+        "TARIFA MENSAL -12,00",
+    ]
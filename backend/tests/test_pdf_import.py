@@ -0,0 +1,67 @@
+from app.database import SessionLocal
+from app.models import Transaction
+from app.routers import reconciliation
+from scripts.bench_statement_parsers import build_pdf
+
+
+def _statement(days: list[int], footer: str = "") -> bytes:
+    lines = ["Internet Banking Empresarial", "Agência: 1234 Conta: 56789-0"]
+    for day in days:
+        lines.append(f"{day} de março de 2019")
+        lines.append(f"PDF SOBREPOSTO RECEBIDO DIA {day} 150,00")
+        lines.append(f"PDF SOBREPOSTO ENVIADO DIA {day} -40,00")
+        lines.append("Saldo do dia 1.000,00")
+    # Trailing text is never attached to an entry, so it only changes the file bytes.
+    return build_pdf([lines + [footer]])
+
+
+def _upload(client, headers, filename: str, content: bytes):
+    return client.post(
+        "/api/reconciliation/import/pdf",
+        files={"file": (filename, content, "application/pdf")},
+        data={"account_id": 1, "income_category_id": 1, "expense_category_id": 2},
+        headers=headers,
+    )
+
+
+def _imported_rows() -> int:
+    db = SessionLocal()
+    try:
+        return db.query(Transaction).filter(Transaction.description.startswith("PDF SOBREPOSTO")).count()
+    finally:
+        db.close()
+
+
+def test_reimported_and_overlapping_statements_only_add_new_lines(client, admin_headers):
+    first = _upload(client, admin_headers, "marco.pdf", _statement([1, 2]))
+    assert first.status_code == 200, first.text
+    assert len(first.json()) == 4
+
+    renamed = _upload(client, admin_headers, "marco-copia.pdf", _statement([1, 2]))
+    assert renamed.status_code == 409
+    assert renamed.json()["detail"] == reconciliation.ALREADY_IMPORTED_DETAIL
+    reexported = _upload(client, admin_headers, "marco-novo.pdf", _statement([1, 2], footer="Segunda via"))
+    assert reexported.status_code == 200
+    assert reexported.json() == []
+    assert _imported_rows() == 4
+
+    overlapping = _upload(client, admin_headers, "marco-fim.pdf", _statement([2, 3]))
+    assert overlapping.status_code == 200
+    assert sorted(row["description"] for row in overlapping.json()) == [
+        "PDF SOBREPOSTO ENVIADO DIA 3",
+        "PDF SOBREPOSTO RECEBIDO DIA 3",
+    ]
+    assert _imported_rows() == 6
+
+
+def test_concurrent_import_of_the_same_lines_is_a_conflict(client, admin_headers, monkeypatch):
+    assert _upload(client, admin_headers, "abril.pdf", _statement([20])).status_code == 200
+    rows_before = _imported_rows()
+
+    # As if another upload committed the same lines after this one checked the ledger.
+    monkeypatch.setattr(reconciliation, "_skip_known_lines", lambda db, batch, rows: list(zip(batch, rows)))
+    response = _upload(client, admin_headers, "abril-novo.pdf", _statement([20], footer="Segunda via"))
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == reconciliation.ALREADY_IMPORTED_DETAIL
+    assert _imported_rows() == rows_before
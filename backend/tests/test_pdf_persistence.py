@@ -0,0 +1,69 @@
+from datetime import date
+
+from sqlalchemy import event, select
+
+from app.database import SessionLocal, engine
+from app.ledger import get_account_balance
+from app.models import Account, ActionLog, ReconciliationItem, Transaction
+from app.routers import reconciliation
+
+
+def _entry(index: int, value: float) -> dict:
+    return {
+        "date": date(2017, 6, 1 + index),
+        "description": f"PDF EM LOTES {index}",
+        "detail": "Cliente" if index % 2 else None,
+        "value": abs(value),
+        "signed_value": value,
+        "transaction_type": "Entrada" if value > 0 else "Saída",
+        "source_page": 1 + index // 4,
+        "external_id": f"lotes.pdf-{index}",
+    }
+
+
+def test_statement_lines_are_persisted_in_batches(client, monkeypatch):
+    monkeypatch.setattr(reconciliation, "IMPORT_BATCH_SIZE", 3)
+    db = SessionLocal()
+    account = Account(name="Conta dos lotes", account_type="corrente", initial_balance=0)
+    db.add(account)
+    db.commit()
+    account_id = account.id
+    parsed = [_entry(index, 10.0 * (index + 1) * (-1 if index % 3 == 2 else 1)) for index in range(7)]
+    # The same line again in a later batch is skipped by its fingerprint.
+    parsed.append(dict(parsed[1], external_id="lotes.pdf-repetida"))
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO reconciliation_items"):
+            statements.append(len(parameters) if executemany else 1)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        created = reconciliation._persist_pdf_entries(db, parsed, "lotes.pdf", account_id, 1, 2, user_id=1)
+        db.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert statements == [3, 3, 1]
+    assert [row["description"] for row in created] == [f"PDF EM LOTES {index}" for index in range(7)]
+    assert [row["category_id"] for row in created] == [1, 1, 2, 1, 1, 2, 1]
+    ids = [row["id"] for row in created]
+    documents = dict(
+        db.execute(select(Transaction.id, Transaction.document_number).where(Transaction.id.in_(ids))).all()
+    )
+    assert [documents[transaction_id] for transaction_id in ids] == [f"lotes.pdf-{index}" for index in range(7)]
+    items = db.execute(
+        select(ReconciliationItem.matched_transaction_id, ReconciliationItem.external_id, ReconciliationItem.value)
+        .where(ReconciliationItem.account_id == account_id)
+        .order_by(ReconciliationItem.id)
+    ).all()
+    assert [tuple(item) for item in items] == [
+        (transaction_id, entry["external_id"], entry["signed_value"]) for transaction_id, entry in zip(ids, parsed)
+    ]
+    logs = db.scalars(
+        select(ActionLog.entity_id).where(ActionLog.action == "Importou PDF", ActionLog.entity_id.in_(ids))
+    ).all()
+    assert sorted(logs) == ids
+    assert get_account_balance(db, account_id) == sum(entry["signed_value"] for entry in parsed[:7])
+    db.close()
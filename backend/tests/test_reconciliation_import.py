@@ -0,0 +1,61 @@
+from app.database import SessionLocal
+from app.models import Account
+
+
+def _ofx(fitids: list[str], account_tag: str) -> bytes:
+    transactions = "".join(
+        f"<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240105<TRNAMT>{index + 1}.00<FITID>{fitid}<MEMO>{account_tag} {fitid}"
+        "</STMTTRN>"
+        for index, fitid in enumerate(fitids)
+    )
+    return f"OFXHEADER:100\nDATA:OFXSGML\n\n<OFX><BANKTRANLIST>{transactions}</BANKTRANLIST></OFX>".encode()
+
+
+def test_fitids_are_only_deduplicated_within_the_same_account(client, admin_headers):
+    db = SessionLocal()
+    other = Account(name="Outra conta", account_type="corrente", initial_balance=0)
+    db.add(other)
+    db.commit()
+    other_id = other.id
+    db.close()
+
+    def upload(account_id: int, tag: str, fitids: list[str]):
+        files = {"file": (f"{tag}.ofx", _ofx(fitids, tag))}
+        response = client.post(
+            "/api/reconciliation/import", files=files, data={"account_id": account_id}, headers=admin_headers
+        )
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    assert upload(1, "primeira", ["1001", "1002"])["created"] == 2
+    # Same FITIDs in another account are different bank lines.
+    summary = upload(other_id, "segunda", ["1001", "1002", "1002"])
+    assert (summary["created"], summary["skipped"]) == (2, 1)
+    assert upload(1, "terceira", ["1002", "1003"])["created"] == 1
+
+
+def test_csv_external_ids_are_only_deduplicated_within_the_same_account(client, admin_headers):
+    db = SessionLocal()
+    other = Account(name="Conta do CSV", account_type="corrente", initial_balance=0)
+    db.add(other)
+    db.commit()
+    other_id = other.id
+    db.close()
+
+    def upload(account_id: int, name: str, external_ids: list[str]):
+        rows = "".join(
+            f"2024-02-0{index + 1},{name} {external_id},10.00,{external_id}\n"
+            for index, external_id in enumerate(external_ids)
+        )
+        files = {"file": (f"{name}.csv", f"date,description,value,external_id\n{rows}".encode())}
+        response = client.post(
+            "/api/reconciliation/import", files=files, data={"account_id": account_id}, headers=admin_headers
+        )
+        assert response.status_code == 200, response.text
+        summary = response.json()
+        return summary["filename"], summary["created"], summary["skipped"]
+
+    assert upload(1, "csv-primeira", ["C-1", "C-2"]) == ("csv-primeira.csv", 2, 0)
+    # The same external ids in another account are different bank lines.
+    assert upload(other_id, "csv-segunda", ["C-1", "C-2"]) == ("csv-segunda.csv", 2, 0)
+    assert upload(other_id, "csv-terceira", ["C-2", "C-3"]) == ("csv-terceira.csv", 1, 1)
@@ -0,0 +1,50 @@
+from app.database import SessionLocal
+from app.models import Account
+
+DAYS = [("2019-01-31", 1), ("2019-02-01", 2), ("2019-02-15", 4), ("2019-03-31", 8), ("2019-04-01", 16)]
+
+
+def _account_report(client, admin_headers, account_id: int, query: str) -> list[tuple]:
+    response = client.get(f"/api/reports/by-account?{query}", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    return [(item["period"], item["value"]) for item in response.json() if item["id"] == account_id]
+
+
+def test_periods_and_range_edges(client, admin_headers):
+    db = SessionLocal()
+    account = Account(name="Conta dos períodos", account_type="corrente", initial_balance=0)
+    db.add(account)
+    db.commit()
+    account_id = account.id
+    db.close()
+    for day, value in DAYS:
+        transaction = {
+            "transaction_type": "Entrada",
+            "date": day,
+            "value": value,
+            "category_id": 1,
+            "account_id": account_id,
+            "payment_method": "PIX",
+            "description": "Período",
+        }
+        assert client.post("/api/transactions", json=transaction, headers=admin_headers).status_code == 200
+
+    def report(query: str) -> list[tuple]:
+        return _account_report(client, admin_headers, account_id, query)
+
+    # Closed months come from the rollups, partial months at the edges from the raw rows.
+    whole = "date_from=2019-01-31&date_to=2019-04-01"
+    assert report(f"{whole}&granularity=day") == [(day, float(value)) for day, value in DAYS]
+    assert report(f"{whole}&granularity=month") == [
+        ("2019-01", 1.0),
+        ("2019-02", 6.0),
+        ("2019-03", 8.0),
+        ("2019-04", 16.0),
+    ]
+    assert report(f"{whole}&granularity=quarter") == [("2019-Q1", 15.0), ("2019-Q2", 16.0)]
+    assert report(whole) == [(None, 31.0)]
+    # Both bounds are inclusive, and a range inside the months trims them.
+    assert report("date_from=2019-02-02&date_to=2019-03-30&granularity=month") == [("2019-02", 4.0)]
+    assert report("date_from=2019-02-01&date_to=2019-03-31&granularity=month") == [("2019-02", 6.0), ("2019-03", 8.0)]
+    assert report("date_to=2019-02-14&granularity=quarter") == [("2019-Q1", 3.0)]
+    assert report("date_from=2019-04-01") == [(None, 16.0)]
@@ -0,0 +1,78 @@
+import sqlite3
+import time
+
+from app.database import engine
+from app.routers import reports
+
+
+def test_report_is_served_while_a_writer_holds_the_lock(client, admin_headers):
+    transaction = {
+        "transaction_type": "Entrada",
+        "date": "2023-05-10",
+        "value": 100,
+        "category_id": 1,
+        "account_id": 1,
+        "payment_method": "PIX",
+        "description": "Venda",
+    }
+    assert client.post("/api/transactions", json=transaction, headers=admin_headers).status_code == 200
+
+    writer = sqlite3.connect(engine.url.database)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.perf_counter()
+        response = client.get(
+            "/api/reports/cashflow?date_from=2023-05-01&date_to=2023-05-31&granularity=month", headers=admin_headers
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        writer.rollback()
+        writer.close()
+
+    assert response.status_code == 200
+    assert response.json() == [{"id": None, "label": "Entrada", "value": 100.0, "period": "2023-05"}]
+    assert elapsed < 2
+
+
+def test_cache_hits_do_not_refresh_the_rollups(client, admin_headers, monkeypatch):
+    refreshes = []
+    monkeypatch.setattr(reports, "refresh_rollups", lambda: refreshes.append(1))
+    url = "/api/reports/by-account?date_from=2023-01-01&date_to=2023-12-31&granularity=quarter"
+
+    first = client.get(url, headers=admin_headers)
+    second = client.get(url, headers=admin_headers)
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert len(refreshes) == 1
+
+
+def test_api_writes_invalidate_cached_reports(client, admin_headers):
+    url = "/api/reports/cashflow?date_from=2020-07-01&date_to=2020-07-31"
+    transaction = {
+        "transaction_type": "Saída",
+        "date": "2020-07-15",
+        "value": 30,
+        "category_id": 2,
+        "account_id": 1,
+        "payment_method": "PIX",
+        "description": "Invalida o cache",
+    }
+
+    def stats() -> dict:
+        return client.get("/api/reports/cache", headers=admin_headers).json()
+
+    assert client.get(url, headers=admin_headers).json() == []
+    before = stats()
+    assert client.get(url, headers=admin_headers).json() == []
+    after_hit = stats()
+    assert (after_hit["hits"], after_hit["misses"]) == (before["hits"] + 1, before["misses"])
+
+    assert client.post("/api/transactions", json=transaction, headers=admin_headers).status_code == 200
+    after_write = stats()
+    assert after_write["invalidations"] > after_hit["invalidations"]
+    assert after_write["entries"] < after_hit["entries"]
+
+    expected = [{"id": None, "label": "Saída", "value": 30.0, "period": None}]
+    assert client.get(url, headers=admin_headers).json() == expected
+    assert stats()["misses"] == after_write["misses"] + 1
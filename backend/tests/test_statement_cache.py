@@ -0,0 +1,68 @@
+import io
+import os
+from datetime import date
+
+from app import statement_cache
+from app.routers.reconciliation import ALREADY_IMPORTED_DETAIL, _parse_cached
+
+ENTRIES = [{"date": date(2024, 5, 2), "description": "PIX", "value": 10.0, "external_id": "extrato.pdf-1"}]
+
+
+def test_entries_round_trip_and_renamed_files_miss(tmp_path, monkeypatch):
+    monkeypatch.setattr(statement_cache, "CACHE_DIR", tmp_path)
+    statement_cache.store("pdf", "abc", "extrato.pdf", ENTRIES)
+
+    assert statement_cache.load("pdf", "abc", "extrato.pdf") == ENTRIES
+    # Entries embed the filename, so a renamed copy must be parsed again.
+    assert statement_cache.load("pdf", "abc", "copia.pdf") is None
+    assert statement_cache.load("ofx", "abc", "extrato.pdf") is None
+
+
+def test_unreadable_entries_are_discarded(tmp_path, monkeypatch):
+    monkeypatch.setattr(statement_cache, "CACHE_DIR", tmp_path)
+    (tmp_path / "pdf-broken.json").write_text("{not json", encoding="utf-8")
+
+    assert statement_cache.load("pdf", "broken", "extrato.pdf") is None
+    assert not (tmp_path / "pdf-broken.json").exists()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(statement_cache, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(statement_cache, "CACHE_MAX_ENTRIES", 2)
+    for age, digest in enumerate(("older", "newer")):
+        statement_cache.store("pdf", digest, "extrato.pdf", ENTRIES)
+        os.utime(tmp_path / f"pdf-{digest}.json", (1000 + age, 1000 + age))
+    # A hit refreshes the entry, so the older one outlives the newer.
+    statement_cache.load("pdf", "older", "extrato.pdf")
+
+    statement_cache.store("pdf", "newest", "extrato.pdf", ENTRIES)
+    assert sorted(path.name for path in tmp_path.glob("*.json")) == ["pdf-newest.json", "pdf-older.json"]
+
+def test_file_hash_matches_the_content_hash_and_rewinds():
+    upload = io.BytesIO(b"x" * 200_000)
+    assert statement_cache.file_hash(upload, chunk_size=4096) == statement_cache.content_hash(b"x" * 200_000)
+    assert upload.tell() == 0
+
+
+def test_parsing_runs_once_per_statement(tmp_path, monkeypatch):
+    monkeypatch.setattr(statement_cache, "CACHE_DIR", tmp_path)
+    calls = []
+
+    def parse():
+        calls.append(1)
+        return [dict(entry) for entry in ENTRIES]
+
+    assert _parse_cached("pdf", parse, "extrato.pdf", "digest") == ENTRIES
+    assert _parse_cached("pdf", parse, "extrato.pdf", "digest") == ENTRIES
+    assert len(calls) == 1
+
+
+def test_the_same_file_cannot_be_imported_twice(client, admin_headers):
+    content = b"date,description,value,external_id\n2016-01-04,Arquivo repetido,12.00,\n"
+
+    def upload(filename: str):
+        return client.post("/api/reconciliation/import", files={"file": (filename, content)}, headers=admin_headers)
+
+    assert upload("repetido.csv").status_code == 200
+    again = upload("repetido-renomeado.csv")
+    assert (again.status_code, again.json()["detail"]) == (409, ALREADY_IMPORTED_DETAIL)
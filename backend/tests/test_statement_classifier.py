@@ -0,0 +1,57 @@
+from datetime import date
+
+from app.routers.reconciliation import (
+    LINE_AMOUNT,
+    LINE_BALANCE,
+    LINE_DATE,
+    LINE_NOISE,
+    LINE_SHORT_DATE,
+    LINE_TEXT,
+    _classify_page_lines,
+    _classify_statement_line,
+    _normalize_statement_line,
+    _parse_statement_pages,
+)
+from scripts.bench_statement_classifier import build_statement, legacy_parse_statement_pages
+
+
+def _classify(line: str):
+    return _classify_statement_line(_normalize_statement_line(line))
+
+
+def test_dates_balances_and_short_dates():
+    header = _classify("12 de Agosto de 2024, segunda-feira")
+    assert (header.kind, header.statement_date) == (LINE_DATE, date(2024, 8, 12))
+    # An impossible day is not a date header.
+    assert _classify("31 de fevereiro de 2024").kind == LINE_TEXT
+    assert _classify("Saldo do dia R$ 1.000,00").kind == LINE_BALANCE
+    assert _classify("05/03/2024").kind == LINE_SHORT_DATE
+
+
+def test_amounts_keep_their_sign_and_leading_text():
+    debit = _classify("PAGAMENTO BOLETO FORNECEDOR − 1.234,56")
+    assert (debit.kind, debit.amount) == (LINE_AMOUNT, -1234.56)
+    assert debit.text_before_amount == "PAGAMENTO BOLETO FORNECEDOR"
+    credit = _classify("Documento 7 R$ 89,90")
+    assert (credit.kind, credit.amount) == (LINE_AMOUNT, 89.9)
+    assert _classify("PIX RECEBIDO • CLIENTE 3") == (LINE_TEXT, "PIX RECEBIDO CLIENTE 3", None, None, "")
+
+
+def test_noise_lines():
+    for line in ("Internet Banking Empresarial", "Agência: 1234", "Página 2", "SAC 0800 762 7777", "", "  •  "):
+        assert _classify(line).kind == LINE_NOISE, line
+
+
+def test_glued_date_lines_are_split():
+    lines = _classify_page_lines(["PIX ENVIADO -10,00 3 de maio de 2024 Saldo do dia 90,00"])
+    assert (lines[0].kind, lines[0].amount) == (LINE_AMOUNT, -10.0)
+    # The split keeps the captured date as its own piece, as the previous implementation did.
+    assert {(line.kind, line.statement_date) for line in lines[1:]} == {(LINE_DATE, date(2024, 5, 3))}
+    assert _classify_page_lines(["Página 1", "TARIFA 2,00"]) == [_classify("TARIFA 2,00")]
+
+
+def test_parser_matches_the_previous_implementation():
+    pages = build_statement(3000)
+    parsed = _parse_statement_pages(pages, "extrato.pdf")
+    assert len(parsed) > 300
+    assert parsed == legacy_parse_statement_pages(pages, "extrato.pdf")
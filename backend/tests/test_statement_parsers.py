@@ -0,0 +1,41 @@
+from app import statement_parsers
+from app.routers.reconciliation import _parse_pdf_statement
+from scripts.bench_statement_parsers import other_bank_statement, santander_statement
+
+
+def test_santander_template_is_detected():
+    first_page = ["Extrato de conta corrente", "12 de agosto de 2024", "PIX RECEBIDO 1.000,00", "Saldo do dia 1.000,00"]
+    assert statement_parsers.detect(first_page).bank == "Santander"
+    assert len(_parse_pdf_statement(santander_statement(2), "santander.pdf", 1)) == 36
+
+
+def test_other_bank_with_a_dated_header_is_rejected():
+    first_page = [
+        "Banco Exemplo S.A.",
+        "Extrato emitido em 05 de março de 2024",
+        "05/03/2024 TED RECEBIDA 000001 1.234,56",
+    ]
+    assert statement_parsers.detect(first_page) is None
+    assert _parse_pdf_statement(other_bank_statement(40), "outro-banco.pdf", 1) == []
+
+
+def test_generic_internet_banking_header_is_not_claimed_as_santander():
+    first_page = [
+        "Internet Banking Empresarial",
+        "Banco Exemplo S.A. - Extrato mensal",
+        "05/03/2024 TED RECEBIDA 000001 1.234,56",
+    ]
+    assert statement_parsers.detect(first_page) is None
+    assert statement_parsers.detect(["Banco Santander (Brasil) S.A.", *first_page]).bank == "Santander"
+
+
+def test_plugins_registered_after_the_builtin_layout_are_tried_first(monkeypatch):
+    monkeypatch.setattr(statement_parsers, "_layouts", statement_parsers.layouts())
+    plugin = statement_parsers.register(
+        "Banco Exemplo", lambda lines: lines[0] == "Banco Exemplo", lambda pages, filename: []
+    )
+
+    # The page has the Santander structure too, so only the order decides.
+    page = ["Banco Exemplo", "12 de agosto de 2024", "PIX RECEBIDO 1.000,00", "Saldo do dia 1.000,00"]
+    assert [layout.bank for layout in statement_parsers.layouts()] == ["Banco Exemplo", "Santander"]
+    assert statement_parsers.detect(page) is plugin
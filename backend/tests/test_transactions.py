@@ -0,0 +1,88 @@
+from app.database import SessionLocal
+from app.models import ActionLog
+from app.routers import transactions
+
+
+def test_listing_without_parameters_returns_every_row(client, admin_headers):
+    rows = [
+        {
+            "transaction_type": "Saída",
+            "date": f"2022-01-{day % 28 + 1:02d}",
+            "value": 10,
+            "category_id": 2,
+            "account_id": 1,
+            "payment_method": "PIX",
+            "description": f"Listagem {day}",
+        }
+        for day in range(150)
+    ]
+    assert client.post("/api/transactions/batch", json=rows, headers=admin_headers).status_code == 200
+
+    everything = client.get("/api/transactions", headers=admin_headers)
+    assert len(everything.json()) >= 150
+    assert "X-Next-Cursor" not in everything.headers
+
+    first = client.get("/api/transactions?limit=100", headers=admin_headers)
+    assert len(first.json()) == 100
+    rest = client.get(f"/api/transactions?limit=1000&cursor={first.headers['X-Next-Cursor']}", headers=admin_headers)
+    assert len(first.json()) + len(rest.json()) == len(everything.json())
+
+
+def _row(**changes) -> dict:
+    row = {
+        "transaction_type": "Entrada",
+        "date": "2022-06-01",
+        "value": 25,
+        "category_id": 1,
+        "account_id": 1,
+        "payment_method": "PIX",
+        "description": "Lote",
+    }
+    return {**row, **changes}
+
+
+def test_batch_reports_each_row_and_logs_the_created_ones(client, admin_headers):
+    payload = [
+        _row(description="Lote válido"),
+        _row(transaction_type="Transferência"),
+        _row(account_id=9999),
+        _row(category_id=9999),
+        _row(transaction_type="Saída", value=5, description="Lote saída"),
+    ]
+    response = client.post("/api/transactions/batch", json=payload, headers=admin_headers)
+    assert response.status_code == 200
+    results = response.json()
+    assert [(result["index"], result["status"], result["detail"]) for result in results] == [
+        (0, "created", None),
+        (1, "error", "Tipo de lançamento inválido."),
+        (2, "error", "Conta não encontrada."),
+        (3, "error", "Categoria não encontrada."),
+        (4, "created", None),
+    ]
+    created_ids = [result["id"] for result in results if result["status"] == "created"]
+    assert all(created_ids) and all(result["id"] is None for result in results if result["status"] == "error")
+
+    db = SessionLocal()
+    try:
+        logs = db.query(ActionLog).filter(ActionLog.entity == "Transaction", ActionLog.entity_id.in_(created_ids))
+        assert sorted((log.entity_id, log.action) for log in logs) == [(id_, "Criou") for id_ in sorted(created_ids)]
+    finally:
+        db.close()
+
+
+def test_batch_larger_than_the_limit_is_rejected(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(transactions, "MAX_BATCH_SIZE", 2)
+    response = client.post("/api/transactions/batch", json=[_row()] * 3, headers=admin_headers)
+    assert response.status_code == 413
+    assert response.json()["detail"] == "Envie no máximo 2 lançamentos por lote."
+
+
+def test_single_and_batch_routes_validate_the_same_way(client, admin_headers):
+    invalid_type = client.post("/api/transactions", json=_row(transaction_type="Transferência"), headers=admin_headers)
+    assert (invalid_type.status_code, invalid_type.json()["detail"]) == (400, "Tipo de lançamento inválido.")
+    missing_account = client.post("/api/transactions", json=_row(account_id=9999), headers=admin_headers)
+    assert (missing_account.status_code, missing_account.json()["detail"]) == (404, "Conta não encontrada.")
+
+    created = client.post("/api/transactions", json=_row(description="Avulso"), headers=admin_headers)
+    assert created.status_code == 200
+    assert created.json()["description"] == "Avulso" and created.json()["created_at"]
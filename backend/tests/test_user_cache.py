@@ -0,0 +1,24 @@
+from app.database import SessionLocal
+from app.models import User
+
+
+def _set_role(email: str, role: str) -> None:
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.email == email).one().role = role
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_role_change_takes_effect_on_next_request(client, admin_headers):
+    assert client.get("/api/auth/me", headers=admin_headers).json()["role"] == "admin"
+    assert client.get("/api/auth/users", headers=admin_headers).status_code == 200
+
+    _set_role("admin@cashup.local", "viewer")
+    try:
+        assert client.get("/api/auth/me", headers=admin_headers).json()["role"] == "viewer"
+        assert client.get("/api/auth/users", headers=admin_headers).status_code == 403
+    finally:
+        _set_role("admin@cashup.local", "admin")
+    assert client.get("/api/auth/users", headers=admin_headers).status_code == 200
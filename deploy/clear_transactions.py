@@ -14,6 +14,7 @@ import sys
 from pathlib import Path
 
 CONFIRMATION_TEXT = "LIMPAR"
+DERIVED_TABLES = ("account_balances", "account_daily_balances", "monthly_rollups", "rollup_dirty_months")
 
 
 def infer_default_db_path() -> Path:
@@ -52,6 +53,11 @@ def fetch_scalar(cursor: sqlite3.Cursor, query: str) -> int:
     return int(row[0] if row and row[0] is not None else 0)
 
 
+def table_exists(cursor: sqlite3.Cursor, table: str) -> bool:
+    row = cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+    return row is not None
+
+
 def confirm(force: bool, db_path: Path, transaction_count: int) -> None:
     if force:
         return
@@ -98,6 +104,9 @@ def run_cleanup(db_path: Path, dry_run: bool) -> dict[str, int]:
             "WHERE matched_transaction_id IS NOT NULL"
         )
         cursor.execute("DELETE FROM transactions")
+        for table in DERIVED_TABLES:
+            if table_exists(cursor, table):
+                cursor.execute(f"DELETE FROM {table}")
         cursor.execute("DELETE FROM sqlite_sequence WHERE name = 'transactions'")
         connection.commit()
         return metrics
@@ -1,5 +1,5 @@
 import { useEffect, useMemo, useState } from 'react'
-import { apiFetch, apiUpload } from './api'
+import { apiFetch, apiFetchPages, apiUpload } from './api'
 
 const sections = [
   'Dashboard',
@@ -233,7 +233,7 @@ export default function App() {
     }
     apiFetch('/accounts', { headers: authHeaders }).then(setAccounts).catch(() => setAccounts([]))
     apiFetch('/categories', { headers: authHeaders }).then(setCategories).catch(() => setCategories([]))
-    apiFetch('/transactions', { headers: authHeaders }).then(setTransactions).catch(() => setTransactions([]))
+    apiFetchPages('/transactions', { headers: authHeaders }, setTransactions).catch(() => setTransactions([]))
     apiFetch('/titles', { headers: authHeaders }).then(setTitles).catch(() => setTitles([]))
     apiFetch('/cashflow/summary', { headers: authHeaders }).then(setSummary).catch(() => setSummary(null))
   }, [token])
@@ -366,9 +366,7 @@ export default function App() {
     apiFetch('/cashflow/summary', { headers: authHeaders }).then(setSummary).catch(() => setSummary(null))
 
   const refreshTransactions = () =>
-    apiFetch('/transactions', { headers: authHeaders })
-      .then(setTransactions)
-      .catch(() => setTransactions([]))
+    apiFetchPages('/transactions', { headers: authHeaders }, setTransactions).catch(() => setTransactions([]))
 
   const handleLogin = async (event: React.FormEvent) => {
     event.preventDefault()
@@ -21,6 +21,36 @@ export async function apiFetch<T>(path: string, options: RequestInit = {}): Prom
   return text ? (JSON.parse(text) as T) : (undefined as T)
 }
 
+export async function apiFetchPages<T>(
+  path: string,
+  options: RequestInit = {},
+  onPage?: (rows: T[]) => void,
+  pageSize = 1000
+): Promise<T[]> {
+  const { headers: customHeaders, ...restOptions } = options
+  const separator = path.includes('?') ? '&' : '?'
+  const rows: T[] = []
+  let cursor: string | null = null
+  do {
+    const cursorParam: string = cursor ? `&cursor=${encodeURIComponent(cursor)}` : ''
+    const response: Response = await fetch(`${apiBase}${path}${separator}limit=${pageSize}${cursorParam}`, {
+      headers: {
+        'Content-Type': 'application/json',
+        ...(customHeaders || {})
+      },
+      ...restOptions
+    })
+    if (!response.ok) {
+      throw new Error(await response.text())
+    }
+    rows.push(...((await response.json()) as T[]))
+    // Each page is shown as soon as it arrives; the rest of the listing keeps loading behind it.
+    onPage?.([...rows])
+    cursor = response.headers.get('X-Next-Cursor')
+  } while (cursor)
+  return rows
+}
+
 export async function apiUpload<T>(
   path: string,
   body: FormData,